@@ -4,6 +4,46 @@
 from .game_data import (
     NPC_POSITIONS,
     TARGET_NPCS,
+    NPC_DIALOGUE_MAX_WORKERS,
+    NPC_DIALOGUE_PROVIDER,
+    NPC_DIALOGUE_SEED,
+    NPC_DIALOGUE_STREAM,
+    NPC_STREAM_MAX_TOKENS,
+    NPC_REQUEST_TIMEOUT,
+    NPC_RETRY_MAX_ATTEMPTS,
+    NPC_RETRY_BASE_DELAY,
+    NPC_RETRY_MAX_DELAY,
+    NPC_BREAKER_FAILURE_THRESHOLD,
+    NPC_BREAKER_RESET_SECONDS,
+    NPC_FALLBACK_TO_LOCAL,
+    NPC_HEDGE_ENABLED,
+    NPC_HEDGE_PERCENTILE,
+    NPC_HEDGE_MIN_SAMPLES,
+    NPC_HEDGE_DEFAULT_DELAY,
+    DIALOGUE_METRICS_LOG_PATH,
+    NPC_DIALOGUE_BATCH,
+    NPC_BATCH_MAX_ROUNDS,
+    NPC_STARTUP_RADIUS,
+    NPC_DIALOGUE_LAZY,
+    NPC_PREFETCH_RADIUS,
+    DIALOGUE_CACHE_ENABLED,
+    DIALOGUE_CACHE_DIR,
+    DIALOGUE_CACHE_TTL_SECONDS,
+    DIALOGUE_CACHE_MAX_ENTRIES,
+    DIALOGUE_CACHE_VARIANTS,
+    TEXT_CACHE_MAX_ENTRIES,
+    LARGE_WORLD_ENABLED,
+    WORLD_WIDTH,
+    WORLD_HEIGHT,
+    WORLD_NPC_COUNT,
+    WORLD_SEED,
+    generate_npc_positions,
+    ASSET_DISK_CACHE_ENABLED,
+    ASSET_CACHE_DIR,
+    PRICE_NPC_INFLUENCE,
+    PRICE_VOLATILITY_LOW,
+    PRICE_VOLATILITY_HIGH,
+    MARKET_ORDER_BOOK_ENABLED,
     get_player_start_positions,
     get_market_position
 )
@@ -11,6 +51,46 @@ from .game_data import (
 __all__ = [
     'NPC_POSITIONS',
     'TARGET_NPCS',
+    'NPC_DIALOGUE_MAX_WORKERS',
+    'NPC_DIALOGUE_PROVIDER',
+    'NPC_DIALOGUE_SEED',
+    'NPC_DIALOGUE_STREAM',
+    'NPC_STREAM_MAX_TOKENS',
+    'NPC_REQUEST_TIMEOUT',
+    'NPC_RETRY_MAX_ATTEMPTS',
+    'NPC_RETRY_BASE_DELAY',
+    'NPC_RETRY_MAX_DELAY',
+    'NPC_BREAKER_FAILURE_THRESHOLD',
+    'NPC_BREAKER_RESET_SECONDS',
+    'NPC_FALLBACK_TO_LOCAL',
+    'NPC_HEDGE_ENABLED',
+    'NPC_HEDGE_PERCENTILE',
+    'NPC_HEDGE_MIN_SAMPLES',
+    'NPC_HEDGE_DEFAULT_DELAY',
+    'DIALOGUE_METRICS_LOG_PATH',
+    'NPC_DIALOGUE_BATCH',
+    'NPC_BATCH_MAX_ROUNDS',
+    'NPC_STARTUP_RADIUS',
+    'NPC_DIALOGUE_LAZY',
+    'NPC_PREFETCH_RADIUS',
+    'DIALOGUE_CACHE_ENABLED',
+    'DIALOGUE_CACHE_DIR',
+    'DIALOGUE_CACHE_TTL_SECONDS',
+    'DIALOGUE_CACHE_MAX_ENTRIES',
+    'DIALOGUE_CACHE_VARIANTS',
+    'TEXT_CACHE_MAX_ENTRIES',
+    'LARGE_WORLD_ENABLED',
+    'WORLD_WIDTH',
+    'WORLD_HEIGHT',
+    'WORLD_NPC_COUNT',
+    'WORLD_SEED',
+    'generate_npc_positions',
+    'ASSET_DISK_CACHE_ENABLED',
+    'ASSET_CACHE_DIR',
+    'PRICE_NPC_INFLUENCE',
+    'PRICE_VOLATILITY_LOW',
+    'PRICE_VOLATILITY_HIGH',
+    'MARKET_ORDER_BOOK_ENABLED',
     'get_player_start_positions',
     'get_market_position'
 ]
\ No newline at end of file
@@ -1,4 +1,6 @@
 """게임 데이터 (NPC 위치 등)"""
+import os
+import random
 
 # NPC 위치 정보 (고정 데이터)
 NPC_POSITIONS = [
@@ -9,6 +11,27 @@ NPC_POSITIONS = [
     (700, 300),
 ]
 
+def generate_npc_positions(count, world_width, world_height, step_size, seed=None, exclude_rects=()):
+    """
+    대형 맵용 NPC 위치를 step_size 격자 칸에 무작위로 배치 (칸마다 최대 1명).
+    exclude_rects((x, y, w, h))와 겹치는 칸(플레이어 시작 위치, 장터 등)은 제외하며,
+    같은 seed에는 항상 같은 배치를 반환한다.
+    """
+    def overlaps_excluded(x, y):
+        return any(
+            x < ex + ew and ex < x + step_size and y < ey + eh and ey < y + step_size
+            for ex, ey, ew, eh in exclude_rects
+        )
+
+    cells = [
+        (x, y)
+        for x in range(0, world_width - step_size + 1, step_size)
+        for y in range(0, world_height - step_size + 1, step_size)
+        if not overlaps_excluded(x, y)
+    ]
+    rng = random.Random(seed)
+    return sorted(rng.sample(cells, min(count, len(cells))))
+
 # 플레이어 시작 위치 (화면 크기 기반 계산은 main.py에서)
 def get_player_start_positions(screen_height, player_size, game_area_width):
     """플레이어 시작 위치 계산"""
@@ -24,4 +47,76 @@ def get_market_position(game_area_width, screen_height, step_size):
     return (game_area_width // 2 - step_size + 10, screen_height // 2 + 20)
 
 # 타겟 NPC 수
-TARGET_NPCS = 7
\ No newline at end of file
+TARGET_NPCS = 7
+
+# NPC 대사 생성 시 동시에 보낼 최대 API 요청 수 (1이면 순차 생성)
+NPC_DIALOGUE_MAX_WORKERS = 21
+
+# NPC 대사 제공자: "openai", "local"(오프라인 템플릿 생성), "auto"(API 키가 없으면 local)
+NPC_DIALOGUE_PROVIDER = "auto"
+NPC_DIALOGUE_SEED = None    # 대사 제공자 seed (local 대사, NPC 역할 선택. None이면 게임마다 무작위)
+
+# OpenAI 응답 스트리밍: dialogue/influence가 완성되는 즉시 응답을 끊어 대기 시간과 토큰 절약
+NPC_DIALOGUE_STREAM = True
+NPC_STREAM_MAX_TOKENS = 80  # 스트리밍 시 예약 토큰 수 (30자 대사 + influence JSON이면 충분, 비스트리밍은 200)
+
+# OpenAI 호출 안정화
+NPC_REQUEST_TIMEOUT = 10.0              # 요청 1회 시간 제한 (초, 스트리밍은 응답 전체를 받는 시간)
+NPC_RETRY_MAX_ATTEMPTS = 3              # 재시도 포함 최대 시도 횟수
+NPC_RETRY_BASE_DELAY = 0.5              # 지수 백오프 시작 대기 시간 (초)
+NPC_RETRY_MAX_DELAY = 4.0               # 백오프 최대 대기 시간 (초)
+NPC_BREAKER_FAILURE_THRESHOLD = 5       # 연속 실패가 이 횟수에 이르면 API 호출 중단
+NPC_BREAKER_RESET_SECONDS = 30.0        # 호출 중단 후 다시 시험 호출하기까지의 시간 (초)
+NPC_FALLBACK_TO_LOCAL = True            # 호출 중단/실패 시 로컬 대사 생성기 사용
+NPC_HEDGE_ENABLED = True                # 느린 요청에 중복 요청(헤지)을 보내 먼저 온 응답 사용
+NPC_HEDGE_PERCENTILE = 95               # 최근 지연 시간의 이 백분위수를 넘기면 헤지
+NPC_HEDGE_MIN_SAMPLES = 10              # 백분위수 계산에 필요한 최소 표본 수
+NPC_HEDGE_DEFAULT_DELAY = 3.0           # 표본이 부족할 때 헤지 기준 시간 (초)
+
+# 대사 생성 계측 로그 (게임 종료 시 JSON Lines로 덧붙여 저장, None이면 저장 안 함)
+DIALOGUE_METRICS_LOG_PATH = os.environ.get("RICE_TRADING_METRICS_LOG", "logs/dialogue_metrics.jsonl")
+
+# NPC 대사 일괄 생성: 한 번의 API 호출로 여러 NPC 대사를 JSON 배열로 받음
+NPC_DIALOGUE_BATCH = False
+NPC_BATCH_MAX_ROUNDS = 2    # 검증에 실패한 항목만 다시 일괄 요청하는 최대 횟수
+
+# NPC 대사 디스크 캐시 설정
+DIALOGUE_CACHE_ENABLED = True
+# 캐시 디렉터리 (환경 변수 RICE_TRADING_CACHE_DIR로 변경 가능)
+DIALOGUE_CACHE_DIR = os.environ.get("RICE_TRADING_CACHE_DIR", ".cache")
+DIALOGUE_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60   # 7일이 지난 대사는 만료
+DIALOGUE_CACHE_MAX_ENTRIES = 500                 # 초과 시 가장 오래 사용하지 않은 대사부터 제거
+DIALOGUE_CACHE_VARIANTS = 3                      # 프롬프트마다 보관할 대사 변형 수
+
+# 게임 시작 전에 대사가 준비되어 있어야 하는 NPC 범위 (플레이어 시작 위치 기준 반경, px)
+NPC_STARTUP_RADIUS = 150
+
+
+# NPC 대사 지연 생성 모드: 플레이어가 NPC_PREFETCH_RADIUS 안에 들어온 NPC만 대사를 생성
+# (아무도 다가가지 않은 NPC는 최종 가격 계산 시 'NONE'으로 취급)
+NPC_DIALOGUE_LAZY = False
+NPC_PREFETCH_RADIUS = 150
+
+# 렌더링된 텍스트 surface 캐시 크기 (초과 시 가장 오래 사용하지 않은 항목부터 제거)
+TEXT_CACHE_MAX_ENTRIES = 512
+
+# 대형 맵 모드: WORLD_WIDTH x WORLD_HEIGHT 월드에 NPC WORLD_NPC_COUNT명을 절차적으로 배치하고
+# 카메라가 현재 상인을 따라간다 (NPC가 많으므로 대사는 항상 지연 생성)
+LARGE_WORLD_ENABLED = False
+WORLD_WIDTH = 4000
+WORLD_HEIGHT = 4000
+WORLD_NPC_COUNT = 2000
+WORLD_SEED = None    # NPC 배치 seed (None이면 게임마다 무작위)
+
+# 크기를 조정한 이미지 디스크 캐시 (원본 파일이 바뀌면 자동으로 다시 만듦)
+ASSET_DISK_CACHE_ENABLED = True
+ASSET_CACHE_DIR = os.path.join(DIALOGUE_CACHE_DIR, "images")
+
+# 최종 가격 계산 (README "최종 쌀 가격 도출 기준")
+PRICE_NPC_INFLUENCE = 0.02      # NPC 1명당 가격 상승/하락 비율
+PRICE_VOLATILITY_LOW = 0.9      # 시장 변동성 하한 (±10%)
+PRICE_VOLATILITY_HIGH = 1.1     # 시장 변동성 상한
+
+# 장터 호가창 모드: 베팅을 지정가 주문으로 체결하고 (가격-시간 우선, 부분 체결),
+# 체결 가중 평균 가격을 기준 가격으로, 체결된 수량만 손익에 반영
+MARKET_ORDER_BOOK_ENABLED = False
@@ -1,21 +1,36 @@
 # core/__init__.py
 """게임 핵심 로직 모듈"""
+import importlib
 
-from .player import Player
-from .npc import NPC, NPC_DIALOGUE_DATA
-from .market import Market
-from .ui import Button, draw_info_panel, draw_betting_ui, draw_results
-from .function import wrap_text, calculate_final_price
+# 💡 이름 -> 정의된 하위 모듈. 처음 접근할 때 import 하므로
+#    core.engine 같은 헤드리스 모듈은 pygame 없이도 불러올 수 있다.
+_EXPORTS = {
+    'Player': '.player',
+    'NPC': '.npc',
+    'DialogueManager': '.npc',
+    'Market': '.market',
+    'SpatialHash': '.spatial',
+    'GameEngine': '.engine',
+    'PlayerState': '.engine',
+    'NPCState': '.engine',
+    'Button': '.ui',
+    'InfoPanelCache': '.ui',
+    'draw_info_panel': '.ui',
+    'draw_betting_ui': '.ui',
+    'draw_results': '.ui',
+    'wrap_text': '.function',
+    'calculate_final_price': '.function'
+}
 
-__all__ = [
-    'Player',
-    'NPC',
-    'NPC_DIALOGUE_DATA',
-    'Market',
-    'Button',
-    'draw_info_panel',
-    'draw_betting_ui',
-    'draw_results',
-    'wrap_text',
-    'calculate_final_price'
-]
\ No newline at end of file
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
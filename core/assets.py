@@ -0,0 +1,97 @@
+"""이미지 자원 관리 (파일당 1회 로드, 변환/크기 조정 결과 캐시, 디스크 캐시)"""
+import hashlib
+import os
+
+import pygame
+
+from config.game_data import ASSET_DISK_CACHE_ENABLED, ASSET_CACHE_DIR
+
+class AssetManager:
+    """
+    이미지와 코드로 그린 도형 surface를 한 번만 만들어 공유하는 관리자.
+
+    - image(path, size)는 (path, size, alpha)별로 변환(convert/convert_alpha)된 surface를 캐시한다.
+    - 크기를 조정한 결과는 disk_cache_dir에 PNG로 저장해, 다음 실행에서는 원본 디코딩/축소를 건너뛴다.
+      캐시 파일 이름에 원본의 수정 시각과 크기가 들어가므로 원본이 바뀌면 새로 만든다.
+    - shape(key, build)는 NPC 원처럼 코드로 그린 surface를 key별로 한 번만 만든다.
+    반환된 surface는 여러 스프라이트가 공유하므로 수정하면 안 된다.
+    """
+    def __init__(self, disk_cache_dir=None):
+        self.disk_cache_dir = disk_cache_dir
+        self.file_loads = 0   # 원본 파일 디코딩 횟수
+        self.disk_hits = 0    # 디스크 캐시에서 읽은 횟수
+        self._surfaces = {}
+
+    def image(self, path, size=None, alpha=True, fallback_color=(100, 100, 100)):
+        """
+        path 이미지를 size((w, h), None이면 원본 크기)로 반환.
+        파일을 읽을 수 없으면 fallback_color로 채운 surface를 대신 반환한다.
+        """
+        size = tuple(size) if size is not None else None
+        key = ("image", path, size, alpha)
+        surface = self._surfaces.get(key)
+        if surface is None:
+            try:
+                surface = self._load(path, size, alpha)
+            except (pygame.error, OSError) as e:
+                print(f"이미지 로드 오류: {e}. 대체 이미지 사용.")
+                surface = pygame.Surface(size or (50, 50))
+                surface.fill(fallback_color)
+            self._surfaces[key] = surface
+        return surface
+
+    def shape(self, key, build):
+        """코드로 그린 surface를 key별로 한 번만 만들어 공유"""
+        key = ("shape", key)
+        surface = self._surfaces.get(key)
+        if surface is None:
+            surface = self._surfaces[key] = build()
+        return surface
+
+    def clear(self):
+        self._surfaces.clear()
+
+    def _load(self, path, size, alpha):
+        if size is None:
+            return self._load_original(path, alpha)
+
+        cache_path = self._disk_cache_path(path, size, alpha)
+        if cache_path is not None and os.path.exists(cache_path):
+            try:
+                surface = _convert(pygame.image.load(cache_path), alpha)
+                self.disk_hits += 1
+                return surface
+            except pygame.error:
+                pass  # 손상된 캐시 파일은 무시하고 다시 만듦
+
+        # 💡 원본 크기 surface를 이미 쓰고 있으면 재사용하고, 아니면 축소에만 쓰고 보관하지 않음
+        original = self._surfaces.get(("image", path, None, alpha)) or self._load_original(path, alpha)
+        surface = pygame.transform.scale(original, size)
+        if cache_path is not None:
+            try:
+                os.makedirs(self.disk_cache_dir, exist_ok=True)
+                pygame.image.save(surface, cache_path)
+            except (pygame.error, OSError) as e:
+                print(f"이미지 캐시 저장 실패: {e}")
+        return surface
+
+    def _load_original(self, path, alpha):
+        self.file_loads += 1
+        return _convert(pygame.image.load(path), alpha)
+
+    def _disk_cache_path(self, path, size, alpha):
+        if self.disk_cache_dir is None:
+            return None
+        stat = os.stat(path)
+        raw = f"{os.path.abspath(path)}|{stat.st_mtime_ns}|{stat.st_size}|{size}|{alpha}"
+        name = hashlib.sha1(raw.encode("utf-8")).hexdigest()
+        return os.path.join(self.disk_cache_dir, f"{name}.png")
+
+def _convert(surface, alpha):
+    """화면 모드가 설정되어 있으면 화면 픽셀 형식으로 변환 (blit 속도 향상)"""
+    if pygame.display.get_surface() is None:
+        return surface
+    return surface.convert_alpha() if alpha else surface.convert()
+
+# 💡 게임 전체에서 공유하는 자원 관리자
+assets = AssetManager(ASSET_CACHE_DIR if ASSET_DISK_CACHE_ENABLED else None)
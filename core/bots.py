@@ -0,0 +1,236 @@
+"""
+자동 상인 (격자 탐색 이동과 베팅 전략).
+
+- BotController: 격자 거리 지도를 따라 NPC -> 장터로 이동하고 베팅 전략으로 베팅하는 조종기
+- 베팅 전략: decide(player, engine)가 (매수/매도, 가격, 수량)을 반환
+- play_game / play_rounds: 봇끼리 헤드리스 게임을 한 판 / 여러 판 진행
+"""
+import random
+from collections import deque
+from functools import lru_cache
+
+from config.game_data import NPC_POSITIONS
+from core.dialogue_provider import LocalDialogueProvider
+from core.engine import create_headless_game, rects_overlap, DEFAULT_STEP_SIZE, DEFAULT_PLAYER_NAMES
+
+# ============================================
+# 이동 (STEP_SIZE 격자 거리 지도)
+# ============================================
+GRID_DIRECTIONS = ((0, -1), (1, 0), (0, 1), (-1, 0))
+
+def overlapping_cells(rect, origin, player_size, step=DEFAULT_STEP_SIZE):
+    """origin과 같은 step 격자 위의 칸 중 상인 영역(player_size)이 rect와 겹치는 칸들"""
+    x, y, w, h = rect
+    # 💡 칸 좌표 cx가 x - player_size < cx < x + w를 만족해야 겹침 (pygame.Rect.colliderect 기준)
+    first_x = x - player_size + 1 + (origin[0] - (x - player_size + 1)) % step
+    first_y = y - player_size + 1 + (origin[1] - (y - player_size + 1)) % step
+    return [(cx, cy) for cx in range(first_x, x + w, step) for cy in range(first_y, y + h, step)]
+
+@lru_cache(maxsize=64)
+def grid_distance_field(goal_rects, origin, world_size, player_size, step=DEFAULT_STEP_SIZE):
+    """
+    goal_rects(영역 튜플) 중 하나와 겹치는 칸까지 남은 걸음 수 {칸 좌표: 걸음 수}.
+    origin과 같은 step 격자 전체를 목표 칸들에서 거꾸로 너비 우선 탐색해 한 번에 구한다.
+    목표가 같으면 (다른 상인, 다른 판이어도) 저장된 결과를 그대로 쓴다.
+    """
+    world_width, world_height = world_size
+    max_x = world_width - player_size
+    max_y = world_height - player_size
+    distances = {}
+    queue = deque()
+    for rect in goal_rects:
+        for cell in overlapping_cells(rect, origin, player_size, step):
+            if cell not in distances and 0 <= cell[0] <= max_x and 0 <= cell[1] <= max_y:
+                distances[cell] = 0
+                queue.append(cell)
+    while queue:
+        x, y = cell = queue.popleft()
+        distance = distances[cell] + 1
+        for ux, uy in GRID_DIRECTIONS:
+            next_cell = (x + ux * step, y + uy * step)
+            if next_cell in distances or not (0 <= next_cell[0] <= max_x and 0 <= next_cell[1] <= max_y):
+                continue
+            distances[next_cell] = distance
+            queue.append(next_cell)
+    return distances
+
+class BotController:
+    """
+    자동 상인 한 명의 조종기. next_action(engine)이 GameEngine.apply 형식의 행동을 하나씩 반환한다.
+
+    - 목표 수만큼 NPC를 만날 때까지: (걸음 수 기준) 가장 가까운 미확인 NPC로 이동
+    - 그 뒤: 장터로 이동해 거래 시작, strategy.decide()로 정한 매수/매도, 가격, 수량으로 베팅
+    이동은 목표까지의 거리 지도(grid_distance_field)에서 거리가 가장 짧은 이웃 칸으로 한 칸씩 한다.
+    거리 지도는 남은 목표(미확인 NPC 집합 또는 장터)가 바뀔 때만 다시 가져온다.
+    """
+    def __init__(self, strategy, step_size=DEFAULT_STEP_SIZE):
+        self.strategy = strategy
+        self.step_size = step_size
+        self._field = None
+        self._field_key = None
+        self._pending = []     # 베팅 화면에서 차례로 적용할 행동
+
+    def _distance_field(self, engine, player):
+        seeking_npcs = player.npcs_met < engine.target_npcs
+        # 💡 만난 NPC는 색인에서 빠지기만 하므로 한 판 안에서는 남은 NPC 수로 목표 집합이 정해짐
+        key = (seeking_npcs, len(engine.npc_index) if seeking_npcs else 0)
+        if key != self._field_key:
+            if seeking_npcs:
+                targets = tuple(npc.bounds for npc in engine.npcs if not npc.met)
+            else:
+                targets = (engine.market_bounds,)
+            step = self.step_size
+            self._field = grid_distance_field(
+                targets, (player.x % step, player.y % step), (engine.world_width, engine.world_height),
+                player.player_size, step
+            )
+            self._field_key = key
+        return self._field
+
+    def next_action(self, engine):
+        """현재 상인이 할 다음 행동. 할 수 있는 행동이 없으면 None"""
+        player = engine.current_player
+
+        if engine.state == "BETTING":
+            if not self._pending:
+                bet_type, price, quantity = self.strategy.decide(player, engine)
+                self._pending = [("bet_type", bet_type), ("finish_betting", price, quantity)]
+            return self._pending.pop(0)
+
+        if engine.state != "MOVING" or player.trade_done:
+            return None
+        if player.can_bet and rects_overlap(player.bounds, engine.market_bounds):
+            return ("start_betting",)
+
+        # 💡 목표 칸 위에 서 있어도 (아직 만나지 않은 경우) 이웃 칸으로 옮겨야 만남이 처리되므로
+        #    현재 칸과 관계없이 거리가 가장 짧은 이웃 칸을 고름
+        field = self._distance_field(engine, player)
+        step = self.step_size
+        best = None
+        for ux, uy in GRID_DIRECTIONS:
+            distance = field.get((player.x + ux * step, player.y + uy * step))
+            if distance is not None and (best is None or distance < best[0]):
+                best = (distance, ux * step, uy * step)
+        if best is None:
+            return None
+        return ("move", best[1], best[2])
+
+def play_game(engine, strategies, max_steps=10000, step_size=DEFAULT_STEP_SIZE):
+    """
+    strategies[상인 순서]로 베팅하는 BotController들로 정산까지 진행.
+    진행한 행동 수를 반환한다 (max_steps에 이르거나 더 할 행동이 없으면 정산 전에 멈춤).
+    """
+    controllers = [BotController(strategy, step_size) for strategy in strategies]
+    steps = 0
+    while not engine.finished and steps < max_steps:
+        action = controllers[engine.current_turn].next_action(engine)
+        if action is None:
+            break
+        engine.apply(action)
+        steps += 1
+    return steps
+
+# ============================================
+# 베팅 전략
+# ============================================
+class BettingStrategy:
+    """베팅 전략 인터페이스. decide()는 (bet_type, price, quantity)를 반환한다."""
+    name = "base"
+
+    def __init__(self, rng=None):
+        self.rng = rng if rng is not None else random.Random()
+
+    def decide(self, player, engine):
+        raise NotImplementedError
+
+class RandomStrategy(BettingStrategy):
+    """수집한 정보와 관계없이 매수/매도, 가격, 수량을 무작위로 고름 (기준선)"""
+    name = "random"
+
+    def __init__(self, rng=None, price_range=(80, 120), max_quantity=10):
+        super().__init__(rng)
+        self.price_range = price_range
+        self.max_quantity = max_quantity
+
+    def decide(self, player, engine):
+        bet_type = self.rng.choice(("매수", "매도"))
+        return bet_type, self.rng.randint(*self.price_range), self.rng.randint(1, self.max_quantity)
+
+class SignalStrategy(BettingStrategy):
+    """
+    수집한 NPC 정보의 상승/하락 수로 가격 방향을 추정해 베팅.
+    상승이 많으면 매수, 하락이 많으면 매도 (같으면 무작위)하며,
+    정보가 한쪽으로 쏠릴수록 보유 자금의 stake 비율까지 수량을 늘린다.
+    """
+    name = "signal"
+
+    def __init__(self, rng=None, reference_price=100, stake=0.25):
+        super().__init__(rng)
+        self.reference_price = reference_price
+        self.stake = stake
+
+    def signal(self, player):
+        """(상승 수 - 하락 수, 수집한 정보 수)"""
+        up = sum(1 for info in player.collected_info if info['type'] == 'UP')
+        down = sum(1 for info in player.collected_info if info['type'] == 'DOWN')
+        return up - down, len(player.collected_info)
+
+    def decide(self, player, engine):
+        signal, count = self.signal(player)
+        if signal > 0:
+            bet_type = "매수"
+        elif signal < 0:
+            bet_type = "매도"
+        else:
+            bet_type = self.rng.choice(("매수", "매도"))
+
+        # 💡 가격은 기준가로 두고, 확신(정보 쏠림 정도)에 비례해 수량을 정함
+        price = self.reference_price
+        confidence = abs(signal) / count if count else 0
+        quantity = max(1, int(player.money * self.stake * confidence / price))
+        return bet_type, price, quantity
+
+class ContrarianStrategy(SignalStrategy):
+    """SignalStrategy와 같은 크기로 반대 방향에 베팅 (소문을 믿지 않는 상인)"""
+    name = "contrarian"
+
+    def decide(self, player, engine):
+        bet_type, price, quantity = super().decide(player, engine)
+        return ("매도" if bet_type == "매수" else "매수"), price, quantity
+
+STRATEGIES = {
+    RandomStrategy.name: RandomStrategy,
+    SignalStrategy.name: SignalStrategy,
+    ContrarianStrategy.name: ContrarianStrategy
+}
+
+def create_strategy(name, rng=None):
+    """이름으로 베팅 전략 생성 ("random", "signal", "contrarian")"""
+    try:
+        return STRATEGIES[name](rng)
+    except KeyError:
+        raise ValueError(f"알 수 없는 베팅 전략: {name}") from None
+
+# ============================================
+# 연속 진행
+# ============================================
+DEFAULT_BOT_STRATEGIES = ("signal", "contrarian", "random")
+
+def play_rounds(rounds, seed=None, strategy_names=DEFAULT_BOT_STRATEGIES, on_round=None, **game_options):
+    """
+    봇끼리 헤드리스 게임을 rounds판 연속 진행 (0 이하면 멈출 때까지 계속).
+    판마다 로컬 대사 생성기로 NPC 정보를 새로 만들며, on_round(판 번호, engine)를 호출한다.
+    game_options는 create_headless_game에 전달. 진행한 판 수를 반환한다.
+    """
+    rng = random.Random(seed)
+    names = [DEFAULT_PLAYER_NAMES[i % len(DEFAULT_PLAYER_NAMES)] for i in range(len(strategy_names))]
+    played = 0
+    while rounds <= 0 or played < rounds:
+        provider = LocalDialogueProvider(seed=rng.randrange(2 ** 32))
+        npc_data = [provider.generate(pos) for pos in NPC_POSITIONS]
+        engine = create_headless_game(npc_data, player_names=names, rng=rng, **game_options)
+        play_game(engine, [create_strategy(name, rng) for name in strategy_names])
+        played += 1
+        if on_round is not None:
+            on_round(played, engine)
+    return played
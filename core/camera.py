@@ -0,0 +1,29 @@
+"""월드 좌표 -> 화면 좌표 변환 카메라"""
+import pygame
+
+class Camera:
+    """
+    화면의 게임 영역(view_size)이 월드(world_size)의 어느 부분을 보여 주는지 나타냄.
+    follow()는 대상을 화면 중앙에 두되 월드 밖은 보이지 않도록 offset을 제한한다
+    (월드가 화면보다 작거나 같으면 offset은 항상 (0, 0)).
+    """
+    def __init__(self, view_size, world_size):
+        self.view_width, self.view_height = view_size
+        self.world_width, self.world_height = world_size
+        self.offset = (0, 0)
+
+    @property
+    def view_rect(self):
+        """현재 보이는 월드 영역"""
+        return pygame.Rect(self.offset, (self.view_width, self.view_height))
+
+    def follow(self, rect):
+        x = rect.centerx - self.view_width // 2
+        y = rect.centery - self.view_height // 2
+        x = max(0, min(x, self.world_width - self.view_width))
+        y = max(0, min(y, self.world_height - self.view_height))
+        self.offset = (x, y)
+
+    def apply(self, rect):
+        """월드 좌표 사각형을 화면 좌표로 변환"""
+        return pygame.Rect(rect).move(-self.offset[0], -self.offset[1])
@@ -0,0 +1,138 @@
+"""NPC 대사 디스크 캐시 (SQLite)"""
+import hashlib
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+
+from config.game_data import (
+    DIALOGUE_CACHE_DIR,
+    DIALOGUE_CACHE_TTL_SECONDS,
+    DIALOGUE_CACHE_MAX_ENTRIES,
+    DIALOGUE_CACHE_VARIANTS
+)
+
+VALID_INFO_TYPES = ("UP", "DOWN")
+
+class DialogueCache:
+    """
+    검증된 {dialogue, info_type} 결과를 프롬프트 해시별로 보관하는 영구 캐시.
+
+    - 키마다 최대 variants개의 대사 변형을 모으고, 다 모이기 전까지는 미적중으로 처리해
+      새 대사를 생성하게 한다. 다 모인 뒤에는 무작위 변형을 돌려주므로 매 게임 같은 대사가 반복되지 않는다.
+    - ttl_seconds가 지난 대사는 만료되고, 전체 항목 수가 max_entries를 넘으면
+      마지막 사용 시각이 가장 오래된 항목부터 제거한다 (LRU).
+    """
+
+    def __init__(self, cache_dir=DIALOGUE_CACHE_DIR, ttl_seconds=DIALOGUE_CACHE_TTL_SECONDS,
+                 max_entries=DIALOGUE_CACHE_MAX_ENTRIES, variants=DIALOGUE_CACHE_VARIANTS):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, "npc_dialogue.sqlite3")
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.variants = max(1, variants)
+        self.hits = 0
+        self.misses = 0
+
+        # 💡 대사 생성 스레드 풀에서 함께 사용하므로 연결 하나를 잠금으로 보호
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS dialogue_cache ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " cache_key TEXT NOT NULL,"
+                " dialogue TEXT NOT NULL,"
+                " info_type TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " last_access REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_dialogue_key ON dialogue_cache (cache_key)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_dialogue_access ON dialogue_cache (last_access)")
+            self._purge_expired()
+
+    @staticmethod
+    def make_key(prompt, model, temperature):
+        """프롬프트, 모델, temperature로 캐시 키(SHA-256) 생성"""
+        raw = json.dumps([prompt, model, temperature], ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """캐시된 대사 중 하나를 반환. 변형이 덜 모였거나 없으면 None (미적중)"""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM dialogue_cache WHERE cache_key = ? AND created_at < ?",
+                (key, now - self.ttl_seconds)
+            )
+            rows = self._conn.execute(
+                "SELECT id, dialogue, info_type FROM dialogue_cache WHERE cache_key = ?", (key,)
+            ).fetchall()
+
+            if len(rows) < self.variants:
+                self.misses += 1
+                return None
+
+            row_id, dialogue, info_type = random.choice(rows)
+            self._conn.execute("UPDATE dialogue_cache SET last_access = ? WHERE id = ?", (now, row_id))
+            self.hits += 1
+            return {"dialogue": dialogue, "info_type": info_type}
+
+    def put(self, key, npc_data):
+        """검증된 대사를 저장. 저장하지 않았으면 False 반환"""
+        dialogue = npc_data.get("dialogue")
+        info_type = npc_data.get("info_type")
+        if not isinstance(dialogue, str) or not dialogue or info_type not in VALID_INFO_TYPES:
+            return False
+
+        now = time.time()
+        with self._lock, self._conn:
+            count = self._conn.execute(
+                "SELECT COUNT(*) FROM dialogue_cache WHERE cache_key = ?", (key,)
+            ).fetchone()[0]
+            if count >= self.variants:
+                return False
+
+            self._conn.execute(
+                "INSERT INTO dialogue_cache (cache_key, dialogue, info_type, created_at, last_access)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, dialogue, info_type, now, now)
+            )
+            self._evict_lru()
+        return True
+
+    def stats(self):
+        """적중/미적중 횟수와 현재 항목 수"""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM dialogue_cache").fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": entries
+        }
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM dialogue_cache")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _purge_expired(self):
+        self._conn.execute(
+            "DELETE FROM dialogue_cache WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+        )
+
+    def _evict_lru(self):
+        overflow = self._conn.execute("SELECT COUNT(*) FROM dialogue_cache").fetchone()[0] - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM dialogue_cache WHERE id IN"
+                " (SELECT id FROM dialogue_cache ORDER BY last_access ASC LIMIT ?)",
+                (overflow,)
+            )
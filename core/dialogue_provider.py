@@ -0,0 +1,102 @@
+"""NPC 대사 생성 백엔드 (제공자 인터페이스 및 로컬 생성기)"""
+import random
+
+def position_rng(seed, pos):
+    """seed와 NPC 위치로 정해지는 난수 생성기 (seed가 None이면 전역 random 모듈)"""
+    if seed is None:
+        return random
+    # 💡 문자열 seed는 (hash()와 달리 PYTHONHASHSEED에 영향받지 않고) 내용으로 정해지므로
+    #    str seed여도 다른 프로세스(스윕 작업 프로세스 등)와 다음 실행에서 결과가 같다
+    return random.Random(f"{seed}:{pos[0]}:{pos[1]}")
+
+def describe_npc_position(pos, rng=random):
+    """NPC 위치로부터 (location_hint, role) 결정"""
+    x, y = pos
+
+    # 위치 기반 컨텍스트 및 역할 부여 로직
+    if y > 600:
+        location_hint = "마을 남쪽의 논 근처"
+        role = rng.choice(["농민", "마을 이장"])
+    elif y < 300:
+        location_hint = "마을 북쪽의 산길 입구"
+        role = rng.choice(["떠돌이 상인", "순찰 관리"])
+    elif x < 300:
+        location_hint = "마을 서쪽의 우물가"
+        role = rng.choice(["주민", "행상"])
+    else:
+        location_hint = "마을 동쪽의 장터 입구"
+        role = rng.choice(["쌀 상인", "군량미 담당 관리"])
+    return location_hint, role
+
+# ============================================
+# 제공자 인터페이스
+# ============================================
+class DialogueProvider:
+    """
+    NPC 대사 생성 백엔드 인터페이스.
+    generate()는 NPC 위치를 받아 {dialogue, info_type} 딕셔너리를 반환한다.
+    """
+    name = "base"
+
+    def generate(self, pos):
+        raise NotImplementedError
+
+    def generate_batch(self, positions, npc_ids):
+        """여러 NPC 대사를 {npc_id: {dialogue, info_type}}로 반환 (기본: 하나씩 생성)"""
+        return {npc_id: self.generate(positions[npc_id]) for npc_id in npc_ids}
+
+# ============================================
+# 로컬 생성기 (오프라인, 결정적)
+# ============================================
+# 지역별 소문 소재: (평서문, 가격 영향)
+LOCAL_RUMOURS = {
+    "마을 남쪽의 논 근처": [
+        ("논물이 말라 벼가 타들어 간다", "UP"), ("메뚜기 떼가 논을 덮쳤다", "UP"),
+        ("올해 벼 이삭이 유난히 실하다", "DOWN"), ("비가 알맞게 와서 풍년이 든다", "DOWN"),
+    ],
+    "마을 북쪽의 산길 입구": [
+        ("고구려 군이 국경에 모였다", "UP"), ("산적이 쌀 수레를 털었다", "UP"),
+        ("삼국이 곧 휴전을 맺는다", "DOWN"), ("북쪽에서 쌀 수레가 줄지어 온다", "DOWN"),
+    ],
+    "마을 서쪽의 우물가": [
+        ("우물이 말라 가뭄이 길어진다", "UP"), ("관아에서 쌀 세금을 올린다", "UP"),
+        ("이웃 마을 곡식 창고가 가득 찼다", "DOWN"), ("올해는 세금을 깎아 준다", "DOWN"),
+    ],
+    "마을 동쪽의 장터 입구": [
+        ("군량미로 쌀을 모조리 거둬 간다", "UP"), ("큰손 상인이 쌀을 사재기한다", "UP"),
+        ("나라 곡창을 열어 쌀을 푼다", "DOWN"), ("백제 배가 쌀을 잔뜩 싣고 왔다", "DOWN"),
+    ],
+}
+
+# 역할별 말투 ({rumour} 자리에 평서문이 들어감)
+LOCAL_SPEECH_FRAMES = {
+    "농민": ["{rumour}고 하네요.", "{rumour}고들 수군거려요."],
+    "마을 이장": ["{rumour}고 하더군.", "{rumour}니 다들 대비하게."],
+    "떠돌이 상인": ["{rumour}고 들었지.", "{rumour}는 소문이 자자해."],
+    "순찰 관리": ["{rumour}는 보고가 올라왔다.", "{rumour}고 하니 명심하라."],
+    "주민": ["{rumour}고 하던데요?", "{rumour}는 얘기 들었어요?"],
+    "행상": ["{rumour}고 하더이다.", "{rumour}는 소문이 돌아유."],
+    "쌀 상인": ["{rumour}는 소식이오.", "{rumour}고 들었소."],
+    "군량미 담당 관리": ["{rumour}는 전갈이 왔다.", "{rumour}고 하니 그리 알라."],
+}
+
+class LocalDialogueProvider(DialogueProvider):
+    """
+    네트워크 없이 템플릿으로 대사를 만드는 결정적 생성기.
+    같은 seed와 위치에는 항상 같은 대사/영향이 나오며, 호출 순서(스레드)에 영향받지 않는다.
+    """
+    name = "local"
+
+    def __init__(self, seed=None):
+        # 💡 seed가 없으면 게임마다 다른 대사가 나오도록 무작위 seed 사용
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+
+    def generate(self, pos):
+        rng = position_rng(self.seed, pos)
+        location_hint, role = describe_npc_position(pos, rng)
+        rumour, influence = rng.choice(LOCAL_RUMOURS[location_hint])
+        frame = rng.choice(LOCAL_SPEECH_FRAMES[role])
+        return {
+            "dialogue": frame.format(rumour=rumour),
+            "info_type": influence
+        }
@@ -0,0 +1,336 @@
+"""게임 규칙 엔진 (pygame 없이 동작하는 턴 진행, NPC 만남, 베팅 검증, 정산)"""
+from config.game_data import (
+    NPC_POSITIONS,
+    TARGET_NPCS,
+    PRICE_NPC_INFLUENCE,
+    PRICE_VOLATILITY_LOW,
+    PRICE_VOLATILITY_HIGH,
+    get_player_start_positions,
+    get_market_position
+)
+from core.function import calculate_final_price
+from core.spatial import SpatialHash
+
+# 헤드리스 게임 기본값 (main.py의 게임 영역/스프라이트 크기와 같음)
+DEFAULT_WORLD_SIZE = (800, 800)
+DEFAULT_PLAYER_SIZE = 50
+DEFAULT_STEP_SIZE = 50
+DEFAULT_PLAYER_NAMES = ["백제 상인", "신라 상인", "고구려 상인"]
+
+MARKET_ARRIVAL_MESSAGE = "장터 도착! 마우스로 '거래 시작' 버튼을 누르세요."
+ALREADY_MET_MESSAGE = "이미 만난 NPC입니다. 이동을 계속하세요."
+
+# ============================================
+# 상태 객체 (pygame 스프라이트는 이 클래스를 상속해 이미지만 더함)
+# ============================================
+class PlayerState:
+    """상인 한 명의 위치, 수집 정보, 베팅, 손익"""
+    def __init__(self, name, start_pos, initial_money=2000, player_size=50):
+        self.name = name
+        self.x, self.y = start_pos
+        self.player_size = player_size
+        self.money = initial_money
+        self.rice_amount = 0
+        self.collected_info = []
+        self.npcs_met = 0
+        self.info_version = 0  # 💡 수집 정보가 바뀔 때마다 증가 (정보 패널 캐시 무효화용)
+        self.trade_done = False
+        self.can_bet = False
+        self.profit = 0
+
+        self.bet_price = 0
+        self.bet_quantity = 0
+        self.bet_type = "매수"
+        self.bet_status = ""
+        self.filled_quantity = None  # 💡 호가창 모드에서 정산 시 체결된 수량 (기본 모드에서는 None)
+
+    @property
+    def bounds(self):
+        """(x, y, w, h) 월드 좌표 영역"""
+        return (self.x, self.y, self.player_size, self.player_size)
+
+    def add_info(self, info):
+        """만난 NPC의 정보 추가"""
+        self.collected_info.append(info)
+        self.npcs_met += 1
+        self.info_version += 1
+
+    def mark_info_changed(self):
+        """수집한 정보의 내용이 바뀌었음을 알림 (생성 중이던 대사가 준비된 경우 등)"""
+        self.info_version += 1
+
+    def move(self, dx, dy, world_width, world_height):
+        """플레이어 이동 (월드 좌표 기준 경계 체크 포함)"""
+        new_x = self.x + dx
+        new_y = self.y + dy
+
+        if 0 <= new_x <= world_width - self.player_size and 0 <= new_y <= world_height - self.player_size:
+            self.x = new_x
+            self.y = new_y
+
+class NPCState:
+    """NPC 한 명의 위치와 대사 (대사는 생성 중일 수 있으며 set_info로 갱신)"""
+    def __init__(self, pos, info_message, info_type, size=50):
+        self.x, self.y = pos
+        self.size = size
+        self.info = info_message
+        self.info_type = info_type # 💡 info_type을 인스턴스 변수로 저장
+        self.met = False
+        self._collected = []
+
+    @property
+    def bounds(self):
+        return (self.x, self.y, self.size, self.size)
+
+    def collect(self, collector=None):
+        """
+        플레이어가 수집할 정보 딕셔너리 반환 (대사가 생성 중이면 set_info 때 함께 갱신됨).
+        collector(PlayerState)를 주면 갱신 시 collector.mark_info_changed()로 알린다.
+        """
+        info = {'dialogue': self.info, 'type': self.info_type}
+        self._collected.append((info, collector))
+        return info
+
+    def set_info(self, info_message, info_type):
+        """백그라운드에서 생성된 대사 반영"""
+        self.info = info_message
+        self.info_type = info_type
+        for info, collector in self._collected:
+            info['dialogue'] = info_message
+            info['type'] = info_type
+            if collector is not None:
+                collector.mark_info_changed()
+
+def rects_overlap(a, b):
+    """(x, y, w, h) 두 영역이 겹치는지 (pygame.Rect.colliderect와 같은 기준)"""
+    return a[0] < b[0] + b[2] and b[0] < a[0] + a[2] and a[1] < b[1] + b[3] and b[1] < a[1] + a[3]
+
+# ============================================
+# 게임 엔진
+# ============================================
+class GameEngine:
+    """
+    게임 한 판의 규칙과 상태. 화면 없이 행동(action)만으로 진행된다.
+
+    - state: "MOVING"(이동), "BETTING"(베팅 입력), "RESULT_VIEW"(정산 완료)
+    - 행동: move(dx, dy), start_betting(), set_bet_type(bet_type), finish_betting(price, quantity)
+    - message: 현재 안내 문구 (main.py 메시지 박스에 표시)
+    - settlement_data: 정산 때 사용할 NPC 정보 리스트를 반환하는 함수 (없으면 npcs의 현재 info_type 사용)
+    - rng, influence, volatility_low/high: 정산 시 calculate_final_price에 전달 (seed 고정 및 밸런스 조정용)
+    - order_book: 장터 호가창 모드에서 사용할 core.market.OrderBook. 주면 베팅이 확정될 때마다
+      지정가 주문으로 제출되고, 정산은 체결 내역으로 한다 (없으면 평균 베팅 가격 기준 정산)
+    """
+    def __init__(self, players, npcs, market_bounds, world_size, target_npcs=TARGET_NPCS,
+                 cell_size=DEFAULT_STEP_SIZE, settlement_data=None, rng=None, influence=PRICE_NPC_INFLUENCE,
+                 volatility_low=PRICE_VOLATILITY_LOW, volatility_high=PRICE_VOLATILITY_HIGH, order_book=None):
+        self.players = players
+        self.npcs = npcs
+        self.market_bounds = tuple(market_bounds)
+        self.world_width, self.world_height = world_size
+        self.target_npcs = target_npcs
+        self.settlement_data = settlement_data
+        self.rng = rng
+        self.influence = influence
+        self.volatility_low = volatility_low
+        self.volatility_high = volatility_high
+        self.order_book = order_book
+
+        # 💡 충돌/근접 검색용 격자 색인 (NPC id 저장, 만난 NPC는 met_npc_index로 옮김)
+        #    만난 NPC 색인은 "이미 만난 NPC" 안내에만 사용
+        self.npc_index = SpatialHash(cell_size)
+        self.met_npc_index = SpatialHash(cell_size)
+        for npc_id, npc in enumerate(npcs):
+            (self.met_npc_index if npc.met else self.npc_index).insert(npc_id, npc.bounds)
+
+        self.state = "MOVING"
+        self.current_turn = 0
+        self.trade_finished_count = 0
+        self.final_price = 0
+        self._turn_text = self._turn_message()
+        self.message = self._turn_text
+
+    @property
+    def current_player(self):
+        return self.players[self.current_turn]
+
+    @property
+    def finished(self):
+        return self.state == "RESULT_VIEW"
+
+    def _turn_message(self):
+        return f"{self.current_player.name} 님의 턴. 방향키로 이동하세요."
+
+    # ----- 행동 -----
+    def move(self, dx, dy):
+        """
+        현재 상인을 이동하고 NPC 만남/장터 도착을 처리.
+        {'met_npc': 만난 NPC id 또는 None}를 반환하며, 이동할 수 없는 상태면 None.
+        """
+        # 💡 헤드리스 게임에서 가장 많이 호출되는 경로라 속성/프로퍼티 조회를 줄이고,
+        #    안내 문구는 턴이 바뀔 때 만들어 둔 것을 재사용 (만남/도착 때만 새로 만듦)
+        player = self.players[self.current_turn]
+        if self.state != "MOVING" or player.trade_done or (dx == 0 and dy == 0):
+            return None
+
+        # 💡 PlayerState.move와 같은 경계 체크 (메서드 호출 없이)
+        size = player.player_size
+        x = player.x + dx
+        y = player.y + dy
+        if 0 <= x <= self.world_width - size and 0 <= y <= self.world_height - size:
+            player.x = x
+            player.y = y
+        else:
+            x, y = player.x, player.y
+        bounds = (x, y, size, size)
+
+        # 💡 격자 색인에는 아직 만나지 않은 NPC만 있으므로 주변 칸만 확인
+        hit_npc_ids = self.npc_index.query_rect(bounds)
+        met_npc_id = None
+
+        new_message = None  # None이면 기본 안내 문구
+
+        if hit_npc_ids and player.npcs_met < self.target_npcs:
+            # 💡 여러 NPC와 동시에 겹치면 id가 가장 작은 NPC를 만남 (색인 결과는 정렬되어 있지 않음)
+            met_npc_id = hit_npc_ids[0] if len(hit_npc_ids) == 1 else min(hit_npc_ids)
+            npc = self.npcs[met_npc_id]
+            # 💡 수집 정보 수정: 텍스트와 info_type을 딕셔너리로 저장
+            player.add_info(npc.collect(player))
+            npc.met = True
+            self.npc_index.remove(met_npc_id)
+            self.met_npc_index.insert(met_npc_id, npc.bounds)
+            new_message = f"NPC와 만남! ({player.npcs_met}/{self.target_npcs}) 정보 획득!"
+            if player.npcs_met == self.target_npcs:
+                new_message = "모든 정보를 모았습니다! 장터로 향하세요."
+        elif player.npcs_met < self.target_npcs and self.met_npc_index.query_rect(bounds):
+            # 💡 정보를 모으는 중에 이미 만난 NPC 칸에 서면 안내 (만남 처리는 하지 않음)
+            new_message = ALREADY_MET_MESSAGE
+
+        if player.npcs_met >= self.target_npcs and rects_overlap(bounds, self.market_bounds):
+            player.can_bet = True
+            new_message = MARKET_ARRIVAL_MESSAGE
+        elif new_message is None and player.can_bet:
+            new_message = MARKET_ARRIVAL_MESSAGE
+
+        self.message = new_message if new_message is not None else self._turn_text
+        return {'met_npc': met_npc_id}
+
+    def start_betting(self):
+        """장터에 도착한 상인의 베팅 시작. 시작했으면 True"""
+        if self.state != "MOVING" or not self.current_player.can_bet or self.current_player.trade_done:
+            return False
+        self.state = "BETTING"
+        self.message = "가격/수량/매수/매도를 결정하세요."
+        return True
+
+    def set_bet_type(self, bet_type):
+        if self.state == "BETTING" and bet_type in ("매수", "매도"):
+            self.current_player.bet_type = bet_type
+
+    def finish_betting(self, price, quantity):
+        """
+        가격/수량(정수 또는 숫자 문자열)을 검증해 베팅을 확정하고 다음 상인으로 넘김.
+        모든 상인이 끝나면 정산한다. 베팅이 확정되었으면 True
+        """
+        if self.state != "BETTING":
+            return False
+        try:
+            price = int(price)
+            quantity = int(quantity)
+        except ValueError:
+            self.message = "유효한 숫자(가격/수량)를 입력하세요."
+            return False
+
+        if price <= 0 or quantity <= 0:
+            self.message = "가격과 수량은 0보다 커야 합니다."
+            return False
+
+        player = self.current_player
+        player.bet_price = price
+        player.bet_quantity = quantity
+        player.bet_status = f"{player.bet_type} {quantity}개 ({price}원)"
+        player.trade_done = True
+        self.trade_finished_count += 1
+
+        if self.order_book is not None:
+            # 💡 턴 순서가 곧 주문 시간 순서 (먼저 베팅한 상인의 호가가 같은 가격에서 우선)
+            self.order_book.submit(player, player.bet_type, price, quantity)
+
+        self.message = f"{player.name} 님 거래 완료! 다음 상인 대기."
+        self.state = "MOVING"
+
+        if self.trade_finished_count < len(self.players):
+            for _ in range(len(self.players)):
+                self.current_turn = (self.current_turn + 1) % len(self.players)
+                if not self.current_player.trade_done:
+                    self._turn_text = self._turn_message()
+                    self.message = self._turn_text
+                    return True
+            self._settle("모든 상인의 최종 정산이 완료되었습니다. 결과를 확인하세요!")
+        else:
+            self._settle("최종 정산이 완료되었습니다. 결과를 확인하세요!")
+        return True
+
+    def _settle(self, message):
+        # 💡 최종 가격 계산 시 NPC 대사 데이터 전달
+        if self.settlement_data is not None:
+            npc_data = self.settlement_data()
+        else:
+            npc_data = [{'dialogue': npc.info, 'info_type': npc.info_type} for npc in self.npcs]
+        fills = self.order_book.fills if self.order_book is not None else None
+        self.final_price = calculate_final_price(
+            self.players, npc_data, rng=self.rng, influence=self.influence,
+            volatility_low=self.volatility_low, volatility_high=self.volatility_high, fills=fills
+        )
+        if fills is not None:
+            for player in self.players:
+                player.filled_quantity = sum(fill.quantity for fill in fills.get(player, ()))
+        self.state = "RESULT_VIEW"
+        self.message = message
+
+    def apply(self, action):
+        """
+        ("move", dx, dy), ("start_betting",), ("bet_type", "매수"/"매도"),
+        ("finish_betting", price, quantity) 형태의 행동 하나를 적용하고 결과 반환
+        """
+        name = action[0]
+        if name == "move":
+            return self.move(action[1], action[2])
+        if name == "start_betting":
+            return self.start_betting()
+        if name == "bet_type":
+            return self.set_bet_type(*action[1:])
+        if name == "finish_betting":
+            return self.finish_betting(*action[1:])
+        raise ValueError(f"알 수 없는 행동: {action!r}")
+
+    def run(self, actions):
+        """행동 목록을 차례로 적용 (정산이 끝나면 중단)"""
+        apply = self.apply
+        for action in actions:
+            if self.state == "RESULT_VIEW":
+                break
+            apply(action)
+        return self
+
+def create_headless_game(npc_data, npc_positions=NPC_POSITIONS, world_size=DEFAULT_WORLD_SIZE,
+                         player_names=DEFAULT_PLAYER_NAMES, initial_money=2000, target_npcs=TARGET_NPCS,
+                         player_size=DEFAULT_PLAYER_SIZE, step_size=DEFAULT_STEP_SIZE, **engine_options):
+    """
+    화면 없이 진행하는 게임 생성.
+    npc_data: npc_positions 순서의 {dialogue, info_type} 리스트 (예: LocalDialogueProvider로 미리 생성)
+    engine_options: GameEngine에 그대로 전달 (rng, influence, volatility_low, volatility_high, order_book)
+    """
+    world_width, world_height = world_size
+    start_positions = get_player_start_positions(world_height, player_size, world_width)
+    players = [
+        PlayerState(name, start_positions[i % len(start_positions)], initial_money, player_size)
+        for i, name in enumerate(player_names)
+    ]
+    npcs = [
+        NPCState(pos, data['dialogue'], data['info_type'], size=step_size)
+        for pos, data in zip(npc_positions, npc_data)
+    ]
+    market_x, market_y = get_market_position(world_width, world_height, step_size)
+    market_bounds = (market_x, market_y, step_size * 2, step_size * 2)
+    return GameEngine(players, npcs, market_bounds, world_size, target_npcs=target_npcs, cell_size=step_size,
+                      **engine_options)
@@ -1,10 +1,71 @@
 """유틸리티 함수들"""
 import random
+from functools import lru_cache
+
+from config.game_data import PRICE_NPC_INFLUENCE, PRICE_VOLATILITY_LOW, PRICE_VOLATILITY_HIGH
+
+@lru_cache(maxsize=4096)
+def _text_width(font, text):
+    """font로 그린 text의 폭 (단어/글자 단위로 한 번만 측정)"""
+    return font.size(text)[0]
+
+def _split_long_word(word, font, max_width):
+    """max_width보다 넓은 단어(띄어쓰기 없는 긴 한글 문장 등)를 글자 단위로 나눔"""
+    chunks = []
+    current, current_width = "", 0
+    for char in word:
+        char_width = _text_width(font, char)
+        if current and current_width + char_width > max_width:
+            chunks.append(current)
+            current, current_width = "", 0
+        current += char
+        current_width += char_width
+    if current:
+        chunks.append(current)
+    return chunks
+
+@lru_cache(maxsize=1024)
+def _wrap_lines(text, font, max_width):
+    """
+    줄바꿈 결과를 (text, font, max_width)별로 기억.
+    각 단어 폭을 한 번만 측정하고 공백 폭과 더해 줄 폭을 계산한다.
+    """
+    space_width = _text_width(font, " ")
+    lines = []
+    current_line = ""
+    current_width = 0
+
+    for word in text.split(' '):
+        word_width = _text_width(font, word)
+        if word_width > max_width:
+            # 💡 한 줄에 들어가지 않는 단어는 글자 단위로 끊어 패널 밖으로 넘치지 않게 함
+            if current_line:
+                lines.append(current_line)
+            *full_chunks, current_line = _split_long_word(word, font, max_width)
+            lines.extend(full_chunks)
+            current_width = _text_width(font, current_line)
+            continue
+
+        test_width = current_width + space_width + word_width if current_line else word_width
+        if test_width <= max_width:
+            current_line = current_line + " " + word if current_line else word
+            current_width = test_width
+        else:
+            if current_line:
+                lines.append(current_line)
+            current_line = word
+            current_width = word_width
+
+    if current_line:
+        lines.append(current_line)
+
+    return tuple(lines)
 
 def wrap_text(text, font, max_width):
     """
     텍스트 줄바꿈 처리.
     입력이 딕셔너리일 경우 'dialogue' 키의 값을 사용하도록 수정.
+    결과는 (text, font, max_width)별로 캐시되므로 매 프레임 호출해도 다시 측정하지 않는다.
     """
     
     # 💡 수정된 부분: 입력이 딕셔너리인지 확인하고 문자열을 추출
@@ -17,34 +78,41 @@ def wrap_text(text, font, max_width):
     if not text_to_wrap:
         return []
 
-    # 기존 줄바꿈 로직 (text_to_wrap 변수를 사용하도록 변경)
-    words = text_to_wrap.split(' ')
-    wrapped_lines = []
-    current_line = ""
+    return list(_wrap_lines(text_to_wrap, font, max_width))
 
-    for word in words:
-        test_line = current_line + " " + word if current_line else word
-        test_width, _ = font.size(test_line)
-
-        if test_width <= max_width:
-            current_line = test_line
-        else:
-            if current_line:
-                wrapped_lines.append(current_line)
-            current_line = word
+def clear_wrap_text_cache():
+    """wrap_text 캐시 비우기 (폰트를 바꾸거나 벤치마크할 때 사용)"""
+    _wrap_lines.cache_clear()
+    _text_width.cache_clear()
 
-    if current_line:
-        wrapped_lines.append(current_line)
+def npc_price_factor(npc_dialogue_data, influence=PRICE_NPC_INFLUENCE):
+    """NPC 정보에 따른 가격 배율 (1.0 + NPC 총 영향력 비율)"""
+    # 'UP' 및 'DOWN' 정보를 가진 NPC 수 카운트
+    increase_count = sum(1 for data in npc_dialogue_data if data.get('info_type') == 'UP')
+    decrease_count = sum(1 for data in npc_dialogue_data if data.get('info_type') == 'DOWN')
 
-    return wrapped_lines
+    # NPC 총 영향력 비율 (각 2%씩 반영)
+    # 예: 상승 10명, 하락 11명이면 (10 * 0.02) - (11 * 0.02) = -0.02
+    npc_influence_factor = (increase_count * influence) - (decrease_count * influence)
+    return 1.0 + npc_influence_factor
 
-def calculate_final_price(players, npc_dialogue_data):
+def calculate_final_price(players, npc_dialogue_data, rng=None, influence=PRICE_NPC_INFLUENCE,
+                          volatility_low=PRICE_VOLATILITY_LOW, volatility_high=PRICE_VOLATILITY_HIGH,
+                          fills=None):
     """
     최종 쌀 가격 계산 및 플레이어 손익 계산 (NPC 정보 반영)
     
     - players: 플레이어 객체 리스트 (베팅 가격 포함)
     - npc_dialogue_data: info_type('UP', 'DOWN', 'NONE')을 포함하는 NPC 정보 리스트
+    - rng: 시장 변동성을 뽑을 random.Random (None이면 전역 random 모듈)
+    - influence, volatility_low/high: NPC 1명당 영향력, 시장 변동성 범위 (밸런스 조정용)
+    - fills: 장터 호가창 모드의 상인별 체결 내역 {player: [Fill, ...]} (OrderBook.fills).
+      주면 평균 베팅 가격 대신 체결 가중 평균 가격을 기준으로 삼고 (체결이 없으면 평균 베팅 가격),
+      각 상인은 베팅 수량 전체가 아니라 체결된 수량만 체결 가격 기준으로 정산한다.
     """
+    if rng is None:
+        rng = random
+
     if not players:
         return 0
 
@@ -52,24 +120,22 @@ def calculate_final_price(players, npc_dialogue_data):
     total_bet_price = sum(p.bet_price for p in players)
     avg_price = total_bet_price / len(players)
 
-    # 2. NPC 정보 분석 및 영향력 계산
-    
-    # 'UP' 및 'DOWN' 정보를 가진 NPC 수 카운트
-    increase_count = sum(1 for data in npc_dialogue_data if data.get('info_type') == 'UP')
-    decrease_count = sum(1 for data in npc_dialogue_data if data.get('info_type') == 'DOWN')
+    # 1-1. 호가창 모드: 체결 가중 평균 가격 (체결 한 번이 매수/매도 양쪽에 기록되므로 매수 쪽만 셈)
+    if fills is not None:
+        buy_fills = [fill for player_fills in fills.values() for fill in player_fills if fill.side == "매수"]
+        traded_volume = sum(fill.quantity for fill in buy_fills)
+        if traded_volume:
+            avg_price = sum(fill.price * fill.quantity for fill in buy_fills) / traded_volume
+
+    # 2. NPC 정보 분석 및 영향력 계산: (1.0 + NPC 총 영향력 비율)
+    npc_factor = npc_price_factor(npc_dialogue_data, influence)
 
-    # NPC 총 영향력 비율 (각 2%씩 반영)
-    # 예: 상승 10명, 하락 11명이면 (10 * 0.02) - (11 * 0.02) = -0.02
-    npc_influence_factor = (increase_count * 0.02) - (decrease_count * 0.02)
-    
     # 3. 최종 가격 변동률 계산
     
     # 3-1. 시장 변동성 (±10%) 반영: 0.9 ~ 1.1 사이의 무작위 값
-    market_volatility = random.uniform(0.9, 1.1)
-    
-    # 3-2. NPC 영향력 반영: (1.0 + NPC 총 영향력 비율)
-    npc_factor = 1.0 + npc_influence_factor
+    market_volatility = rng.uniform(volatility_low, volatility_high)
 
+    # 3-2. NPC 영향력 반영
     # 최종 변동률 = 시장 변동성 * NPC 영향력
     # 두 요소를 곱하여 최종 가격에 동시에 영향을 미치도록 함
     final_volatility = market_volatility * npc_factor
@@ -79,6 +145,15 @@ def calculate_final_price(players, npc_dialogue_data):
 
     # 각 플레이어 손익 계산
     for player in players:
+        if fills is not None:
+            # 💡 체결된 수량만 각자의 체결 가격으로 정산 (체결되지 않은 수량은 손익 없음)
+            player.profit = sum(
+                fill.quantity * (final_price - fill.price) * (1 if fill.side == "매수" else -1)
+                for fill in fills.get(player, ())
+            )
+            player.money += player.profit
+            continue
+
         profit_or_loss = player.bet_quantity * (final_price - player.bet_price)
 
         if player.bet_type == "매수":
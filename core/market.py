@@ -1,21 +1,179 @@
-"""마켓 클래스"""
+"""마켓 클래스 및 지정가 호가창 (장터 호가창 모드)"""
+import heapq
+from itertools import count
+
 import pygame
 
+from core.assets import assets
+
+def build_market_image(step_size):
+    """장터 원 이미지"""
+    size = step_size * 2
+    radius = size // 2
+    image = pygame.Surface([size, size], pygame.SRCALPHA)
+    
+    # 색상 정의 (main.py의 색상 사용)
+    DARK_GRAY = (40, 40, 40)
+    GOLD = (218, 165, 32)
+    
+    pygame.draw.circle(image, DARK_GRAY, (radius, radius), radius)
+    pygame.draw.circle(image, GOLD, (radius, radius), radius, 4)
+    
+    image.set_alpha(150) 
+    return image
+
 class Market(pygame.sprite.Sprite):
     def __init__(self, pos, step_size=50):
         super().__init__()
         
-        size = step_size * 2
-        radius = size // 2
-        self.image = pygame.Surface([size, size], pygame.SRCALPHA)
-        
-        # 색상 정의 (main.py의 색상 사용)
-        DARK_GRAY = (40, 40, 40)
-        GOLD = (218, 165, 32)
-        
-        pygame.draw.circle(self.image, DARK_GRAY, (radius, radius), radius)
-        pygame.draw.circle(self.image, GOLD, (radius, radius), radius, 4)
-        
-        self.image.set_alpha(150) 
+        self.image = assets.shape(("market", step_size), lambda: build_market_image(step_size))
         self.rect = self.image.get_rect()
-        self.rect.topleft = pos
\ No newline at end of file
+        self.rect.topleft = pos
+
+# ============================================
+# 지정가 호가창 (가격-시간 우선 체결)
+# ============================================
+BUY = "매수"
+SELL = "매도"
+
+class Order:
+    """호가창에 들어온 지정가 주문 (remaining이 0이 되거나 취소되면 호가창에서 빠짐)"""
+    __slots__ = ("order_id", "owner", "side", "price", "quantity", "remaining", "cancelled")
+
+    def __init__(self, order_id, owner, side, price, quantity):
+        self.order_id = order_id
+        self.owner = owner
+        self.side = side
+        self.price = price
+        self.quantity = quantity
+        self.remaining = quantity
+        self.cancelled = False
+
+class Fill:
+    """체결 한 건을 한쪽 참가자 입장에서 본 기록 (체결 한 번마다 매수/매도 쪽 두 건이 생김)"""
+    __slots__ = ("order_id", "owner", "side", "price", "quantity", "maker")
+
+    def __init__(self, order_id, owner, side, price, quantity, maker):
+        self.order_id = order_id
+        self.owner = owner
+        self.side = side
+        self.price = price
+        self.quantity = quantity
+        self.maker = maker  # 💡 먼저 호가창에 있던 주문 쪽이면 True (체결 가격은 이 주문의 가격)
+
+    def __repr__(self):
+        return f"Fill({self.owner!r}, {self.side}, {self.quantity}@{self.price})"
+
+class OrderBook:
+    """
+    가격-시간 우선 지정가 호가창.
+
+    - 매수 호가는 높은 가격, 매도 호가는 낮은 가격이 먼저이고, 같은 가격이면 먼저 들어온 주문이 먼저 체결된다.
+    - 새 주문은 반대편 최우선 호가와 가격이 맞는 동안 (먼저 있던 주문의 가격으로) 체결되고, 남은 수량은 호가창에 쌓인다.
+    - 체결 내역은 참가자(owner)별로 fills에 쌓인다. owner는 상인 객체처럼 해시 가능한 값이면 된다.
+    - 취소는 표시만 해 두고 호가창 맨 앞에 올 때 버린다 (heap에서 중간 삭제를 하지 않음).
+    """
+    def __init__(self):
+        self._bids = []  # (-가격, 순번, Order)
+        self._asks = []  # (가격, 순번, Order)
+        self._orders = {}  # order_id -> 호가창에 남은 Order
+        self._sequence = count()
+        self.fills = {}  # owner -> [Fill, ...]
+        self.trade_count = 0
+        self.volume = 0
+        self.notional = 0
+        self.last_price = None
+
+    def __len__(self):
+        """호가창에 남은 주문 수"""
+        return len(self._orders)
+
+    def submit(self, owner, side, price, quantity):
+        """
+        지정가 주문 제출. 이번 주문으로 생긴 체결 목록(이 주문 쪽 Fill)과 주문 객체를 반환한다.
+        side는 "매수"/"매도", price와 quantity는 양의 정수.
+        """
+        if side not in (BUY, SELL):
+            raise ValueError(f"알 수 없는 주문 유형: {side}")
+        if price <= 0 or quantity <= 0:
+            raise ValueError("가격과 수량은 0보다 커야 합니다.")
+
+        sequence = next(self._sequence)
+        order = Order(sequence, owner, side, price, quantity)
+        taker_fills = []
+
+        if side == BUY:
+            book, opposite = self._bids, self._asks
+            crosses = lambda best_price: best_price <= price
+            key = -price
+        else:
+            book, opposite = self._asks, self._bids
+            crosses = lambda best_price: -best_price >= price
+            key = price
+
+        fills = self.fills
+        while order.remaining and opposite:
+            best_key, _, resting = opposite[0]
+            if resting.cancelled or not resting.remaining:
+                heapq.heappop(opposite)
+                continue
+            if not crosses(best_key):
+                break
+
+            trade_quantity = min(order.remaining, resting.remaining)
+            trade_price = resting.price
+            order.remaining -= trade_quantity
+            resting.remaining -= trade_quantity
+            if not resting.remaining:
+                heapq.heappop(opposite)
+                del self._orders[resting.order_id]
+
+            taker_fill = Fill(order.order_id, owner, side, trade_price, trade_quantity, False)
+            taker_fills.append(taker_fill)
+            fills.setdefault(owner, []).append(taker_fill)
+            fills.setdefault(resting.owner, []).append(
+                Fill(resting.order_id, resting.owner, resting.side, trade_price, trade_quantity, True)
+            )
+            self.trade_count += 1
+            self.volume += trade_quantity
+            self.notional += trade_price * trade_quantity
+            self.last_price = trade_price
+
+        if order.remaining:
+            heapq.heappush(book, (key, sequence, order))
+            self._orders[sequence] = order
+        return taker_fills, order
+
+    def cancel(self, order_id):
+        """호가창에 남은 주문 취소. 취소했으면 True"""
+        order = self._orders.pop(order_id, None)
+        if order is None:
+            return False
+        order.cancelled = True
+        return True
+
+    def _best(self, heap):
+        while heap and (heap[0][2].cancelled or not heap[0][2].remaining):
+            heapq.heappop(heap)
+        return heap[0][2].price if heap else None
+
+    def best_bid(self):
+        return self._best(self._bids)
+
+    def best_ask(self):
+        return self._best(self._asks)
+
+    def vwap(self):
+        """체결 가중 평균 가격 (체결이 없으면 None)"""
+        return self.notional / self.volume if self.volume else None
+
+    def fill_report(self, owner):
+        """owner의 체결 요약: {filled, average_price, fills}"""
+        owner_fills = self.fills.get(owner, [])
+        filled = sum(fill.quantity for fill in owner_fills)
+        notional = sum(fill.price * fill.quantity for fill in owner_fills)
+        return {
+            "filled": filled,
+            "average_price": notional / filled if filled else None,
+            "fills": owner_fills
+        }
@@ -0,0 +1,131 @@
+"""대사 생성 계측 (지연 시간, 재시도, 토큰 사용량, 캐시 적중, 파싱 실패)"""
+import json
+import os
+import threading
+import time
+import uuid
+
+from core.resilience import LatencyTracker
+
+class Histogram(LatencyTracker):
+    """전체 표본을 보관하는 히스토그램 (p50/p95/p99 요약)"""
+    def __init__(self):
+        super().__init__(window=None)
+
+    def summary(self):
+        with self._lock:
+            samples = list(self._samples)
+        if not samples:
+            return {"count": 0}
+        return {
+            "count": len(samples),
+            "mean": sum(samples) / len(samples),
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": max(samples)
+        }
+
+class DialogueMetrics:
+    """
+    대사 요청 한 건마다 record_call()로 기록하는 프로세스 내 계측 객체.
+    write_jsonl()은 요청별 기록과 요약을 JSON Lines로 덧붙여 저장한다.
+    캐시 적중은 API를 호출하지 않으므로 latency_ms(API 지연)와 requests에 넣지 않고
+    cache_latency_ms와 cache_hits로 따로 센다.
+    """
+    def __init__(self):
+        self.session_id = uuid.uuid4().hex[:12]
+        self.started_at = time.time()
+        self.latency_ms = Histogram()
+        self.cache_latency_ms = Histogram()
+        self.counters = {
+            "requests": 0,
+            "retries": 0,
+            "cache_hits": 0,
+            "cache_misses": 0,
+            "parse_failures": 0,
+            "fallbacks": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "estimated_token_calls": 0
+        }
+        self._records = []
+        self._lock = threading.Lock()
+
+    def record_call(self, kind, latency_s, npc_count=1, retries=0, prompt_tokens=None,
+                    completion_tokens=None, tokens_estimated=False, cache=None, parse_failures=0, outcome="ok"):
+        """
+        요청 한 건 기록.
+        - kind: "single"(NPC 1명) 또는 "batch"(일괄)
+        - tokens_estimated: 토큰 수가 API 보고값이 아니라 추정값인지 (일찍 끊은 스트리밍 응답)
+        - cache: "hit", "miss" 또는 None(캐시 미사용)
+        - outcome: "ok", "fallback"(대체 대사 사용)
+        """
+        latency_ms = latency_s * 1000
+        if cache == "hit":
+            self.cache_latency_ms.record(latency_ms)
+        else:
+            self.latency_ms.record(latency_ms)
+        with self._lock:
+            if cache != "hit":
+                self.counters["requests"] += 1
+            self.counters["retries"] += retries
+            self.counters["parse_failures"] += parse_failures
+            self.counters["prompt_tokens"] += prompt_tokens or 0
+            self.counters["completion_tokens"] += completion_tokens or 0
+            if tokens_estimated:
+                self.counters["estimated_token_calls"] += 1
+            if cache == "hit":
+                self.counters["cache_hits"] += 1
+            elif cache == "miss":
+                self.counters["cache_misses"] += 1
+            if outcome != "ok":
+                self.counters["fallbacks"] += 1
+            self._records.append({
+                "type": "call",
+                "session": self.session_id,
+                "ts": time.time(),
+                "kind": kind,
+                "npc_count": npc_count,
+                "latency_ms": round(latency_ms, 2),
+                "retries": retries,
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "tokens_estimated": tokens_estimated,
+                "cache": cache,
+                "parse_failures": parse_failures,
+                "outcome": outcome
+            })
+
+    def record_cache_misses(self, count=1):
+        """API 요청 한 건에 여러 NPC를 담는 경우(일괄 생성) 요청 전에 확인한 캐시 미적중 수 기록"""
+        with self._lock:
+            self.counters["cache_misses"] += count
+
+    def snapshot(self):
+        """현재까지의 카운터와 지연 시간 요약"""
+        with self._lock:
+            counters = dict(self.counters)
+        return {
+            "type": "summary",
+            "session": self.session_id,
+            "started_at": self.started_at,
+            "ended_at": time.time(),
+            "counters": counters,
+            "latency_ms": self.latency_ms.summary(),
+            "cache_latency_ms": self.cache_latency_ms.summary()
+        }
+
+    def write_jsonl(self, path):
+        """요청별 기록 + 요약 한 줄을 path에 덧붙여 저장"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            records = list(self._records)
+        with open(path, "a", encoding="utf-8") as f:
+            for record in records + [self.snapshot()]:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+# 💡 프로세스 전체에서 공유하는 계측 객체
+dialogue_metrics = DialogueMetrics()
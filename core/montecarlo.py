@@ -0,0 +1,117 @@
+"""
+최종 가격 몬테카를로 분석 (NumPy 벡터화).
+
+calculate_final_price는 시장 변동성을 한 번만 뽑아 정산하지만, 여기서는 같은 베팅과 NPC 정보로
+변동성을 N번 뽑아 최종 가격 분포와 상인별 기대 손익/분산/손실 확률을 한 번에 계산한다.
+플레이어의 money/profit은 바꾸지 않는다.
+
+numpy는 선택 의존성이므로 분석 함수를 처음 호출할 때 불러온다 (pip install numpy).
+"""
+from config.game_data import PRICE_NPC_INFLUENCE, PRICE_VOLATILITY_LOW, PRICE_VOLATILITY_HIGH
+from core.function import npc_price_factor
+
+def _import_numpy():
+    try:
+        import numpy as np
+    except ImportError as e:
+        raise ImportError("몬테카를로 정산에는 numpy가 필요합니다. (pip install numpy)") from e
+    return np
+
+def _profit_sign(bet_type):
+    """calculate_final_price와 같은 손익 부호 (매수 +1, 매도 -1, 그 외 0)"""
+    if bet_type == "매수":
+        return 1
+    if bet_type == "매도":
+        return -1
+    return 0
+
+class SettlementDistribution:
+    """
+    simulate_settlement 결과.
+
+    - final_prices: 뽑은 최종 가격 (int64 배열, 길이 n_draws)
+    - players: 상인별 통계 딕셔너리 리스트 (players 순서)
+      {name, bet_type, bet_price, bet_quantity, expected_profit, profit_variance, profit_std, loss_probability}
+    """
+    def __init__(self, final_prices, players, avg_price, npc_factor):
+        self.final_prices = final_prices
+        self.players = players
+        self.avg_price = avg_price
+        self.npc_factor = npc_factor
+
+    @property
+    def n_draws(self):
+        return len(self.final_prices)
+
+    def price_summary(self, percentiles=(5, 25, 50, 75, 95)):
+        """최종 가격 평균/표준편차/최솟값/최댓값과 백분위수"""
+        np = _import_numpy()
+        prices = self.final_prices
+        summary = {
+            "mean": float(prices.mean()),
+            "std": float(prices.std()),
+            "min": int(prices.min()),
+            "max": int(prices.max())
+        }
+        for q, value in zip(percentiles, np.percentile(prices, percentiles)):
+            summary[f"p{q}"] = float(value)
+        return summary
+
+    def price_histogram(self):
+        """(가격 배열, 각 가격의 확률 배열). 가격은 정수이므로 값별로 센다"""
+        np = _import_numpy()
+        prices, counts = np.unique(self.final_prices, return_counts=True)
+        return prices, counts / self.n_draws
+
+def simulate_settlement(players, npc_dialogue_data, n_draws=1_000_000, seed=None,
+                        influence=PRICE_NPC_INFLUENCE,
+                        volatility_low=PRICE_VOLATILITY_LOW, volatility_high=PRICE_VOLATILITY_HIGH):
+    """
+    시장 변동성을 n_draws번 뽑아 최종 가격 분포와 상인별 손익 통계 계산 (SettlementDistribution 반환).
+
+    - players: bet_price, bet_quantity, bet_type, name을 가진 상인 리스트 (Player/PlayerState)
+    - npc_dialogue_data: calculate_final_price와 같은 info_type 리스트
+    - seed: numpy.random.default_rng에 넘길 seed (또는 Generator)
+    - influence, volatility_low/high: 밸런스 조정용 (기본값은 config의 현재 규칙)
+    """
+    np = _import_numpy()
+    if not players:
+        raise ValueError("정산할 상인이 없습니다.")
+    if n_draws <= 0:
+        raise ValueError("n_draws는 1 이상이어야 합니다.")
+
+    rng = np.random.default_rng(seed)
+
+    # 💡 calculate_final_price와 같은 순서로 곱해 한 번 뽑은 값의 결과가 같도록 함
+    avg_price = sum(p.bet_price for p in players) / len(players)
+    npc_factor = npc_price_factor(npc_dialogue_data, influence)
+    market_volatility = rng.uniform(volatility_low, volatility_high, n_draws)
+    final_prices = (avg_price * (market_volatility * npc_factor)).astype(np.int64)  # int()처럼 0 쪽으로 버림
+
+    # 💡 손익은 최종 가격의 1차식(sign * quantity * (price - bet_price))이므로
+    #    상인마다 n_draws 크기 배열을 만들지 않고 가격 분포의 평균/분산에서 바로 구한다.
+    price_mean = float(final_prices.mean())
+    price_var = float(final_prices.var())
+    stats = []
+    for player in players:
+        sign = _profit_sign(player.bet_type)
+        scale = sign * player.bet_quantity
+        if scale > 0:
+            losses = int(np.count_nonzero(final_prices < player.bet_price))
+        elif scale < 0:
+            losses = int(np.count_nonzero(final_prices > player.bet_price))
+        else:
+            losses = 0
+        profit_variance = scale * scale * price_var
+        stats.append({
+            "name": player.name,
+            "bet_type": player.bet_type,
+            "bet_price": player.bet_price,
+            "bet_quantity": player.bet_quantity,
+            "expected_profit": scale * (price_mean - player.bet_price),
+            "profit_variance": profit_variance,
+            "profit_std": profit_variance ** 0.5,
+            "loss_probability": losses / n_draws
+        })
+
+    return SettlementDistribution(final_prices, stats, avg_price, npc_factor)
@@ -1,123 +1,550 @@
 """NPC 클래스 및 AI 대사 생성"""
 import pygame
-import random
 import os
 import json # 
-from openai import OpenAI
-from dotenv import load_dotenv
-from config.game_data import NPC_POSITIONS, TARGET_NPCS
-
-# .env 파일에서 환경 변수 로드
-load_dotenv()
+import re
+import threading
+import time
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from config.game_data import (
+    NPC_POSITIONS, TARGET_NPCS, NPC_DIALOGUE_MAX_WORKERS, NPC_BATCH_MAX_ROUNDS, DIALOGUE_CACHE_ENABLED,
+    NPC_DIALOGUE_PROVIDER, NPC_DIALOGUE_SEED, NPC_DIALOGUE_STREAM, NPC_STREAM_MAX_TOKENS,
+    NPC_REQUEST_TIMEOUT, NPC_RETRY_MAX_ATTEMPTS, NPC_RETRY_BASE_DELAY, NPC_RETRY_MAX_DELAY,
+    NPC_BREAKER_FAILURE_THRESHOLD, NPC_BREAKER_RESET_SECONDS, NPC_FALLBACK_TO_LOCAL,
+    NPC_HEDGE_ENABLED, NPC_HEDGE_PERCENTILE, NPC_HEDGE_MIN_SAMPLES, NPC_HEDGE_DEFAULT_DELAY
+)
+from core.assets import assets
+from core.dialogue_cache import DialogueCache
+from core.engine import NPCState
+from core.dialogue_provider import DialogueProvider, LocalDialogueProvider, describe_npc_position, position_rng
+from core.metrics import dialogue_metrics
+from core.resilience import (
+    RetryPolicy, CircuitBreaker, CircuitOpenError, RequestCancelled, LatencyTracker, call_with_resilience,
+    configure_hedge_pool
+)
 
 # ============================================
-# OpenAI 클라이언트 초기화
+# OpenAI 클라이언트 / 대사 캐시 (처음 사용할 때 초기화)
 # ============================================
-try:
-    # API KEY가 환경 변수에 설정되어 있어야 함
-    openai_client = OpenAI() 
-    print("✓ OpenAI 클라이언트 준비 완료!")
-except Exception as e:
-    print(f"❌ OpenAI 클라이언트 초기화 오류: {e}")
-    openai_client = "error"
+# 💡 import 시점에는 네트워크/파일 작업을 하지 않는다.
+#    openai, dotenv 모듈도 클라이언트가 처음 필요할 때 불러온다.
+_openai_client = None
+_dialogue_cache = None
+_init_lock = threading.Lock()
+
+def get_openai_client():
+    """OpenAI 클라이언트 반환. 최초 호출 시 .env 로드 후 생성하며, 실패하면 "error" 반환"""
+    global _openai_client
+    with _init_lock:
+        if _openai_client is None:
+            try:
+                from dotenv import load_dotenv
+                from openai import OpenAI
+
+                # .env 파일에서 환경 변수 로드
+                load_dotenv()
+                # API KEY가 환경 변수에 설정되어 있어야 함
+                # 💡 재시도는 call_with_resilience에서 직접 처리하므로 SDK 자체 재시도는 끔
+                _openai_client = OpenAI(max_retries=0, timeout=NPC_REQUEST_TIMEOUT)
+                print("✓ OpenAI 클라이언트 준비 완료!")
+            except Exception as e:
+                print(f"❌ OpenAI 클라이언트 초기화 오류: {e}")
+                _openai_client = "error"
+    return _openai_client
+
+# 💡 OpenAI 호출 안정화: 재시도 정책, 서킷 브레이커, 지연 시간 기록 (모든 요청이 공유)
+openai_retry_policy = RetryPolicy(NPC_RETRY_MAX_ATTEMPTS, NPC_RETRY_BASE_DELAY, NPC_RETRY_MAX_DELAY)
+openai_breaker = CircuitBreaker(NPC_BREAKER_FAILURE_THRESHOLD, NPC_BREAKER_RESET_SECONDS)
+openai_latency = LatencyTracker()
+# 💡 동시 요청마다 주 요청 + 헤지 요청 두 개가 헤지 풀 스레드를 씀
+configure_hedge_pool(2 * NPC_DIALOGUE_MAX_WORKERS)
+
+def get_dialogue_cache():
+    """디스크 대사 캐시 반환. 비활성화되었거나 열 수 없으면 None"""
+    global _dialogue_cache
+    with _init_lock:
+        if _dialogue_cache is None and DIALOGUE_CACHE_ENABLED:
+            try:
+                _dialogue_cache = DialogueCache()
+            except Exception as e:
+                print(f"⚠️ 대사 캐시를 열 수 없습니다. 캐시 없이 진행합니다: {e}")
+                _dialogue_cache = False
+    return _dialogue_cache or None
 
 # ============================================
 # NPC 대사 생성 함수 (JSON 응답 요청하도록 수정)
 # ============================================
-def generate_npc_dialogue_openai(pos):
+NPC_DIALOGUE_MODEL = "gpt-4o"
+NPC_DIALOGUE_TEMPERATURE = 0.8
+
+# 💡 시스템 지침 : JSON 형식과 필드 명확히 요청
+NPC_SYSTEM_INSTRUCTION = (
+    "당신은 삼국시대 배경의 NPC입니다. 대사는 쌀 시장 정보에 초점을 맞추고, 역할에 맞는 말투로 30자 내외로 간결하게 작성하세요. "
+    "응답은 반드시 **JSON 형식**이어야 하며, 두 개의 키('dialogue', 'influence')를 포함해야 합니다. "
+    "'influence' 필드의 값은 반드시 **'UP'** 또는 **'DOWN'** 중 하나여야 합니다."
+)
+
+def format_npc_prompt(location_hint, role):
+    """NPC 한 명에 대한 사용자 프롬프트"""
+    # 💡 AI에게 전달할 구체적인 임무 및 가격 영향력 정보 생성 유도
+    return (
+        f"당신은 삼국시대 배경의 **{location_hint}**에 있는 **{role}**입니다. "
+        f"최근 쌀 시장 가격에 영향을 줄 수 있는 날씨, 전쟁, 흉년, 세금, 관리의 동향 등에 대한 정보를 바탕으로 짧고 흥미로운 소문이나 정보를 한 문장으로 말해주세요. "
+        f"이 정보는 **쌀 가격 상승(UP) 또는 하락(DOWN) 중 하나**에 영향을 미치는 내용이어야 합니다."
+    )
+
+def build_npc_prompt(pos, seed=None):
+    """NPC 위치로부터 역할을 정하고 (role, base_prompt)를 반환 (seed를 주면 역할 선택이 재현 가능)"""
+    location_hint, role = describe_npc_position(pos, position_rng(seed, pos))
+    return role, format_npc_prompt(location_hint, role)
+
+def make_dialogue_cache_key(base_prompt):
+    """캐시 키: 프롬프트 + 모델 + temperature 해시"""
+    return DialogueCache.make_key(
+        NPC_SYSTEM_INSTRUCTION + "\n" + base_prompt, NPC_DIALOGUE_MODEL, NPC_DIALOGUE_TEMPERATURE
+    )
+
+def clean_dialogue(dialogue):
+    """30자로 제한 및 불필요한 문자 정리"""
+    dialogue = dialogue.strip().replace('"', '').replace("'", '')
+    if len(dialogue) > 30:
+        dialogue = dialogue[:30].strip() + "..."
+    return dialogue
+
+def extract_json_string_fields(text, keys):
+    """
+    완성되지 않은 JSON 텍스트에서 값이 문자열로 완전히 닫힌 키만 골라 {key: value} 반환.
+    스트리밍 응답을 조각마다 검사하는 용도.
+    """
+    fields = {}
+    for key in keys:
+        match = re.search(r'"%s"\s*:\s*"((?:[^"\\]|\\.)*)"' % re.escape(key), text)
+        if match:
+            fields[key] = json.loads('"' + match.group(1) + '"')
+    return fields
+
+def record_usage(response, usage):
+    """응답의 토큰 사용량을 usage 딕셔너리에 더함"""
+    if usage is None or getattr(response, "usage", None) is None:
+        return
+    usage["prompt_tokens"] = usage.get("prompt_tokens", 0) + response.usage.prompt_tokens
+    usage["completion_tokens"] = usage.get("completion_tokens", 0) + response.usage.completion_tokens
+
+def estimate_tokens(messages):
+    """
+    토크나이저 없이 대략 계산한 프롬프트 토큰 수.
+    ASCII는 4자당 1토큰, 한글 등 그 외 문자는 1자당 1토큰, 메시지마다 형식 토큰 4개로 계산한다.
+    """
+    total = 3
+    for message in messages:
+        content = message["content"]
+        ascii_chars = sum(1 for ch in content if ord(ch) < 128)
+        total += 4 + (ascii_chars + 3) // 4 + (len(content) - ascii_chars)
+    return total
+
+def read_streamed_fields(stream, keys, usage=None, cancel=None, deadline=None, prompt_tokens_estimate=None):
+    """
+    스트리밍 응답 조각을 이어 붙이며 keys의 값이 모두 완성되면 즉시 스트림을 닫고 반환.
+    (이후 토큰은 생성/과금되지 않음) 끝까지 완성되지 않으면 전체 텍스트를 JSON으로 파싱한다.
+
+    스트림이 끝까지 오면 마지막 사용량 조각(stream_options include_usage)의 값을 usage에 더한다.
+    일찍 끊으면 사용량 조각이 오지 않으므로 completion 토큰은 받은 조각 수로,
+    prompt 토큰은 prompt_tokens_estimate로 추정하고 usage["estimated"]를 True로 표시한다.
+
+    cancel(threading.Event)이 설정되면 RequestCancelled, time.monotonic()이 deadline을 넘기면
+    TimeoutError를 올리며, 어느 경우든 스트림을 닫는다.
+    """
+    buffer = ""
+    received = 0
+    reported = False
+    try:
+        for chunk in stream:
+            # 💡 조각 사이 대기는 SDK 시간 제한이 막고, 여기서는 스트림 전체 길이와 헤지 취소를 확인
+            if cancel is not None and cancel.is_set():
+                raise RequestCancelled("먼저 끝난 헤지 요청이 있어 스트림을 중단합니다.")
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError(f"스트리밍 응답이 {NPC_REQUEST_TIMEOUT:.0f}초 안에 끝나지 않았습니다.")
+            if getattr(chunk, "usage", None) is not None:
+                record_usage(chunk, usage)
+                reported = True
+            if not chunk.choices:
+                continue
+            received += 1
+            buffer += chunk.choices[0].delta.content or ""
+            fields = extract_json_string_fields(buffer, keys)
+            if len(fields) == len(keys):
+                return fields
+    finally:
+        stream.close()
+        if usage is not None and not reported:
+            usage["completion_tokens"] = usage.get("completion_tokens", 0) + received
+            usage["prompt_tokens"] = usage.get("prompt_tokens", 0) + (prompt_tokens_estimate or 0)
+            usage["estimated"] = True
+    return json.loads(buffer)
+
+def request_npc_dialogue_openai(openai_client, base_prompt, usage=None, cancel=None):
+    """
+    NPC 한 명의 대사를 OpenAI에 한 번 요청하여 {dialogue, info_type} 반환.
+    실패(시간 초과, 파싱 오류 등) 시 예외를 그대로 올린다. influence가 UP/DOWN이 아니면 ValueError.
+    usage 딕셔너리를 주면 prompt_tokens/completion_tokens를 기록한다 (추정값이면 usage["estimated"]가 True).
+    cancel(threading.Event)이 설정되면 요청을 보내지 않거나 스트림을 중단하고 RequestCancelled를 올린다.
+    스트리밍 응답은 NPC_REQUEST_TIMEOUT 안에 모두 받아야 한다.
+    """
+    if cancel is not None and cancel.is_set():
+        raise RequestCancelled("먼저 끝난 헤지 요청이 있어 요청을 보내지 않습니다.")
+    request_args = dict(
+        model=NPC_DIALOGUE_MODEL,
+        # 💡 JSON 응답 형식 요청 추가
+        response_format={"type": "json_object"}, 
+        messages=[
+            {"role": "system", "content": NPC_SYSTEM_INSTRUCTION},
+            {"role": "user", "content": base_prompt}
+        ],
+        temperature=NPC_DIALOGUE_TEMPERATURE,
+        # 💡 스트리밍은 두 필드가 완성되면 끊으므로 대사 30자 + JSON 키만큼만 예약
+        max_tokens=NPC_STREAM_MAX_TOKENS if NPC_DIALOGUE_STREAM else 200,
+        top_p=1,
+        timeout=NPC_REQUEST_TIMEOUT,
+    )
+
+    if NPC_DIALOGUE_STREAM:
+        # 💡 스트리밍: 두 필드가 완성되는 즉시 응답을 끊음 (끝까지 받은 경우에만 사용량 조각이 옴)
+        parsed_data = read_streamed_fields(
+            openai_client.chat.completions.create(
+                stream=True, stream_options={"include_usage": True}, **request_args
+            ),
+            ("dialogue", "influence"), usage,
+            cancel=cancel, deadline=time.monotonic() + NPC_REQUEST_TIMEOUT,
+            prompt_tokens_estimate=estimate_tokens(request_args["messages"])
+        )
+    else:
+        response = openai_client.chat.completions.create(**request_args)
+        record_usage(response, usage)
+        raw_json_response = response.choices[0].message.content
+        # 💡 JSON 파싱
+        parsed_data = json.loads(raw_json_response)
+
+    if not isinstance(parsed_data, dict):
+        raise ValueError(f"응답이 JSON 객체가 아닙니다: {parsed_data!r}")
+
+    # 30자로 제한 및 불필요한 문자 정리
+    dialogue = clean_dialogue(parsed_data.get('dialogue', '정보 없음'))
+        
+    # 💡 influence 값을 info_type으로 추출 (parse_npc_batch_response와 같은 검증)
+    #    UP/DOWN이 아니면 ValueError로 재시도하고 계측에서 파싱 실패로 센다
+    influence = parsed_data.get('influence')
+    if not isinstance(influence, str) or influence.strip().upper() not in ("UP", "DOWN"):
+        raise ValueError(f"influence 값이 UP/DOWN이 아닙니다: {influence!r}")
+    info_type = influence.strip().upper()
+
+    return {
+        "dialogue": dialogue,
+        "info_type": info_type
+    }
+
+def current_hedge_delay():
+    """헤지 요청을 보낼 기준 시간: 최근 지연 시간의 p95 (표본이 적으면 기본값)"""
+    if not NPC_HEDGE_ENABLED:
+        return None
+    if len(openai_latency) < NPC_HEDGE_MIN_SAMPLES:
+        return NPC_HEDGE_DEFAULT_DELAY
+    return openai_latency.percentile(NPC_HEDGE_PERCENTILE)
+
+def generate_npc_dialogue_openai(pos, fallback=None, seed=None, check_cache=True):
     """
     NPC 위치 기반 창의적 대사와 가격 영향력 정보를 JSON으로 생성 (OpenAI GPT-4o 사용).
+    디스크 캐시에 같은 프롬프트의 대사가 충분히 쌓여 있으면 API를 호출하지 않는다.
+
+    요청마다 시간 제한을 두고 지수 백오프로 재시도하며, p95 지연을 넘긴 요청에는 중복 요청을 보낸다.
+    연속 실패로 서킷 브레이커가 열렸거나 재시도가 모두 실패하면 fallback 제공자(없으면 기본 대사)를 사용한다.
+    seed를 주면 NPC 역할(프롬프트) 선택이 재현 가능하다.
+    check_cache가 False이면 (호출한 쪽에서 이미 캐시를 확인해 미적중으로 센 경우) 캐시는 저장에만 쓴다.
     """
-    global openai_client
+    role, base_prompt = build_npc_prompt(pos, seed)
+    started = time.perf_counter()
+
+    dialogue_cache = get_dialogue_cache()
+    cache_key = None
+    if dialogue_cache is not None:
+        cache_key = make_dialogue_cache_key(base_prompt)
+        cached = dialogue_cache.get(cache_key) if check_cache else None
+        if cached is not None:
+            dialogue_metrics.record_call("single", time.perf_counter() - started, cache="hit")
+            return cached
+    cache_state = "miss" if cache_key is not None and check_cache else None
     
+    openai_client = get_openai_client()
     if openai_client == "error":
+        dialogue_metrics.record_call("single", time.perf_counter() - started, cache=cache_state, outcome="fallback")
+        if fallback is not None:
+            return fallback.generate(pos)
         # 💡 오류 시 info_type: 'NONE' 포함하여 반환
         return {
             "dialogue": "API 연결 오류: 시세 정보를 알 수 없습니다.",
             "info_type": "NONE" 
         }
-        
-    x, y = pos
-    
-    # 위치 기반 컨텍스트 및 역할 부여 로직
-    if y > 600:
-        location_hint = "마을 남쪽의 논 근처"
-        role = random.choice(["농민", "마을 이장"])
-    elif y < 300:
-        location_hint = "마을 북쪽의 산길 입구"
-        role = random.choice(["떠돌이 상인", "순찰 관리"])
-    elif x < 300:
-        location_hint = "마을 서쪽의 우물가"
-        role = random.choice(["주민", "행상"])
-    else:
-        location_hint = "마을 동쪽의 장터 입구"
-        role = random.choice(["쌀 상인", "군량미 담당 관리"])
-        
-    # 💡 AI에게 전달할 구체적인 임무 및 가격 영향력 정보 생성 유도
-    base_prompt = (
-        f"당신은 삼국시대 배경의 **{location_hint}**에 있는 **{role}**입니다. "
-        f"최근 쌀 시장 가격에 영향을 줄 수 있는 날씨, 전쟁, 흉년, 세금, 관리의 동향 등에 대한 정보를 바탕으로 짧고 흥미로운 소문이나 정보를 한 문장으로 말해주세요. "
-        f"이 정보는 **쌀 가격 상승(UP) 또는 하락(DOWN) 중 하나**에 영향을 미치는 내용이어야 합니다."
-    )
+
+    usage = {}
+    failures = []
+    try:
+        npc_data = call_with_resilience(
+            lambda cancel: request_npc_dialogue_openai(openai_client, base_prompt, usage, cancel),
+            openai_retry_policy, openai_breaker, openai_latency, current_hedge_delay(),
+            on_retry=lambda attempt, error: failures.append(error), cancellable=True
+        )
+        # 💡 검증을 통과한(UP/DOWN) 결과만 캐시에 저장
+        if cache_key is not None:
+            dialogue_cache.put(cache_key, npc_data)
+        outcome = "ok"
     
-    # 💡 시스템 지침 : JSON 형식과 필드 명확히 요청
-    system_instruction = (
-        "당신은 삼국시대 배경의 NPC입니다. 대사는 쌀 시장 정보에 초점을 맞추고, 역할에 맞는 말투로 30자 내외로 간결하게 작성하세요. "
-        "응답은 반드시 **JSON 형식**이어야 하며, 두 개의 키('dialogue', 'influence')를 포함해야 합니다. "
-        "'influence' 필드의 값은 반드시 **'UP'** 또는 **'DOWN'** 중 하나여야 합니다."
+    except Exception as e:
+        if not isinstance(e, CircuitOpenError):
+            print(f"⚠️ OpenAI API 호출 또는 JSON 파싱 중 오류 발생: {e}")
+        if fallback is not None:
+            npc_data = fallback.generate(pos)
+        else:
+            # 오류 발생 시 기본값 반환
+            npc_data = {
+                "dialogue": f"요즘 흉년이라 그런가... 말이 잘 안 나오네. ({role})",
+                "info_type": "NONE"
+            }
+        outcome = "fallback"
+
+    # 💡 재시도 횟수 = 전체 시도 수 - 1 (실패한 시도는 failures에 쌓임)
+    attempts = len(failures) + (1 if outcome == "ok" else 0)
+    dialogue_metrics.record_call(
+        "single", time.perf_counter() - started,
+        retries=max(0, attempts - 1),
+        prompt_tokens=usage.get("prompt_tokens"),
+        completion_tokens=usage.get("completion_tokens"),
+        tokens_estimated=usage.get("estimated", False),
+        cache=cache_state,
+        parse_failures=sum(1 for error in failures if isinstance(error, ValueError)),
+        outcome=outcome
     )
+    return npc_data
 
-    try:
+# ============================================
+# NPC 대사 일괄 생성 (API 1회 호출)
+# ============================================
+NPC_BATCH_SYSTEM_INSTRUCTION = (
+    "당신은 삼국시대 배경의 여러 NPC 대사를 한꺼번에 작성합니다. 각 대사는 쌀 시장 정보에 초점을 맞추고, "
+    "역할에 맞는 말투로 30자 내외로 간결하게 작성하세요. 날씨, 전쟁, 흉년, 세금, 관리의 동향 등에 대한 짧고 흥미로운 소문이어야 합니다. "
+    "응답은 반드시 **JSON 형식**이어야 하며, 'npcs' 키에 요청받은 NPC마다 객체 하나씩 담긴 배열을 넣으세요. "
+    "각 객체는 'id'(요청의 정수 id), 'dialogue', 'influence' 키를 가지며, "
+    "'influence' 값은 반드시 **'UP'** 또는 **'DOWN'** 중 하나여야 합니다."
+)
+
+def parse_npc_batch_response(raw_json_response, expected_ids):
+    """
+    일괄 응답을 검증하여 {npc_id: {dialogue, info_type}} 반환.
+    스키마에 맞지 않거나 요청하지 않은 id, 중복 id 항목은 버린다.
+    """
+    parsed_data = json.loads(raw_json_response)
+    items = parsed_data.get('npcs') if isinstance(parsed_data, dict) else None
+    if not isinstance(items, list):
+        raise ValueError("'npcs' 배열이 없습니다.")
+
+    results = {}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        npc_id = item.get('id')
+        dialogue = item.get('dialogue')
+        influence = item.get('influence')
+        if isinstance(npc_id, bool) or not isinstance(npc_id, int) or npc_id not in expected_ids or npc_id in results:
+            continue
+        if not isinstance(dialogue, str) or not dialogue.strip():
+            continue
+        if not isinstance(influence, str) or influence.strip().upper() not in ("UP", "DOWN"):
+            continue
+        results[npc_id] = {
+            "dialogue": clean_dialogue(dialogue),
+            "info_type": influence.strip().upper()
+        }
+    return results
+
+def request_npc_dialogue_batch(specs):
+    """
+    specs: [(npc_id, location_hint, role)] 를 한 번의 API 호출로 생성.
+    검증을 통과한 항목만 {npc_id: {dialogue, info_type}}로 반환 (실패 시 빈 딕셔너리).
+    """
+    openai_client = get_openai_client()
+    if openai_client == "error" or not specs:
+        return {}
+
+    npc_lines = "\n".join(f"- id {npc_id}: {location_hint}의 {role}" for npc_id, location_hint, role in specs)
+    user_prompt = f"다음 {len(specs)}명의 NPC 대사를 작성하세요.\n{npc_lines}"
+
+    usage = {}
+
+    def request_batch():
         response = openai_client.chat.completions.create(
-            model="gpt-4o",
-            # 💡 JSON 응답 형식 요청 추가
-            response_format={"type": "json_object"}, 
+            model=NPC_DIALOGUE_MODEL,
+            response_format={"type": "json_object"},
             messages=[
-                {"role": "system", "content": system_instruction},
-                {"role": "user", "content": base_prompt}
+                {"role": "system", "content": NPC_BATCH_SYSTEM_INSTRUCTION},
+                {"role": "user", "content": user_prompt}
             ],
-            temperature=0.8,
-            max_tokens=200,
+            temperature=NPC_DIALOGUE_TEMPERATURE,
+            # 💡 NPC 한 명당 대사 30자 + JSON 키 정도의 여유만 확보
+            max_tokens=80 * len(specs),
             top_p=1,
+            # 💡 응답이 길어지는 만큼 시간 제한도 NPC 수에 비례해 늘림
+            timeout=NPC_REQUEST_TIMEOUT * max(1, len(specs) // 5),
+        )
+        record_usage(response, usage)
+        return parse_npc_batch_response(
+            response.choices[0].message.content, {npc_id for npc_id, _, _ in specs}
         )
-        
-        raw_json_response = response.choices[0].message.content
-        # 💡 JSON 파싱
-        parsed_data = json.loads(raw_json_response)
 
-        # 30자로 제한 및 불필요한 문자 정리
-        dialogue = parsed_data.get('dialogue', '정보 없음').strip().replace('"', '').replace("'", '')
-        if len(dialogue) > 30:
-            dialogue = dialogue[:30].strip() + "..."
-            
-        # 💡 influence 값을 info_type으로 추출
-        info_type = parsed_data.get('influence', 'NONE').upper()
-        
-        return {
-            "dialogue": dialogue,
-            "info_type": info_type
-        }
-    
+    started = time.perf_counter()
+    failures = []
+    try:
+        results = call_with_resilience(
+            request_batch, openai_retry_policy, openai_breaker,
+            on_retry=lambda attempt, error: failures.append(error)
+        )
+        outcome = "ok"
     except Exception as e:
-        print(f"⚠️ OpenAI API 호출 또는 JSON 파싱 중 오류 발생: {e}")
-        # 오류 발생 시 기본값 반환
-        return {
-            "dialogue": f"요즘 흉년이라 그런가... 말이 잘 안 나오네. ({role})",
-            "info_type": "NONE"
-        }
+        print(f"⚠️ NPC 대사 일괄 생성 중 오류 발생: {e}")
+        results = {}
+        outcome = "fallback"
+
+    attempts = len(failures) + (1 if outcome == "ok" else 0)
+    dialogue_metrics.record_call(
+        "batch", time.perf_counter() - started,
+        npc_count=len(specs),
+        retries=max(0, attempts - 1),
+        prompt_tokens=usage.get("prompt_tokens"),
+        completion_tokens=usage.get("completion_tokens"),
+        # 💡 응답 전체를 파싱하지 못한 시도 + 검증에 실패한 항목 수
+        parse_failures=sum(1 for error in failures if isinstance(error, ValueError))
+                       + (len(specs) - len(results) if outcome == "ok" else 0),
+        outcome=outcome
+    )
+    return results
+
+def generate_npc_dialogues_batch(positions, npc_ids=None, max_rounds=NPC_BATCH_MAX_ROUNDS, fallback=None,
+                                 seed=None):
+    """
+    여러 NPC 대사를 한 번의 API 호출로 생성하여 {npc_id: {dialogue, info_type}} 반환.
+
+    - 캐시에 있는 NPC는 요청에서 제외하고, 새로 생성한 대사는 개별 생성과 같은 키로 캐시에 저장한다.
+    - 검증에 실패한 항목만 다시 일괄 요청하며 (최대 max_rounds회),
+      그래도 남은 NPC는 generate_npc_dialogue_openai로 하나씩 생성한다.
+    """
+    if npc_ids is None:
+        npc_ids = range(len(positions))
+
+    dialogue_cache = get_dialogue_cache()
+    results = {}
+    specs = {}
+    cache_keys = {}
+    for npc_id in npc_ids:
+        pos = positions[npc_id]
+        location_hint, role = describe_npc_position(pos, position_rng(seed, pos))
+        if dialogue_cache is not None:
+            started = time.perf_counter()
+            cache_keys[npc_id] = make_dialogue_cache_key(format_npc_prompt(location_hint, role))
+            cached = dialogue_cache.get(cache_keys[npc_id])
+            if cached is not None:
+                dialogue_metrics.record_call("batch", time.perf_counter() - started, cache="hit")
+                results[npc_id] = cached
+                continue
+        specs[npc_id] = (npc_id, location_hint, role)
+
+    # 💡 일괄 요청은 한 건에 여러 NPC를 담으므로 API로 보낼 NPC마다 캐시 미적중을 한 번씩 셈
+    if dialogue_cache is not None and specs:
+        dialogue_metrics.record_cache_misses(len(specs))
+
+    for _ in range(max_rounds):
+        if not specs or openai_breaker.is_open:
+            break
+        batch_results = request_npc_dialogue_batch(list(specs.values()))
+        for npc_id, npc_data in batch_results.items():
+            results[npc_id] = npc_data
+            del specs[npc_id]
+            if npc_id in cache_keys:
+                dialogue_cache.put(cache_keys[npc_id], npc_data)
+
+    # 💡 일괄 요청으로도 채우지 못한 NPC는 개별 요청으로 보충 (캐시 미적중은 위에서 이미 셈)
+    for npc_id in specs:
+        results[npc_id] = generate_npc_dialogue_openai(positions[npc_id], fallback, seed, check_cache=False)
+    return results
+
+# ============================================
+# 대사 제공자 선택
+# ============================================
+class OpenAIDialogueProvider(DialogueProvider):
+    """
+    OpenAI API 백엔드 (디스크 캐시 사용).
+    API 호출이 계속 실패해 서킷 브레이커가 열리면 fallback 제공자로 대사를 만든다.
+    """
+    name = "openai"
+
+    def __init__(self, fallback=None, seed=None):
+        self.fallback = fallback
+        self.seed = seed
+
+    def generate(self, pos):
+        return generate_npc_dialogue_openai(pos, self.fallback, self.seed)
+
+    def generate_batch(self, positions, npc_ids):
+        return generate_npc_dialogues_batch(positions, npc_ids, fallback=self.fallback, seed=self.seed)
+
+def create_dialogue_provider(name=NPC_DIALOGUE_PROVIDER, seed=NPC_DIALOGUE_SEED):
+    """
+    설정 이름으로 대사 제공자 생성.
+    - "openai": OpenAI API 사용
+    - "local": 네트워크 없이 템플릿으로 생성 (seed로 재현 가능)
+    - "auto": OpenAI 클라이언트를 만들 수 있으면 "openai", 아니면 "local"
+    """
+    if name == "local":
+        return LocalDialogueProvider(seed)
+    fallback = LocalDialogueProvider(seed) if NPC_FALLBACK_TO_LOCAL else None
+    if name == "openai":
+        return OpenAIDialogueProvider(fallback, seed)
+    if name == "auto":
+        if get_openai_client() == "error":
+            print("ℹ️ OpenAI를 사용할 수 없어 로컬 대사 생성기를 사용합니다.")
+            return LocalDialogueProvider(seed)
+        return OpenAIDialogueProvider(fallback, seed)
+    raise ValueError(f"알 수 없는 대사 제공자: {name}")
 
 # ============================================
 # 모든 NPC 대사 생성 (수정된 반환값 사용)
 # ============================================
-def generate_all_npc_data():
-    """모든 NPC 위치에 대해 대사를 생성하고 리스트로 반환"""
-    print("📢 21개 NPC 대사 생성 시작...")
-    
+def generate_all_npc_data(positions=NPC_POSITIONS, max_workers=NPC_DIALOGUE_MAX_WORKERS, batch=False,
+                          provider=None):
+    """
+    모든 NPC 위치에 대해 대사를 생성하고 리스트로 반환.
+    provider를 지정하지 않으면 create_dialogue_provider()의 기본 제공자를 사용한다.
+
+    batch=True이면 한 번의 API 호출로 모든 대사를 생성하고,
+    max_workers가 2 이상이면 스레드 풀로 API 요청을 동시에 보내고,
+    1 이하이면 기존처럼 한 명씩 순차적으로 생성한다.
+    어느 경우든 결과 리스트는 NPC id 순서를 유지한다.
+    """
+    print(f"📢 {len(positions)}개 NPC 대사 생성 시작...")
+    if provider is None:
+        provider = create_dialogue_provider()
+
+    if batch:
+        batch_results = provider.generate_batch(positions, range(len(positions)))
+        npc_results = [batch_results[i] for i in range(len(positions))]
+    elif max_workers and max_workers > 1:
+        # 💡 동시 요청 수는 max_workers로 제한 (executor.map은 입력 순서대로 결과 반환)
+        configure_hedge_pool(2 * max_workers)
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(positions))) as executor:
+            npc_results = list(executor.map(provider.generate, positions))
+    else:
+        npc_results = [provider.generate(pos) for pos in positions]
+
     dialogues = []
-    for i, pos in enumerate(NPC_POSITIONS):
-        # 💡 generate_npc_dialogue_openai에서 딕셔너리 반환
-        npc_data = generate_npc_dialogue_openai(pos)
-        
+    for i, (pos, npc_data) in enumerate(zip(positions, npc_results)):
+        # 💡 제공자의 generate에서 딕셔너리 반환
         dialogues.append({
             "id": i,
             "position": pos,
@@ -125,35 +552,225 @@ def generate_all_npc_data():
             "info_type": npc_data["info_type"] # 💡 가격 영향력 정보 추가
         })
         
-    print("✅ NPC 대사 생성 완료.")
+    dialogue_cache = get_dialogue_cache() if provider.name == "openai" else None
+    if dialogue_cache is not None:
+        stats = dialogue_cache.stats()
+        print(f"✅ NPC 대사 생성 완료. (캐시 적중 {stats['hits']} / 미적중 {stats['misses']})")
+    else:
+        print("✅ NPC 대사 생성 완료.")
     return dialogues
 
-# 이 스크립트가 로드될 때 모든 NPC 대사가 생성됩니다.
-NPC_DIALOGUE_DATA = generate_all_npc_data()
+# ============================================
+# NPC 대사 제공자 (백그라운드 생성)
+# ============================================
+# 대사가 아직 생성되지 않은 NPC에 표시할 임시 대사
+PENDING_DIALOGUE = "(소문을 정리하는 중...)"
+
+def npc_ids_near(positions, points, radius):
+    """points 중 하나로부터 radius 이내에 있는 NPC id 리스트"""
+    radius_sq = radius * radius
+    return [
+        i for i, (x, y) in enumerate(positions)
+        if any((x - px) ** 2 + (y - py) ** 2 <= radius_sq for px, py in points)
+    ]
+
+class DialogueManager:
+    """
+    NPC 대사 데이터를 백그라운드 스레드 풀에서 생성하는 제공자.
+    생성자는 아무 작업도 하지 않으며, start()를 호출해야 대사 생성이 시작된다.
+    메인 루프는 poll()로 새로 준비된 대사를 받아 화면을 멈추지 않고 갱신한다.
+
+    lazy=True이면 start()는 priority_ids만 요청하고, 나머지는 request()로
+    플레이어가 가까이 다가간 NPC만 그때그때 요청한다.
+    batch=True이면 request()로 받은 NPC들을 한 번의 API 호출로 일괄 생성한다.
+    provider를 지정하지 않으면 start() 시점에 create_dialogue_provider()로 정한다.
+    """
+    def __init__(self, positions=NPC_POSITIONS, max_workers=NPC_DIALOGUE_MAX_WORKERS, on_ready=None,
+                 lazy=False, batch=False, provider=None):
+        self.positions = list(positions)
+        self.max_workers = max(1, max_workers or 1)
+        self.on_ready = on_ready  # 대사 하나가 준비될 때마다 워커 스레드에서 호출 (npc_id 인자)
+        self.lazy = lazy
+        self.batch = batch  # True이면 request() 한 번에 API 호출 한 번 (일괄 생성)
+        self.provider = provider
+
+        self._entries = [None] * len(self.positions)
+        self._requested = set()
+        self._ready_count = 0
+        self._lock = threading.Lock()
+        self._ready_condition = threading.Condition(self._lock)
+        self._ready_queue = queue.Queue()
+        self._executor = None
+
+    def start(self, priority_ids=()):
+        """백그라운드 대사 생성 시작 (즉시 반환). priority_ids의 NPC부터 요청한다."""
+        if self._executor is not None:
+            return
+
+        if self.provider is None:
+            self.provider = create_dialogue_provider()
+        configure_hedge_pool(2 * self.max_workers)
+        self._executor = ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(self.positions)) or 1,
+            thread_name_prefix="npc-dialogue"
+        )
+
+        if self.lazy:
+            print(f"📢 NPC 대사 지연 생성 모드 (전체 {len(self.positions)}명)")
+            self.request(priority_ids)
+            return
+
+        print(f"📢 {len(self.positions)}개 NPC 대사 생성 시작...")
+        priority = [i for i in priority_ids if 0 <= i < len(self.positions)]
+        if self.batch:
+            # 💡 일괄 모드에서는 한 번의 호출로 모두 생성하므로 우선순위를 나눌 필요가 없음
+            self.request(range(len(self.positions)))
+            return
+        # 💡 ThreadPoolExecutor는 제출 순서대로 작업을 꺼내므로 우선순위 NPC가 먼저 생성됨
+        self.request(priority + [i for i in range(len(self.positions)) if i not in set(priority)])
+
+    def request(self, npc_ids):
+        """아직 요청하지 않은 NPC의 대사 생성을 비동기로 요청 (즉시 반환)"""
+        if self._executor is None:
+            return
+        new_ids = []
+        for npc_id in npc_ids:
+            if npc_id in self._requested or not 0 <= npc_id < len(self.positions):
+                continue
+            self._requested.add(npc_id)
+            new_ids.append(npc_id)
+
+        if self.batch and new_ids:
+            self._executor.submit(self._generate_batch, new_ids)
+        else:
+            for npc_id in new_ids:
+                self._executor.submit(self._generate, npc_id)
+
+    @property
+    def requested_count(self):
+        return len(self._requested)
+
+    def _generate(self, npc_id):
+        try:
+            npc_data = self.provider.generate(self.positions[npc_id])
+        except Exception as e:
+            # 💡 예외로 대사가 비어 있으면 로딩이 끝나지 않으므로 기본값으로 채움
+            print(f"⚠️ NPC {npc_id} 대사 생성 중 오류 발생: {e}")
+            npc_data = None
+        self._store(npc_id, npc_data)
+
+    def _generate_batch(self, npc_ids):
+        try:
+            batch_results = self.provider.generate_batch(self.positions, npc_ids)
+        except Exception as e:
+            print(f"⚠️ NPC 대사 일괄 생성 중 오류 발생: {e}")
+            batch_results = {}
+        for npc_id in npc_ids:
+            self._store(npc_id, batch_results.get(npc_id))
+
+    def _store(self, npc_id, npc_data):
+        if npc_data is None:
+            npc_data = {"dialogue": "요즘 흉년이라 그런가... 말이 잘 안 나오네.", "info_type": "NONE"}
+        entry = {
+            "id": npc_id,
+            "position": self.positions[npc_id],
+            "dialogue": npc_data["dialogue"],
+            "info_type": npc_data["info_type"]
+        }
+
+        with self._lock:
+            self._entries[npc_id] = entry
+            self._ready_count += 1
+            self._ready_condition.notify_all()
+            all_done = self._ready_count == len(self.positions)
+        self._ready_queue.put(npc_id)
+
+        if all_done:
+            print("✅ NPC 대사 생성 완료.")
+        if self.on_ready is not None:
+            self.on_ready(npc_id)
+
+    @property
+    def ready_count(self):
+        return self._ready_count
+
+    def __len__(self):
+        return len(self.positions)
+
+    def is_ready(self, npc_ids=None):
+        """지정한 NPC(기본값: 전체)의 대사가 모두 준비되었는지 여부"""
+        if npc_ids is None:
+            return self._ready_count == len(self.positions)
+        return all(self._entries[i] is not None for i in npc_ids)
+
+    def wait(self, npc_ids=None, timeout=None):
+        """지정한 NPC 대사가 준비될 때까지 대기. 시간 안에 준비되면 True"""
+        with self._ready_condition:
+            return self._ready_condition.wait_for(lambda: self.is_ready(npc_ids), timeout)
+
+    def get(self, npc_id):
+        """준비된 대사 딕셔너리, 아직이면 None"""
+        return self._entries[npc_id]
+
+    def poll(self):
+        """마지막 poll 이후 새로 준비된 (npc_id, entry) 리스트 (메인 스레드용)"""
+        ready = []
+        while True:
+            try:
+                npc_id = self._ready_queue.get_nowait()
+            except queue.Empty:
+                return ready
+            ready.append((npc_id, self._entries[npc_id]))
+
+    @property
+    def data(self):
+        """
+        NPC_DIALOGUE_DATA 형식의 {id, position, dialogue, info_type} 리스트.
+        아직 생성되지 않은 NPC(지연 모드에서 아무도 다가가지 않은 NPC 포함)는
+        info_type 'NONE'으로 채운다 (가격 영향 없음).
+        """
+        return [
+            entry if entry is not None else {
+                "id": i,
+                "position": pos,
+                "dialogue": PENDING_DIALOGUE,
+                "info_type": "NONE"
+            }
+            for i, (pos, entry) in enumerate(zip(self.positions, self._entries))
+        ]
+
+    def shutdown(self):
+        """대기 중인 요청을 취소 (진행 중인 요청은 기다리지 않음)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
 
 # ============================================
 # NPC 클래스
 # ============================================
-class NPC(pygame.sprite.Sprite):
+def build_npc_image(step_size):
+    """NPC 원 이미지 (모든 NPC가 공유)"""
+    radius = step_size // 2
+    size = step_size
+    image = pygame.Surface([size, size], pygame.SRCALPHA)
+    
+    # 색상 정의 (main.py의 색상 사용)
+    RED = (200, 50, 50)
+    GOLD = (218, 165, 32) 
+    color = RED
+    
+    pygame.draw.circle(image, color, (radius, radius), radius)
+    pygame.draw.circle(image, GOLD, (radius, radius), radius, 2)
+    
+    image.set_alpha(150)
+    return image
+
+class NPC(NPCState, pygame.sprite.Sprite):
+    """화면에 그리는 NPC (위치/대사 상태는 NPCState, 여기서는 공유 이미지만 더함)"""
     def __init__(self, pos, info_message, info_type, step_size=50): 
-        super().__init__()
-        
-        radius = step_size // 2
-        size = step_size
-        self.image = pygame.Surface([size, size], pygame.SRCALPHA)
-        
-        # 색상 정의 (main.py의 색상 사용)
-        RED = (200, 50, 50)
-        GOLD = (218, 165, 32) 
-        color = RED
-        
-        pygame.draw.circle(self.image, color, (radius, radius), radius)
-        pygame.draw.circle(self.image, GOLD, (radius, radius), radius, 2)
-        
-        self.image.set_alpha(150)
+        pygame.sprite.Sprite.__init__(self)
+        NPCState.__init__(self, pos, info_message, info_type, size=step_size)
         
+        # 💡 NPC마다 surface를 새로 그리지 않고 같은 크기의 NPC는 하나를 공유
+        self.image = assets.shape(("npc", step_size), lambda: build_npc_image(step_size))
         self.rect = self.image.get_rect()
         self.rect.topleft = pos
-        self.info = info_message
-        self.info_type = info_type # 💡 info_type을 인스턴스 변수로 저장
-        self.met = False
\ No newline at end of file
@@ -1,39 +1,22 @@
 """플레이어 클래스"""
 import pygame
 
-class Player(pygame.sprite.Sprite):
+from core.assets import assets
+from core.engine import PlayerState
+
+class Player(PlayerState, pygame.sprite.Sprite):
+    """화면에 그리는 상인 (게임 상태는 PlayerState, 여기서는 이미지만 더함)"""
     def __init__(self, image_path, start_pos, name, initial_money=2000, player_size=50):
-        super().__init__()
-        self.player_size = player_size
+        pygame.sprite.Sprite.__init__(self)
+        PlayerState.__init__(self, name, start_pos, initial_money, player_size)
         
-        try:
-            self.image_original = pygame.image.load(image_path).convert_alpha()
-        except pygame.error:
-            print(f"이미지 로드 오류: {image_path}. 기본 표면 사용.")
-            self.image_original = pygame.Surface([player_size, player_size])
-            self.image_original.fill((50, 50, 200))  # BLUE
-
-        self.image = pygame.transform.scale(self.image_original, (player_size, player_size))
-        self.rect = self.image.get_rect()
-        self.rect.topleft = start_pos
-        self.name = name
-        self.money = initial_money
-        self.rice_amount = 0
-        self.collected_info = []
-        self.npcs_met = 0
-        self.trade_done = False
-        self.can_bet = False
-        self.profit = 0
+        # 💡 같은 이미지 파일은 한 번만 읽고, 크기를 조정한 결과도 공유 (읽을 수 없으면 파란 사각형)
+        self.image_original = assets.image(image_path, fallback_color=(50, 50, 200))  # BLUE
+        self.image = assets.image(image_path, (player_size, player_size), fallback_color=(50, 50, 200))
+        self._rect = self.image.get_rect()
 
-        self.bet_price = 0
-        self.bet_quantity = 0
-        self.bet_type = "매수"
-
-    def move(self, dx, dy, game_area_width, screen_height):
-        """플레이어 이동 (경계 체크 포함)"""
-        new_x = self.rect.x + dx
-        new_y = self.rect.y + dy
-        
-        if 0 <= new_x <= game_area_width - self.player_size and 0 <= new_y <= screen_height - self.player_size:
-            self.rect.x = new_x
-            self.rect.y = new_y
\ No newline at end of file
+    @property
+    def rect(self):
+        """현재 위치의 pygame.Rect (PlayerState의 x, y에서 계산)"""
+        self._rect.topleft = (self.x, self.y)
+        return self._rect
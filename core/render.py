@@ -0,0 +1,185 @@
+"""화면 갱신 도우미 (변경 영역 추적, 가상 해상도 표시, 마우스 좌표 변환)"""
+import math
+from fractions import Fraction
+
+import pygame
+
+class DirtyRectTracker:
+    """
+    다시 그려야 할 화면 영역을 모아 두는 추적기.
+    pop()은 겹치는 영역을 합친 사각형 리스트를 반환하고 목록을 비운다.
+    """
+    def __init__(self, screen_rect):
+        self.screen_rect = pygame.Rect(screen_rect)
+        self._rects = []
+        self._full = True  # 첫 프레임은 전체를 그림
+
+    def mark(self, *rects, margin=2):
+        """영역 추가 (테두리/안티앨리어싱을 덮도록 margin만큼 넓힘)"""
+        for rect in rects:
+            if rect is None:
+                continue
+            rect = pygame.Rect(rect).inflate(margin * 2, margin * 2).clip(self.screen_rect)
+            if rect.width and rect.height:
+                self._rects.append(rect)
+
+    def mark_all(self):
+        self._full = True
+
+    @property
+    def has_dirty(self):
+        return self._full or bool(self._rects)
+
+    def pop(self):
+        if self._full:
+            rects = [self.screen_rect.copy()]
+        else:
+            rects = merge_rects(self._rects)
+        self._rects = []
+        self._full = False
+        return rects
+
+def merge_rects(rects):
+    """겹치거나 맞닿은 사각형을 합쳐 서로 겹치지 않는 목록으로 만듦"""
+    merged = []
+    for rect in rects:
+        rect = rect.copy()
+        # 💡 합친 사각형이 다른 사각형과 새로 겹칠 수 있으므로 더 이상 합칠 것이 없을 때까지 반복
+        index = rect.inflate(2, 2).collidelist(merged)
+        while index != -1:
+            rect.union_ip(merged.pop(index))
+            index = rect.inflate(2, 2).collidelist(merged)
+        merged.append(rect)
+    return merged
+
+# ============================================
+# 화면 표시 (가상 해상도 -> 창)
+# ============================================
+MOUSE_EVENT_TYPES = (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP)
+
+class DirectPresenter:
+    """
+    그린 surface가 곧 창 surface인 경우 (SDL2 SCALED 모드).
+    확대/축소와 마우스 좌표 변환은 SDL이 처리하므로 좌표를 그대로 사용한다.
+    """
+    def __init__(self, display):
+        self.display = display
+        self.window = None
+
+    def to_virtual(self, pos):
+        return pos
+
+    def mouse_pos(self):
+        return pygame.mouse.get_pos()
+
+    def map_event(self, event):
+        return event
+
+    def present(self, surface, rects=None):
+        if rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
+
+class ScaledPresenter:
+    """
+    가상 해상도(virtual_size)로 그린 화면을 실제 창 크기로 소프트웨어 축소해 표시.
+    present(rects)는 지정한 영역만 축소/전송하며, 축소 비율의 격자에 맞춰 영역을 넓혀
+    부분 갱신과 전체 갱신의 결과가 같도록 한다.
+    마우스 이벤트는 실제 창 좌표로 들어오므로 map_event()로 가상 좌표로 바꿔 사용해야 한다.
+    """
+    def __init__(self, display, virtual_size):
+        self.display = display
+        self.virtual_rect = pygame.Rect((0, 0), virtual_size)
+        actual_w, actual_h = display.get_size()
+        self.scale_x = Fraction(actual_w, virtual_size[0])
+        self.scale_y = Fraction(actual_h, virtual_size[1])
+        # 💡 이 간격의 배수인 가상 좌표는 실제 좌표에서도 정수가 됨
+        self.grid_x = self.scale_x.denominator
+        self.grid_y = self.scale_y.denominator
+
+    def _align(self, rect):
+        left = rect.left // self.grid_x * self.grid_x
+        top = rect.top // self.grid_y * self.grid_y
+        right = math.ceil(rect.right / self.grid_x) * self.grid_x
+        bottom = math.ceil(rect.bottom / self.grid_y) * self.grid_y
+        return pygame.Rect(left, top, right - left, bottom - top).clip(self.virtual_rect)
+
+    def to_actual(self, rect):
+        """가상 좌표 사각형을 실제 창 좌표로 변환"""
+        return pygame.Rect(
+            int(rect.x * self.scale_x), int(rect.y * self.scale_y),
+            int(rect.width * self.scale_x), int(rect.height * self.scale_y)
+        )
+
+    def to_virtual(self, pos):
+        """실제 창 좌표를 가상 좌표로 변환"""
+        x = min(int(pos[0] / self.scale_x), self.virtual_rect.width - 1)
+        y = min(int(pos[1] / self.scale_y), self.virtual_rect.height - 1)
+        return (x, y)
+
+    def mouse_pos(self):
+        """현재 마우스 위치 (가상 좌표)"""
+        return self.to_virtual(pygame.mouse.get_pos())
+
+    def map_event(self, event):
+        """마우스 이벤트의 pos를 가상 좌표로 바꾼 이벤트 반환 (그 외 이벤트는 그대로)"""
+        if event.type not in MOUSE_EVENT_TYPES:
+            return event
+        attributes = dict(event.dict)
+        attributes['pos'] = self.to_virtual(event.pos)
+        return pygame.event.Event(event.type, attributes)
+
+    def present(self, surface, rects=None):
+        """surface(가상 해상도)를 창에 표시. rects가 없으면 전체 갱신"""
+        if rects is None:
+            rects = [self.virtual_rect]
+
+        updated = []
+        for rect in rects:
+            rect = self._align(pygame.Rect(rect))
+            if not rect.width or not rect.height:
+                continue
+            actual = self.to_actual(rect)
+            scaled = pygame.transform.scale(surface.subsurface(rect), actual.size)
+            self.display.blit(scaled, actual.topleft)
+            updated.append(actual)
+        pygame.display.update(updated)
+
+def _resize_window(window_size):
+    """
+    SCALED 모드 창 크기를 window_size로 변경 (가상 해상도는 유지).
+    반환한 Window 객체는 창이 열려 있는 동안 참조를 유지해야 한다
+    (pygame 2.x에서는 이 객체가 해제될 때 창도 함께 파괴됨). 실패하면 None
+    """
+    try:
+        from pygame._sdl2.video import Window
+        window = Window.from_display_module()
+        window.size = window_size
+        return window
+    except (ImportError, AttributeError, pygame.error) as e:
+        print(f"창 크기 변경 실패: {e}. 기본 크기 사용.")
+        return None
+
+def create_display(virtual_size, window_size, mode="sdl_scaled"):
+    """
+    게임 창을 만들고 (그리기 surface, presenter) 반환.
+
+    - "sdl_scaled": SDL2 SCALED 모드로 가상 해상도 창을 만들어 창 surface에 바로 그린다.
+      창 크기로의 확대/축소는 SDL 렌더러(GPU)가 하고, 마우스 좌표도 가상 좌표로 들어온다.
+    - "software": 가상 해상도 Surface에 그린 뒤 변경 영역만 소프트웨어로 축소해 표시
+      (SCALED 모드를 쓸 수 없는 환경용). 실패 시 자동으로 이 방식을 사용한다.
+    """
+    if mode == "sdl_scaled":
+        try:
+            display = pygame.display.set_mode(virtual_size, pygame.SCALED)
+        except pygame.error as e:
+            print(f"SCALED 모드 사용 불가: {e}. 소프트웨어 축소 사용.")
+        else:
+            presenter = DirectPresenter(display)
+            if tuple(window_size) != tuple(virtual_size):
+                presenter.window = _resize_window(window_size)
+            return display, presenter
+
+    display = pygame.display.set_mode(window_size)
+    return pygame.Surface(virtual_size), ScaledPresenter(display, virtual_size)
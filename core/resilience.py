@@ -0,0 +1,244 @@
+"""API 호출 안정화 도구 (재시도, 서킷 브레이커, 지연 시간 추적, 헤지 요청)"""
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+class CircuitOpenError(Exception):
+    """서킷 브레이커가 열려 있어 호출을 보내지 않음"""
+
+class RequestCancelled(Exception):
+    """헤지 요청 중 다른 요청이 먼저 끝나 중단된 요청"""
+
+# 💡 openai/httpx를 import 하지 않고 클래스 이름으로 일시적인 네트워크 오류를 구분
+TRANSIENT_ERROR_NAMES = frozenset((
+    "APIConnectionError", "APITimeoutError", "TimeoutException", "TransportError"
+))
+
+def is_retryable_error(error):
+    """
+    다시 시도하면 성공할 수 있는 오류인지 (RetryPolicy 기본 판단).
+    시간 초과, 연결 오류, HTTP 429/5xx, 응답 파싱/검증 실패(ValueError)는 재시도하고
+    인증 오류, 그 밖의 4xx, 코드 오류(TypeError 등)는 바로 올린다.
+    """
+    status_code = getattr(error, "status_code", None)
+    if isinstance(status_code, int):
+        return status_code == 429 or status_code >= 500
+    if isinstance(error, (TimeoutError, ConnectionError, ValueError)):
+        return True
+    return any(cls.__name__ in TRANSIENT_ERROR_NAMES for cls in type(error).__mro__)
+
+class RetryPolicy:
+    """지수 백오프 재시도 정책 (지터 포함). retryable(error)가 False인 오류는 재시도하지 않는다."""
+    def __init__(self, max_attempts=3, base_delay=0.5, max_delay=4.0, retryable=is_retryable_error):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retryable = retryable
+
+    def delay(self, attempt):
+        """attempt번째(0부터) 실패 후 기다릴 시간 (초)"""
+        backoff = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return backoff * random.uniform(0.5, 1.0)
+
+class CircuitBreaker:
+    """
+    연속 실패가 failure_threshold회에 이르면 열림(open) 상태가 되어 호출을 막고,
+    reset_seconds가 지나면 한 번의 시험 호출을 허용한다 (half-open).
+    """
+    def __init__(self, failure_threshold=5, reset_seconds=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self):
+        return self._opened_at is not None
+
+    def allow(self):
+        """지금 호출을 보내도 되는지 여부"""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at >= self.reset_seconds and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def release(self):
+        """실패로 세지 않는 오류(요청 자체의 문제)로 끝난 호출: 시험 호출 자리만 반납"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    print(f"⚠️ 연속 {self._failures}회 실패: 서킷 브레이커 열림 ({self.reset_seconds:.0f}초)")
+                self._opened_at = time.monotonic()
+
+class LatencyTracker:
+    """최근 성공 호출의 지연 시간(초)을 보관하고 백분위수를 계산"""
+    def __init__(self, window=200):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self):
+        return len(self._samples)
+
+    def percentile(self, p):
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        index = min(len(samples) - 1, int(round(p / 100 * (len(samples) - 1))))
+        return samples[index]
+
+# 헤지(중복) 요청용 스레드 풀 (처음 필요할 때 생성)
+_hedge_executor = None
+_hedge_workers = 32
+_hedge_in_flight = 0  # 풀에 제출되어 아직 끝나지 않은 요청 수 (대기 중 포함)
+_hedge_lock = threading.Lock()
+
+def configure_hedge_pool(max_workers):
+    """
+    헤지 풀 스레드 수를 max_workers 이상으로 맞춤 (이미 크면 그대로).
+    동시에 호출하는 쪽이 N개면 주 요청 + 헤지 요청이 2N개까지 필요하므로 2N으로 설정한다.
+    """
+    global _hedge_executor, _hedge_workers
+    with _hedge_lock:
+        if max_workers <= _hedge_workers:
+            return
+        _hedge_workers = max_workers
+        old_executor, _hedge_executor = _hedge_executor, None
+    if old_executor is not None:
+        old_executor.shutdown(wait=False)  # 실행 중인 요청은 마저 끝남
+
+def _get_hedge_executor():
+    global _hedge_executor
+    with _hedge_lock:
+        if _hedge_executor is None:
+            _hedge_executor = ThreadPoolExecutor(max_workers=_hedge_workers, thread_name_prefix="api-hedge")
+        return _hedge_executor
+
+def _hedge_task_done(future):
+    global _hedge_in_flight
+    with _hedge_lock:
+        _hedge_in_flight -= 1
+
+def _submit_to_hedge_pool(*args):
+    global _hedge_in_flight
+    executor = _get_hedge_executor()
+    with _hedge_lock:
+        _hedge_in_flight += 1
+    future = executor.submit(*args)
+    future.add_done_callback(_hedge_task_done)
+    return future
+
+def _hedge_pool_has_idle_worker():
+    with _hedge_lock:
+        return _hedge_in_flight < _hedge_workers
+
+def _call_hedged(fn, hedge_delay, cancellable=False):
+    """
+    fn을 실행하고 hedge_delay초 안에 끝나지 않으면 같은 요청을 하나 더 보내
+    먼저 성공한 결과를 반환한다. 둘 다 실패하면 마지막 예외를 올린다.
+    cancellable이면 요청마다 취소 이벤트를 만들어 fn(cancel)로 호출하고,
+    결과가 나오면 남은 요청의 이벤트를 설정해 중단시킨다.
+    풀에 쉬는 스레드가 없으면 헤지 요청은 주 요청 뒤에 줄을 설 뿐이므로 보내지 않는다.
+    """
+    cancel_events = {}
+
+    def submit():
+        if not cancellable:
+            return _submit_to_hedge_pool(fn)
+        cancel = threading.Event()
+        future = _submit_to_hedge_pool(fn, cancel)
+        cancel_events[future] = cancel
+        return future
+
+    pending = {submit()}
+    try:
+        done, pending = wait(pending, timeout=hedge_delay)
+        if not done and _hedge_pool_has_idle_worker():
+            pending.add(submit())
+
+        last_error = None
+        while done or pending:
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                last_error = future.exception()
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        raise last_error
+    finally:
+        # 💡 늦은 요청(스트림)이 계속 토큰을 생성/과금하거나 풀 스레드를 붙잡지 않도록 중단
+        for future in pending:
+            future.cancel()  # 아직 시작하지 않았으면 실행하지 않음
+            if future in cancel_events:
+                cancel_events[future].set()
+
+def call_with_resilience(fn, retry_policy, breaker=None, latency=None, hedge_delay=None, on_retry=None,
+                         cancellable=False):
+    """
+    fn()을 재시도 정책에 따라 호출하고 결과를 반환.
+
+    - breaker가 열려 있으면 호출하지 않고 CircuitOpenError를 올린다.
+    - 성공한 호출의 지연 시간을 latency에 기록한다.
+    - hedge_delay(초)가 주어지면 그 시간을 넘긴 호출에 대해 중복 요청을 보낸다.
+    - cancellable이면 fn(cancel)로 호출한다. cancel은 헤지 요청에서 다른 요청이 먼저 끝나면 설정되는
+      threading.Event이며 (헤지하지 않으면 None), fn은 이를 확인해 RequestCancelled로 일찍 끝내야 한다.
+    - 시도가 실패할 때마다 on_retry(attempt, error)를 호출한다 (계측용).
+    - retry_policy.retryable(error)가 False인 오류는 기다리지 않고 바로 올린다
+      (서킷 브레이커 실패와 on_retry에도 세지 않음).
+    - 모든 시도가 실패하면 마지막 예외를 올린다.
+    """
+    last_error = None
+    for attempt in range(retry_policy.max_attempts):
+        if breaker is not None and not breaker.allow():
+            raise CircuitOpenError("서킷 브레이커가 열려 있습니다.")
+
+        started = time.monotonic()
+        try:
+            if hedge_delay is not None:
+                result = _call_hedged(fn, hedge_delay, cancellable)
+            else:
+                result = fn(None) if cancellable else fn()
+        except Exception as e:
+            if not retry_policy.retryable(e):
+                if breaker is not None:
+                    breaker.release()
+                raise
+            last_error = e
+            if breaker is not None:
+                breaker.record_failure()
+            if on_retry is not None:
+                on_retry(attempt, e)
+            if attempt + 1 < retry_policy.max_attempts:
+                time.sleep(retry_policy.delay(attempt))
+            continue
+
+        if breaker is not None:
+            breaker.record_success()
+        if latency is not None:
+            latency.record(time.monotonic() - started)
+        return result
+    raise last_error
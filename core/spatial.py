@@ -0,0 +1,86 @@
+"""균일 격자 공간 해시 (충돌 및 반경 검색용 색인)"""
+import math
+
+class SpatialHash:
+    """
+    사각형 (x, y, w, h)을 cell_size 격자 칸에 나눠 담는 색인.
+    이동이 STEP_SIZE 단위이므로 cell_size를 STEP_SIZE로 두면 충돌 검사는 주변 몇 칸만 확인한다.
+    항목(item)은 NPC id처럼 정렬 가능한 값이어야 한다.
+    query_radius 결과는 정렬해 반환하고, 이동마다 호출되는 query_rect 결과는 정렬하지 않는다.
+    """
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self._cells = {}  # (cx, cy) -> set(item)
+        self._rects = {}  # item -> (x, y, w, h)
+
+    def __len__(self):
+        return len(self._rects)
+
+    def __contains__(self, item):
+        return item in self._rects
+
+    def _cell_range(self, x, y, w, h):
+        """사각형이 걸치는 격자 칸 좌표"""
+        size = self.cell_size
+        x0, y0 = x // size, y // size
+        x1 = (x + w - 1) // size if w > 1 else x0
+        y1 = (y + h - 1) // size if h > 1 else y0
+        return [(cx, cy) for cx in range(x0, x1 + 1) for cy in range(y0, y1 + 1)]
+
+    def insert(self, item, rect):
+        if item in self._rects:
+            self.remove(item)
+        rect = tuple(rect)
+        self._rects[item] = rect
+        for cell in self._cell_range(*rect):
+            self._cells.setdefault(cell, set()).add(item)
+
+    def remove(self, item):
+        """항목 제거 (없으면 무시)"""
+        rect = self._rects.pop(item, None)
+        if rect is None:
+            return
+        for cell in self._cell_range(*rect):
+            bucket = self._cells.get(cell)
+            if bucket is not None:
+                bucket.discard(item)
+                if not bucket:
+                    del self._cells[cell]
+
+    def query_rect(self, rect):
+        """rect와 겹치는 항목 리스트, 순서 없음 (pygame.Rect.colliderect와 같이 변이 맞닿기만 한 경우는 제외)"""
+        x, y, w, h = rect
+        size = self.cell_size
+        cells = self._cells
+        rects = self._rects
+        # 💡 이동할 때마다 호출되는 경로라 칸 목록을 만들지 않고 칸 범위를 직접 순회
+        x0, y0 = x // size, y // size
+        x1 = (x + w - 1) // size if w > 1 else x0
+        y1 = (y + h - 1) // size if h > 1 else y0
+        found = []
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if not bucket:
+                    continue
+                for item in bucket:
+                    ix, iy, iw, ih = rects[item]
+                    # 💡 한 번에 겹치는 항목은 몇 개뿐이라 집합 대신 리스트로 중복만 거름
+                    if x < ix + iw and ix < x + w and y < iy + ih and iy < y + h and item not in found:
+                        found.append(item)
+        return found
+
+    def query_radius(self, point, radius):
+        """좌상단 좌표가 point에서 radius 이내인 항목"""
+        px, py = point
+        radius_sq = radius * radius
+        size = self.cell_size
+        found = []
+        # 💡 항목은 좌상단이 속한 칸에도 반드시 들어 있으므로 반경을 덮는 칸만 확인하면 됨
+        for cx in range(math.floor((px - radius) / size), math.floor((px + radius) / size) + 1):
+            for cy in range(math.floor((py - radius) / size), math.floor((py + radius) / size) + 1):
+                for item in self._cells.get((cx, cy), ()):
+                    ix, iy = self._rects[item][:2]
+                    if ix // size == cx and iy // size == cy and (ix - px) ** 2 + (iy - py) ** 2 <= radius_sq:
+                        found.append(item)
+        return sorted(found)
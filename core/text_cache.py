@@ -0,0 +1,51 @@
+"""렌더링된 텍스트 surface 캐시 (LRU)"""
+from collections import OrderedDict
+
+from config.game_data import TEXT_CACHE_MAX_ENTRIES
+
+class TextCache:
+    """
+    font.render() 결과를 (font, text, color, antialias)별로 보관하는 크기 제한 LRU 캐시.
+    같은 문자열은 한 번만 래스터화되며, 반환된 surface는 여러 곳에서 공유하므로 수정하면 안 된다.
+    """
+    def __init__(self, max_entries=TEXT_CACHE_MAX_ENTRIES):
+        self.max_entries = max(1, max_entries)
+        self.hits = 0
+        self.misses = 0
+        self._surfaces = OrderedDict()
+
+    def render(self, font, text, antialias, color):
+        """font.render(text, antialias, color)와 같은 결과를 캐시에서 반환"""
+        key = (font, text, tuple(color), antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def stats(self):
+        """적중/미적중 횟수와 현재 항목 수"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": len(self._surfaces)
+        }
+
+    def clear(self):
+        self._surfaces.clear()
+
+# 💡 게임 전체에서 공유하는 텍스트 캐시 (pygame 그리기는 메인 스레드에서만 하므로 잠금 없음)
+text_cache = TextCache()
+
+def render_text(font, text, antialias, color):
+    """공유 캐시를 거치는 font.render() 대체 함수"""
+    return text_cache.render(font, text, antialias, color)
@@ -1,6 +1,7 @@
 """UI 컴포넌트 및 렌더링 함수"""
 import pygame
 from core.function import wrap_text
+from core.text_cache import render_text
 
 class Button:
     def __init__(self, x, y, width, height, text, color, hover_color, action=None):
@@ -26,7 +27,7 @@ class Button:
         pygame.draw.rect(surface, current_color, display_rect, border_radius=5)
         pygame.draw.rect(surface, (0, 0, 0), display_rect, 2, border_radius=5)
 
-        text_surf = font.render(self.text, True, text_color)
+        text_surf = render_text(font, self.text, True, text_color)
         text_rect = text_surf.get_rect(center=display_rect.center)
         surface.blit(text_surf, text_rect)
 
@@ -56,7 +57,7 @@ def draw_info_panel(screen, player, game_area_width, screen_height, info_panel_w
 
     # 제목
     title_text = "획득 정보 (" + player.name + ")"
-    title = font.render(title_text, True, gold_color)
+    title = render_text(font, title_text, True, gold_color)
     screen.blit(title, (game_area_width + padding, 10))
 
     max_text_width = info_panel_width - 2 * padding
@@ -67,7 +68,7 @@ def draw_info_panel(screen, player, game_area_width, screen_height, info_panel_w
 
     for i, info in enumerate(player.collected_info):
         number_text = f"{i+1}. "
-        number_surf = info_font.render(number_text, True, white_color)
+        number_surf = render_text(info_font, number_text, True, white_color)
         screen.blit(number_surf, (game_area_width + padding, y_offset))
 
         info_content = info
@@ -76,7 +77,7 @@ def draw_info_panel(screen, player, game_area_width, screen_height, info_panel_w
 
         current_y = y_offset
         for line in wrapped_lines:
-            text_surf = info_font.render(line, True, white_color)
+            text_surf = render_text(info_font, line, True, white_color)
             x_start = game_area_width + padding + number_surf.get_width() if current_y == y_offset else game_area_width + padding + 15
             screen.blit(text_surf, (x_start, current_y))
             current_y += line_height
@@ -92,31 +93,92 @@ def draw_info_panel(screen, player, game_area_width, screen_height, info_panel_w
     y_offset = screen_height - 100
     status_font = font
     for s in status:
-        text = status_font.render(s, True, gold_color)
+        text = render_text(status_font, s, True, gold_color)
         screen.blit(text, (game_area_width + padding, y_offset))
         y_offset += status_font.get_height() + 5
 
-def draw_betting_ui(screen, player, input_price, input_quantity, active_input, 
-                    buy_btn, sell_btn, finish_btn, game_area_width, screen_height,
-                    font, padding, colors):
-    """베팅 UI 그리기"""
-    BLACK = colors['BLACK']
+class InfoPanelCache:
+    """
+    플레이어별로 그려 둔 정보 패널 surface 캐시.
+    패널 내용은 player.name, collected_info, npcs_met에만 의존하므로
+    player.info_version이 바뀐 경우에만 다시 그리고, 그 외에는 blit 한 번으로 끝난다.
+    """
+    def __init__(self, game_area_width, screen_height, info_panel_width, padding,
+                 font, tiny_font, gold_color, dark_wood_color, white_color):
+        self.position = (game_area_width, 0)
+        self.size = (info_panel_width, screen_height)
+        self.padding = padding
+        self.fonts = (font, tiny_font)
+        self.colors = (gold_color, dark_wood_color, white_color)
+        self._panels = {}  # player -> (캐시 키, surface)
+
+    def get(self, player):
+        """player의 패널 surface 반환 (내용이 바뀌었으면 다시 그림)"""
+        key = (player.name, player.info_version)
+        cached = self._panels.get(player)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        surface = pygame.Surface(self.size)
+        draw_info_panel(surface, player, 0, self.size[1], self.size[0], self.padding,
+                        *self.fonts, *self.colors)
+        self._panels[player] = (key, surface)
+        return surface
+
+    def draw(self, screen, player):
+        screen.blit(self.get(player), self.position)
+
+    def clear(self):
+        """저장된 패널 모두 삭제 (새 판을 시작해 상인 객체가 바뀔 때)"""
+        self._panels.clear()
+
+class ScreenLayerCache:
+    """
+    베팅/결과 화면의 정적 레이어(반투명 오버레이, 초상화, 안내판, 결과표 등) 보관소.
+    get(key, build)은 key별로 build()를 한 번만 호출하며, 화면(상태)에 진입할 때 clear()로 비운다.
+    """
+    def __init__(self):
+        self._layers = {}
+
+    def get(self, key, build):
+        layer = self._layers.get(key)
+        if layer is None:
+            layer = self._layers[key] = build()
+        return layer
+
+    def clear(self):
+        self._layers.clear()
+
+# 💡 게임 전체에서 공유하는 화면 레이어 캐시
+screen_layers = ScreenLayerCache()
+
+def build_overlay(width, height, alpha, color):
+    """화면을 어둡게 덮는 반투명 오버레이 surface 생성"""
+    overlay = pygame.Surface((width, height))
+    overlay.set_alpha(alpha)
+    overlay.fill(color)
+    return overlay
+
+def _betting_rows(y_start):
+    """베팅 화면 우측 패널 각 줄의 y 좌표 (제목, 매수/매도, 가격, 수량, 완료 버튼)"""
+    title_y = y_start
+    buttons_y = title_y + 50
+    price_y = buttons_y + 60
+    quantity_y = price_y + 60
+    finish_y = quantity_y + 80
+    return title_y, buttons_y, price_y, quantity_y, finish_y
+
+def build_betting_layer(player, game_area_width, screen_height, font, padding, colors):
+    """베팅 화면에서 바뀌지 않는 부분(안내판, 상인 초상화/이름, 제목, 입력 라벨)을 미리 그린 surface"""
     GOLD = colors['GOLD']
     DARK_WOOD = colors['DARK_WOOD']
     WHITE = colors['WHITE']
-    RED = colors['RED']
-    BLUE = colors['BLUE']
-    LIGHT_GRAY = colors['LIGHT_GRAY']
     TEXT_COLOR = colors['TEXT_COLOR']
-    
-    overlay = pygame.Surface((game_area_width, screen_height))
-    overlay.set_alpha(200)
-    overlay.fill(BLACK)
-    screen.blit(overlay, (0, 0))
 
-    center_x = game_area_width // 2
+    layer = pygame.Surface((game_area_width, screen_height), pygame.SRCALPHA)
     y_start = 50
-    
+    title_y, _, price_y, quantity_y, _ = _betting_rows(y_start)
+
     # 좌측 패널: 상인 이미지 및 정보
     IMAGE_SIZE = 200
     player_image_scaled = pygame.transform.scale(player.image_original, (IMAGE_SIZE, IMAGE_SIZE))
@@ -125,7 +187,7 @@ def draw_betting_ui(screen, player, input_price, input_quantity, active_input,
     LEFT_START_X = padding * 2
 
     # 과거 쌀 시장 가격 표시
-    past_price_text = font.render("과거 쌀 시장 가격: 100 냥", True, GOLD)
+    past_price_text = render_text(font, "과거 쌀 시장 가격: 100 냥", True, GOLD)
     
     padding_x = 25
     padding_y = 12
@@ -138,29 +200,62 @@ def draw_betting_ui(screen, player, input_price, input_quantity, active_input,
         past_price_x - padding_x, past_price_y - padding_y,
         text_w + 2 * padding_x, text_h + 2 * padding_y
     )
-    pygame.draw.rect(screen, DARK_WOOD, past_price_bg_rect, border_radius=5)
-    pygame.draw.rect(screen, GOLD, past_price_bg_rect, 3, border_radius=5)
-    screen.blit(past_price_text, (past_price_x, past_price_y))
+    pygame.draw.rect(layer, DARK_WOOD, past_price_bg_rect, border_radius=5)
+    pygame.draw.rect(layer, GOLD, past_price_bg_rect, 3, border_radius=5)
+    layer.blit(past_price_text, (past_price_x, past_price_y))
     
     # 상인 이미지 및 이름
     image_display_y = past_price_bg_rect.bottom + 50
     image_display_x = LEFT_START_X + LEFT_PANEL_WIDTH // 2 - IMAGE_SIZE // 2
 
-    screen.blit(player_image_scaled, (image_display_x, image_display_y))
+    layer.blit(player_image_scaled, (image_display_x, image_display_y))
 
-    name_surf = font.render(player.name, True, TEXT_COLOR)
+    name_surf = render_text(font, player.name, True, TEXT_COLOR)
     name_x = LEFT_START_X + LEFT_PANEL_WIDTH // 2 - name_surf.get_width() // 2
-    screen.blit(name_surf, (name_x, image_display_y + IMAGE_SIZE + 10))
+    layer.blit(name_surf, (name_x, image_display_y + IMAGE_SIZE + 10))
     
-    # 우측 패널: 베팅 입력
+    # 우측 패널: 제목 및 입력 라벨
     RIGHT_START_X = game_area_width // 2 + 50 
     RIGHT_PANEL_WIDTH = game_area_width - RIGHT_START_X - padding
     
-    y_current = y_start
-    title = font.render(f"[{player.name}] 쌀 거래 베팅", True, GOLD)
+    title = render_text(font, f"[{player.name}] 쌀 거래 베팅", True, GOLD)
     title_x = RIGHT_START_X + RIGHT_PANEL_WIDTH // 2 - title.get_width() // 2 
-    screen.blit(title, (title_x, y_current))
-    y_current += 50
+    layer.blit(title, (title_x, title_y))
+
+    price_text = render_text(font, "예측 가격:", True, WHITE)
+    layer.blit(price_text, (RIGHT_START_X - 20, price_y + 10))
+
+    quantity_text = render_text(font, "수량:", True, WHITE)
+    layer.blit(quantity_text, (RIGHT_START_X - 20, quantity_y + 10))
+    return layer
+
+def draw_betting_ui(screen, player, input_price, input_quantity, active_input, 
+                    buy_btn, sell_btn, finish_btn, game_area_width, screen_height,
+                    font, padding, colors, mouse_pos=None, layers=screen_layers):
+    """
+    베팅 UI 그리기 (mouse_pos: 화면 좌표계의 마우스 위치, 없으면 현재 위치 사용).
+    오버레이와 정적 레이어는 layers에 한 번만 만들어 두고, 매 프레임 버튼/입력값만 그린다.
+    """
+    BLACK = colors['BLACK']
+    GOLD = colors['GOLD']
+    WHITE = colors['WHITE']
+    RED = colors['RED']
+    BLUE = colors['BLUE']
+    LIGHT_GRAY = colors['LIGHT_GRAY']
+    TEXT_COLOR = colors['TEXT_COLOR']
+    
+    overlay = layers.get(('overlay', game_area_width, screen_height, 200),
+                         lambda: build_overlay(game_area_width, screen_height, 200, BLACK))
+    screen.blit(overlay, (0, 0))
+    static_layer = layers.get(('betting', player),
+                              lambda: build_betting_layer(player, game_area_width, screen_height, font, padding, colors))
+    screen.blit(static_layer, (0, 0))
+
+    _, buttons_y, price_y, quantity_y, finish_y = _betting_rows(50)
+
+    # 우측 패널: 베팅 입력
+    RIGHT_START_X = game_area_width // 2 + 50 
+    RIGHT_PANEL_WIDTH = game_area_width - RIGHT_START_X - padding
 
     # 매수/매도 버튼
     BUTTON_WIDTH = 120
@@ -170,10 +265,11 @@ def draw_betting_ui(screen, player, input_price, input_quantity, active_input,
     
     buy_btn.rect.x = buttons_set_start_x
     sell_btn.rect.x = buttons_set_start_x + BUTTON_WIDTH + BUTTON_GAP
-    buy_btn.rect.y = y_current
-    sell_btn.rect.y = y_current
+    buy_btn.rect.y = buttons_y
+    sell_btn.rect.y = buttons_y
     
-    mouse_pos = pygame.mouse.get_pos()
+    if mouse_pos is None:
+        mouse_pos = pygame.mouse.get_pos()
     
     if player.bet_type == "매수":
         buy_btn.color = RED
@@ -191,36 +287,29 @@ def draw_betting_ui(screen, player, input_price, input_quantity, active_input,
 
     buy_btn.draw(screen, font, TEXT_COLOR)
     sell_btn.draw(screen, font, TEXT_COLOR)
-    y_current += 60
 
     # 예측 가격 입력
-    price_text = font.render("예측 가격:", True, WHITE)
-    screen.blit(price_text, (RIGHT_START_X - 20, y_current + 10))
-    price_box = pygame.Rect(RIGHT_START_X + 130, y_current, 200, 40)
+    price_box = pygame.Rect(RIGHT_START_X + 130, price_y, 200, 40)
     pygame.draw.rect(screen, WHITE, price_box, 2)
     if active_input == "price": pygame.draw.rect(screen, GOLD, price_box, 4)
     
-    price_value = font.render(input_price + " 냥", True, WHITE)
+    price_value = render_text(font, input_price + " 냥", True, WHITE)
     price_text_y = price_box.y + (price_box.height // 2) - (price_value.get_height() // 2)
     screen.blit(price_value, (price_box.x + 10, price_text_y))
-    y_current += 60
 
     # 수량 입력
-    quantity_text = font.render("수량:", True, WHITE)
-    screen.blit(quantity_text, (RIGHT_START_X - 20, y_current + 10))
-    quantity_box = pygame.Rect(RIGHT_START_X + 130, y_current, 200, 40)
+    quantity_box = pygame.Rect(RIGHT_START_X + 130, quantity_y, 200, 40)
     pygame.draw.rect(screen, WHITE, quantity_box, 2)
     if active_input == "quantity": pygame.draw.rect(screen, GOLD, quantity_box, 4)
     
-    quantity_value = font.render(input_quantity + " 가마", True, WHITE)
+    quantity_value = render_text(font, input_quantity + " 가마", True, WHITE)
     quantity_text_y = quantity_box.y + (quantity_box.height // 2) - (quantity_value.get_height() // 2)
     screen.blit(quantity_value, (quantity_box.x + 10, quantity_text_y))
-    y_current += 80
 
     # 베팅 완료 버튼
     FINISH_BUTTON_WIDTH = 200
     finish_btn.rect.x = RIGHT_START_X + (RIGHT_PANEL_WIDTH // 2) - (FINISH_BUTTON_WIDTH // 2) 
-    finish_btn.rect.y = y_current
+    finish_btn.rect.y = finish_y
     finish_btn.color = LIGHT_GRAY
     finish_btn.draw(screen, font, TEXT_COLOR)
     
@@ -230,30 +319,24 @@ def draw_betting_ui(screen, player, input_price, input_quantity, active_input,
         'quantity_box': quantity_box
     }
 
-def draw_results(screen, players, final_price, result_btn, game_area_width, 
-                 screen_height, font, small_font, colors):
-    """결과 화면 그리기"""
-    BLACK = colors['BLACK']
+def build_results_layer(players, final_price, game_area_width, screen_height, font, small_font, colors):
+    """결과 화면의 제목, 최종 가격 안내판, 손익 순으로 정렬한 결과표, 승자를 미리 그린 surface"""
     GOLD = colors['GOLD']
     DARK_WOOD = colors['DARK_WOOD']
     WHITE = colors['WHITE']
     RED = colors['RED']
     BLUE = colors['BLUE']
     TEXT_COLOR = colors['TEXT_COLOR']
-    
-    overlay = pygame.Surface((game_area_width, screen_height))
-    overlay.set_alpha(220)
-    overlay.fill(BLACK)
-    screen.blit(overlay, (0, 0))
 
+    layer = pygame.Surface((game_area_width, screen_height), pygame.SRCALPHA)
     center_x = game_area_width // 2
     y_start = 100
 
-    title = font.render("- 최종 정산 결과 -", True, TEXT_COLOR)
-    screen.blit(title, (center_x - title.get_width() // 2, y_start))
+    title = render_text(font, "- 최종 정산 결과 -", True, TEXT_COLOR)
+    layer.blit(title, (center_x - title.get_width() // 2, y_start))
     y_start += 75
 
-    price_text = font.render(f"금일 최종 쌀 시장 가격: {final_price} 냥", True, GOLD) 
+    price_text = render_text(font, f"금일 최종 쌀 시장 가격: {final_price} 냥", True, GOLD) 
     padding_x = 30
     padding_y = 15
     text_w, text_h = price_text.get_size()
@@ -264,13 +347,13 @@ def draw_results(screen, players, final_price, result_btn, game_area_width,
         text_x - padding_x, text_y - padding_y,
         text_w + 2 * padding_x, text_h + 2 * padding_y
     )
-    pygame.draw.rect(screen, DARK_WOOD, background_rect, border_radius=5)
-    pygame.draw.rect(screen, GOLD, background_rect, 3, border_radius=5)
-    screen.blit(price_text, (text_x, text_y)) 
+    pygame.draw.rect(layer, DARK_WOOD, background_rect, border_radius=5)
+    pygame.draw.rect(layer, GOLD, background_rect, 3, border_radius=5)
+    layer.blit(price_text, (text_x, text_y)) 
     y_start += text_h + 2 * padding_y + 10
 
-    header = small_font.render("상인 이름 | 베팅 가격 | 유형 | 수량 | 최종 손익", True, WHITE)
-    screen.blit(header, (center_x - header.get_width() // 2, y_start))
+    header = render_text(small_font, "상인 이름 | 베팅 가격 | 유형 | 수량 | 최종 손익", True, WHITE)
+    layer.blit(header, (center_x - header.get_width() // 2, y_start))
     y_start += 30
 
     sorted_players = sorted(players, key=lambda p: p.profit, reverse=True)
@@ -278,15 +361,35 @@ def draw_results(screen, players, final_price, result_btn, game_area_width,
     for player in sorted_players:
         color = RED if player.profit >= 0 else BLUE
 
-        result_line = font.render(
-            f"{player.name} | {player.bet_price} 냥 | {player.bet_type} | {player.bet_quantity} 가마 | {player.profit} 냥",
+        # 💡 호가창 모드에서는 체결된 수량/주문 수량 표시
+        if player.filled_quantity is None:
+            quantity_text = f"{player.bet_quantity} 가마"
+        else:
+            quantity_text = f"{player.filled_quantity}/{player.bet_quantity} 가마"
+        result_line = render_text(font, 
+            f"{player.name} | {player.bet_price} 냥 | {player.bet_type} | {quantity_text} | {player.profit} 냥",
             True, color
         )
-        screen.blit(result_line, (center_x - result_line.get_width() // 2, y_start))
+        layer.blit(result_line, (center_x - result_line.get_width() // 2, y_start))
         y_start += 40
 
-    winner_text = font.render(f"-승자- : {sorted_players[0].name} (최종 손익: {sorted_players[0].profit} 냥)", True, TEXT_COLOR)
-    screen.blit(winner_text, (center_x - winner_text.get_width() // 2, y_start + 40))
+    winner_text = render_text(font, f"-승자- : {sorted_players[0].name} (최종 손익: {sorted_players[0].profit} 냥)", True, TEXT_COLOR)
+    layer.blit(winner_text, (center_x - winner_text.get_width() // 2, y_start + 40))
+    return layer
+
+def draw_results(screen, players, final_price, result_btn, game_area_width, 
+                 screen_height, font, small_font, colors, layers=screen_layers):
+    """결과 화면 그리기 (오버레이와 결과표는 layers에 한 번만 만들어 두고 재사용)"""
+    BLACK = colors['BLACK']
+    TEXT_COLOR = colors['TEXT_COLOR']
+    
+    overlay = layers.get(('overlay', game_area_width, screen_height, 220),
+                         lambda: build_overlay(game_area_width, screen_height, 220, BLACK))
+    screen.blit(overlay, (0, 0))
+    results_layer = layers.get(('results', final_price),
+                               lambda: build_results_layer(players, final_price, game_area_width, screen_height,
+                                                           font, small_font, colors))
+    screen.blit(results_layer, (0, 0))
 
     result_btn.rect.y = screen_height - 100
-    result_btn.draw(screen, font, TEXT_COLOR)
\ No newline at end of file
+    result_btn.draw(screen, font, TEXT_COLOR)
@@ -1,23 +1,101 @@
 # main.py - 삼국의 미략상
 
+import argparse
+import atexit
 import pygame
+import random
 import sys
+import time
 
 # 코어 모듈 import
 from core.player import Player
-from core.npc import NPC, NPC_DIALOGUE_DATA # NPC_DIALOGUE_DATA는 이제 {dialogue, info_type} 포함
-from core.market import Market
-from core.ui import Button, draw_info_panel, draw_betting_ui, draw_results
-from core.function import calculate_final_price
+from core.npc import NPC, DialogueManager, PENDING_DIALOGUE, npc_ids_near # 대사 데이터는 {dialogue, info_type} 포함
+from core.market import Market, OrderBook
+from core.engine import GameEngine
+from core.bots import BotController, create_strategy, play_rounds, DEFAULT_BOT_STRATEGIES
+from core.assets import assets
+from core.camera import Camera
+from core.ui import Button, InfoPanelCache, screen_layers, draw_betting_ui, draw_results
+from core.metrics import dialogue_metrics
+from core.render import DirtyRectTracker, create_display
+from core.text_cache import text_cache, render_text
 
 # 설정 데이터 import
 from config.game_data import (
     NPC_POSITIONS, 
+    LARGE_WORLD_ENABLED,
+    WORLD_WIDTH,
+    WORLD_HEIGHT,
+    WORLD_NPC_COUNT,
+    WORLD_SEED,
+    generate_npc_positions,
     TARGET_NPCS, 
+    NPC_STARTUP_RADIUS,
+    NPC_DIALOGUE_LAZY,
+    NPC_DIALOGUE_BATCH,
+    NPC_PREFETCH_RADIUS,
+    MARKET_ORDER_BOOK_ENABLED,
+    DIALOGUE_METRICS_LOG_PATH,
     get_player_start_positions, 
     get_market_position
 )
 
+# ============================================
+# 실행 옵션
+# ============================================
+def parse_args():
+    parser = argparse.ArgumentParser(description="삼국의 미략상")
+    parser.add_argument("--autoplay", action="store_true",
+                        help="봇 상인이 화면에서 판을 연속 진행 (프레임 제한 없음, 부하 테스트용)")
+    parser.add_argument("--headless", action="store_true", help="창 없이 봇 상인끼리 판을 연속 진행")
+    parser.add_argument("--rounds", type=int, default=0,
+                        help="자동 진행 판 수 (0이면 창을 닫거나 Ctrl+C를 누를 때까지 계속)")
+    parser.add_argument("--seed", type=int, default=None, help="자동 진행 난수 seed")
+    return parser.parse_args()
+
+HEADLESS_REPORT_EVERY = 1000   # 헤드리스 자동 진행 시 진행 상황 출력 간격 (판)
+
+def run_headless(rounds, seed):
+    """창 없이 봇 상인끼리 판을 연속 진행하며 처리량과 전략별 승리 수 출력"""
+    stats = {'rounds': 0, 'unfinished': 0, 'wins': dict.fromkeys(DEFAULT_BOT_STRATEGIES, 0.0)}
+    started = time.perf_counter()
+
+    def on_round(played, engine):
+        stats['rounds'] = played
+        if not engine.finished:
+            stats['unfinished'] += 1
+        else:
+            best_money = max(player.money for player in engine.players)
+            winners = [name for name, player in zip(DEFAULT_BOT_STRATEGIES, engine.players)
+                       if player.money == best_money]
+            for name in winners:
+                stats['wins'][name] += 1 / len(winners)
+        if played % HEADLESS_REPORT_EVERY == 0:
+            elapsed = time.perf_counter() - started
+            print(f"🤖 {played:,}판 ({played / elapsed:,.0f}판/초)")
+
+    try:
+        play_rounds(rounds, seed=seed, on_round=on_round)
+    except KeyboardInterrupt:
+        pass
+
+    played = stats['rounds']
+    elapsed = time.perf_counter() - started
+    wins = ", ".join(f"{name} {count / played:.1%}" for name, count in stats['wins'].items()) if played else "-"
+    print(f"🤖 자동 진행 {played:,}판, {elapsed:.1f}초 | 승률: {wins} | 미완료 {stats['unfinished']}판")
+
+ARGS = parse_args()
+AUTOPLAY = ARGS.autoplay
+bot_rng = random.Random(ARGS.seed)  # 자동 진행 모드의 봇 베팅 전략용
+
+if ARGS.headless:
+    run_headless(ARGS.rounds, ARGS.seed)
+    sys.exit()
+
+# 💡 로딩 중 창을 닫는 등 sys.exit()로 끝나도 대사 생성 계측 결과가 저장되도록 종료 시 기록
+if DIALOGUE_METRICS_LOG_PATH:
+    atexit.register(dialogue_metrics.write_jsonl, DIALOGUE_METRICS_LOG_PATH)
+
 pygame.init()
 
 # ============================================
@@ -84,10 +162,12 @@ TASKBAR_ADJUST_HEIGHT = 40
 ACTUAL_HEIGHT = VIRTUAL_HEIGHT - TASKBAR_ADJUST_HEIGHT
 ACTUAL_WIDTH = int(ACTUAL_HEIGHT / VIRTUAL_HEIGHT * VIRTUAL_WIDTH)
 
-display_screen = pygame.display.set_mode((ACTUAL_WIDTH, ACTUAL_HEIGHT))
-pygame.display.set_caption("삼국의 미략상")
+# 💡 화면 표시 방식: "sdl_scaled"(SDL2가 창 크기로 확대/축소) 또는 "software"(변경 영역만 소프트웨어 축소)
+PRESENTATION_MODE = "sdl_scaled"
 
-screen = pygame.Surface((VIRTUAL_WIDTH, VIRTUAL_HEIGHT))
+# screen은 항상 가상 해상도(1200x800) 좌표계. 마우스 좌표는 presenter로 변환해 사용
+screen, presenter = create_display((VIRTUAL_WIDTH, VIRTUAL_HEIGHT), (ACTUAL_WIDTH, ACTUAL_HEIGHT), PRESENTATION_MODE)
+pygame.display.set_caption("삼국의 미략상")
 
 SCREEN_WIDTH = VIRTUAL_WIDTH
 SCREEN_HEIGHT = VIRTUAL_HEIGHT
@@ -98,61 +178,105 @@ INFO_PANEL_WIDTH = 400
 GAME_AREA_WIDTH = SCREEN_WIDTH - INFO_PANEL_WIDTH
 PADDING = 15
 
+# 프레임 속도 설정
+ACTIVE_FPS = 60          # 화면이 바뀌는 동안의 프레임 속도
+ACTIVE_GRACE_MS = 250    # 마지막 화면 변경 후 이 시간 동안은 ACTIVE_FPS 유지
+IDLE_WAIT_MS = 500       # 유휴 상태에서 이벤트를 기다리는 최대 시간
+
+# 자동 진행 (--autoplay): 프레임 제한 없이 봇이 매 프레임 행동 하나씩 진행
+AUTOPLAY_RESULT_FRAMES = 30   # 결과 화면을 보여 준 뒤 다음 판으로 넘어가기까지의 프레임 수
+
+# 💡 백그라운드 대사 생성이 끝났을 때 유휴 상태의 게임 루프를 깨우는 이벤트
+DIALOGUE_READY_EVENT = pygame.USEREVENT + 1
+
 # ============================================
 # 이미지 로드
 # ============================================
-try:
-    # 💡 이미지 경로 수정 반영
-    background_image = pygame.image.load(MAP_IMAGE_PATH).convert() 
-    background_image = pygame.transform.scale(
-        background_image, (GAME_AREA_WIDTH, SCREEN_HEIGHT)
-    )
-except pygame.error as e:
-    print(f"이미지 로드 오류: {e}. 대체 배경 사용.")
-    background_image = pygame.Surface((GAME_AREA_WIDTH, SCREEN_HEIGHT))
-    background_image.fill((100, 100, 100))
+# 💡 축소한 맵 이미지는 디스크 캐시에 저장되어 다음 실행부터는 원본을 다시 디코딩/축소하지 않음
+background_image = assets.image(MAP_IMAGE_PATH, (GAME_AREA_WIDTH, SCREEN_HEIGHT), alpha=False,
+                                fallback_color=(100, 100, 100))
 
 # ============================================
 # 유틸리티 함수
 # ============================================
-def show_loading_screen(message):
-    """로딩 화면 표시"""
+def show_loading_screen(message, progress=None):
+    """로딩 화면 표시 (progress: (완료 수, 전체 수)이면 진행 막대 표시)"""
     screen.fill(BLACK)
-    loading_text = FONT.render(message, True, GOLD)
+    loading_text = render_text(FONT, message, True, GOLD)
     screen.blit(loading_text, (SCREEN_WIDTH // 2 - loading_text.get_width() // 2, SCREEN_HEIGHT // 2))
-    
-    scaled_surface = pygame.transform.scale(screen, (ACTUAL_WIDTH, ACTUAL_HEIGHT))
-    display_screen.blit(scaled_surface, (0, 0))
-    pygame.display.flip()
+
+    if progress is not None:
+        done, total = progress
+        bar_width, bar_height = 500, 24
+        bar_rect = pygame.Rect(SCREEN_WIDTH // 2 - bar_width // 2, SCREEN_HEIGHT // 2 + 60, bar_width, bar_height)
+        fill_rect = bar_rect.copy()
+        fill_rect.width = int(bar_width * done / total) if total else bar_width
+        pygame.draw.rect(screen, DARK_WOOD, bar_rect, border_radius=5)
+        pygame.draw.rect(screen, GOLD, fill_rect, border_radius=5)
+        pygame.draw.rect(screen, GOLD, bar_rect, 2, border_radius=5)
+
+        count_text = render_text(SMALL_FONT, f"{done}/{total}", True, TEXT_COLOR)
+        screen.blit(count_text, (SCREEN_WIDTH // 2 - count_text.get_width() // 2, bar_rect.bottom + 10))
+
+    presenter.present(screen)
+
+def wait_for_dialogues(manager, npc_ids):
+    """지정한 NPC 대사가 준비될 때까지 이벤트를 처리하며 진행 막대 표시"""
+    loading_clock = pygame.time.Clock()
+    while not manager.is_ready(npc_ids):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                manager.shutdown()
+                pygame.quit()
+                sys.exit()
+        show_loading_screen("NPC 대사 생성 중...", (manager.ready_count, len(manager)))
+        loading_clock.tick(30)
 
 # ============================================
 # 게임 초기화
 # ============================================
-show_loading_screen("NPC 대사 생성 중...")
-
-# 💡 NPC_DATA 생성 시 info_type 포함
-NPC_DATA = [(d['position'], d['dialogue'], d['info_type']) for d in NPC_DIALOGUE_DATA]
-
-show_loading_screen("게임 시작!")
+# 💡 월드 크기: 기본 맵은 게임 영역과 같고, 대형 맵 모드에서는 카메라가 현재 상인을 따라감
+if LARGE_WORLD_ENABLED:
+    WORLD_SIZE = (WORLD_WIDTH, WORLD_HEIGHT)
+else:
+    WORLD_SIZE = (GAME_AREA_WIDTH, SCREEN_HEIGHT)
+
+START_POSITIONS = get_player_start_positions(WORLD_SIZE[1], PLAYER_SIZE, WORLD_SIZE[0])
+MARKET_POS = get_market_position(WORLD_SIZE[0], WORLD_SIZE[1], STEP_SIZE)
+
+if LARGE_WORLD_ENABLED:
+    # 시작 위치와 장터 자리에는 NPC를 두지 않음
+    excluded_rects = [(x, y, PLAYER_SIZE, PLAYER_SIZE) for x, y in START_POSITIONS]
+    excluded_rects.append((MARKET_POS[0], MARKET_POS[1], STEP_SIZE * 2, STEP_SIZE * 2))
+    npc_positions = generate_npc_positions(WORLD_NPC_COUNT, WORLD_SIZE[0], WORLD_SIZE[1], STEP_SIZE,
+                                           seed=WORLD_SEED, exclude_rects=excluded_rects)
+else:
+    npc_positions = NPC_POSITIONS
+
+# 💡 NPC가 많은 대형 맵에서는 항상 다가가는 NPC만 대사를 생성
+dialogue_lazy = NPC_DIALOGUE_LAZY or LARGE_WORLD_ENABLED
+
+# 💡 창이 열린 뒤 백그라운드에서 대사 생성 시작.
+#    플레이어 시작 위치 근처 NPC를 먼저 요청하고, 그 대사만 준비되면 게임을 시작한다.
+#    나머지 NPC 대사는 게임 진행 중에 채워진다.
+#    지연 모드에서는 기다리지 않고, 플레이어가 다가가는 NPC만 그때그때 요청한다.
+def notify_dialogue_ready(npc_id):
+    """워커 스레드에서 호출: 게임 루프에 대사 준비 이벤트 전달"""
+    pygame.event.post(pygame.event.Event(DIALOGUE_READY_EVENT, npc_id=npc_id))
+
+dialogue_manager = DialogueManager(npc_positions, on_ready=notify_dialogue_ready,
+                                   lazy=dialogue_lazy, batch=NPC_DIALOGUE_BATCH)
+if dialogue_lazy:
+    dialogue_manager.start(priority_ids=npc_ids_near(npc_positions, START_POSITIONS, NPC_PREFETCH_RADIUS))
+else:
+    startup_npc_ids = npc_ids_near(npc_positions, START_POSITIONS, NPC_STARTUP_RADIUS)
+    dialogue_manager.start(priority_ids=startup_npc_ids)
+    wait_for_dialogues(dialogue_manager, startup_npc_ids)
+
+show_loading_screen("게임 시작!", (dialogue_manager.ready_count, len(dialogue_manager)))
 pygame.time.wait(500)
 
-# Player 및 NPC 생성
-START_POSITIONS = get_player_start_positions(SCREEN_HEIGHT, PLAYER_SIZE, GAME_AREA_WIDTH)
-
-players = [
-    Player(DEALER_1_PATH, START_POSITIONS[0], "백제 상인", player_size=PLAYER_SIZE),
-    Player(DEALER_2_PATH, START_POSITIONS[1], "신라 상인", player_size=PLAYER_SIZE),
-    Player(DEALER_3_PATH, START_POSITIONS[2], "고구려 상인", player_size=PLAYER_SIZE),
-]
-
-# 💡 NPC 객체 생성 시 info_type 인자 추가 (npc.py의 NPC 클래스 정의에 따라)
-npcs = pygame.sprite.Group([
-    NPC(pos, info, info_type, step_size=STEP_SIZE) for pos, info, info_type in NPC_DATA
-])
-
-MARKET_POS = get_market_position(GAME_AREA_WIDTH, SCREEN_HEIGHT, STEP_SIZE)
 market = Market(MARKET_POS, step_size=STEP_SIZE)
-all_sprites = pygame.sprite.Group(players, npcs, market)
 
 # 버튼 생성
 center_x = GAME_AREA_WIDTH // 2
@@ -173,46 +297,277 @@ show_result_button = Button(
     x=center_x - 100, y=0, width=200, height=50, text="게임 종료", color=LIGHT_GRAY, hover_color=GOLD, action="SHOW_RESULTS"
 )
 
-# 게임 상태 변수
-current_turn = 0
-current_player = players[current_turn]
-game_message = f"{current_player.name} 님의 턴. 방향키로 이동하세요."
-game_state = "MOVING"
-input_price = "0"
-input_quantity = "0"
-active_input = "price"
-trade_finished_count = 0
-final_rice_price = 0
+camera = Camera((GAME_AREA_WIDTH, SCREEN_HEIGHT), WORLD_SIZE)
 
 # 입력 박스 위치 저장용
 input_boxes = {'price_box': None, 'quantity_box': None}
 
+def start_round():
+    """새 판 시작: 상인, NPC, 엔진을 새로 만들고 입력 상태 초기화 (이미 준비된 대사는 그대로 사용)"""
+    global players, npc_list, npcs, all_sprites, engine, bot_controllers
+    global input_price, input_quantity, active_input
+
+    # Player 및 NPC 생성
+    players = [
+        Player(DEALER_1_PATH, START_POSITIONS[0], "백제 상인", player_size=PLAYER_SIZE),
+        Player(DEALER_2_PATH, START_POSITIONS[1], "신라 상인", player_size=PLAYER_SIZE),
+        Player(DEALER_3_PATH, START_POSITIONS[2], "고구려 상인", player_size=PLAYER_SIZE),
+    ]
+
+    # 💡 대사는 생성 중일 수 있으므로 임시 대사로 만들고, 준비되는 대로 게임 루프에서 반영
+    npc_list = []
+    for npc_id, pos in enumerate(npc_positions):
+        entry = dialogue_manager.get(npc_id)
+        if entry is not None:
+            npc_list.append(NPC(pos, entry['dialogue'], entry['info_type'], step_size=STEP_SIZE))
+        else:
+            npc_list.append(NPC(pos, PENDING_DIALOGUE, "NONE", step_size=STEP_SIZE))
+    npcs = pygame.sprite.Group(npc_list)
+    all_sprites = pygame.sprite.Group(players, npcs, market)
+
+    # 💡 게임 규칙/상태는 엔진이 관리하고, 이 파일은 입력을 엔진 행동으로 바꾸고 상태를 그리기만 함
+    #    정산에는 대사 관리자의 데이터를 사용 (아직 요청/생성되지 않은 NPC는 'NONE')
+    engine = GameEngine(players, npc_list, tuple(market.rect), WORLD_SIZE, target_npcs=TARGET_NPCS,
+                        cell_size=STEP_SIZE, settlement_data=lambda: dialogue_manager.data,
+                        order_book=OrderBook() if MARKET_ORDER_BOOK_ENABLED else None)
+
+    # 💡 자동 진행 모드에서는 봇 조종기가 상인을 움직임
+    bot_controllers = [BotController(create_strategy(name, bot_rng), STEP_SIZE) for name in DEFAULT_BOT_STRATEGIES]
+
+    camera.follow(engine.current_player.rect)
+    info_panel.clear()
+    screen_layers.clear()
+    dirty_tracker.mark_all()
+
+    # 입력 상태 변수 (화면 전용)
+    input_price = "0"
+    input_quantity = "0"
+    active_input = "price"
+
+def apply_action(action):
+    """
+    엔진 행동(GameEngine.apply 형식)을 적용하고 화면 상태에 반영
+    (카메라 이동, 베팅/결과 레이어 초기화, 대사 미리 요청, 만난 NPC 영역 갱신). 엔진 결과를 반환한다.
+    """
+    global input_price, input_quantity
+    name = action[0]
+
+    if name == "move":
+        current_player = engine.current_player
+        move_result = engine.move(*action[1:])
+        if move_result is not None:
+            camera.follow(current_player.rect)
+
+            # 💡 지연 모드: 가까워진 NPC 대사를 미리 요청 (비동기, 이미 요청한 NPC는 무시)
+            if dialogue_manager.lazy:
+                dialogue_manager.request(
+                    engine.npc_index.query_radius(current_player.rect.topleft, NPC_PREFETCH_RADIUS)
+                )
+
+            if move_result['met_npc'] is not None:
+                dirty_tracker.mark(camera.apply(npc_list[move_result['met_npc']].rect))
+        return move_result
+
+    if name == "start_betting":
+        started = engine.start_betting()
+        if started:
+            screen_layers.clear()  # 💡 베팅 화면 정적 레이어는 진입할 때 한 번 새로 만듦
+        return started
+
+    if name == "finish_betting":
+        # 💡 검증, 턴 넘김, 정산은 엔진이 처리하고 화면은 결과만 반영
+        finished = engine.finish_betting(*action[1:])
+        if finished:
+            if engine.state == "RESULT_VIEW":
+                screen_layers.clear()
+            else:
+                input_price, input_quantity = "0", "0"
+                camera.follow(engine.current_player.rect)
+        return finished
+
+    return engine.apply(action)
+
+# ============================================
+# 화면 그리기
+# ============================================
+PANEL_RECT = pygame.Rect(GAME_AREA_WIDTH, 0, INFO_PANEL_WIDTH, SCREEN_HEIGHT)
+GAME_AREA_RECT = pygame.Rect(0, 0, GAME_AREA_WIDTH, SCREEN_HEIGHT)
+
+dirty_tracker = DirtyRectTracker(screen.get_rect())
+
+# 💡 플레이어별 정보 패널은 수집 정보가 바뀔 때만 다시 그리고, 그 외에는 저장된 surface를 blit
+info_panel = InfoPanelCache(GAME_AREA_WIDTH, SCREEN_HEIGHT, INFO_PANEL_WIDTH, PADDING,
+                            FONT, TINY_FONT, GOLD, DARK_WOOD, WHITE)
+
+start_round()
+
+def message_box_rect(message):
+    """하단 메시지 박스 영역"""
+    message_rect = pygame.Rect((0, 0), FONT.size(message))
+    message_rect.center = (GAME_AREA_WIDTH // 2, SCREEN_HEIGHT - 40 + FONT.get_height() // 2)
+    return message_rect
+
+def draw_scene():
+    """현재 상태의 화면 전체를 screen에 그림 (clip 영역 밖은 실제로 칠해지지 않음)"""
+    global input_boxes
+
+    screen.fill(GRAY)
+    view_rect = camera.view_rect
+
+    # 💡 배경은 보이는 타일만, NPC는 화면 안에 있는 (아직 만나지 않은) NPC만 그림
+    tile_width, tile_height = background_image.get_size()
+    for tile_x in range(view_rect.left // tile_width * tile_width, view_rect.right, tile_width):
+        for tile_y in range(view_rect.top // tile_height * tile_height, view_rect.bottom, tile_height):
+            screen.blit(background_image, (tile_x - view_rect.x, tile_y - view_rect.y))
+
+    for npc_id in engine.npc_index.query_rect(view_rect):
+        npc = npc_list[npc_id]
+        screen.blit(npc.image, camera.apply(npc.rect))
+
+    screen.blit(market.image, camera.apply(market.rect))
+
+    for player in players:
+        screen.blit(player.image, camera.apply(player.rect))
+
+    current_player = engine.current_player
+    info_panel.draw(screen, current_player)
+
+    message_surface = render_text(FONT, engine.message, True, GOLD)
+    message_rect = message_box_rect(engine.message)
+
+    padding_x = 20
+    padding_y = 10
+    background_rect = message_rect.inflate(2 * padding_x, 2 * padding_y)
+    pygame.draw.rect(screen, DARK_WOOD, background_rect, border_radius=5) 
+    pygame.draw.rect(screen, GOLD, background_rect, 3, border_radius=5)
+
+    screen.blit(message_surface, message_rect.topleft)
+    
+    if engine.state == "BETTING":
+        input_boxes = draw_betting_ui(screen, current_player, input_price, input_quantity, 
+                                      active_input, buy_button, sell_button, finish_bet_button, 
+                                      GAME_AREA_WIDTH, SCREEN_HEIGHT, FONT, PADDING, COLORS,
+                                      mouse_pos=presenter.mouse_pos())
+
+    elif engine.state == "MOVING" and current_player.can_bet:
+        market_rect = camera.apply(market.rect)
+        start_bet_button.rect.x = market_rect.x + STEP_SIZE - 100
+        start_bet_button.rect.y = market_rect.y + STEP_SIZE * 2 + 10
+        start_bet_button.draw(screen, FONT, TEXT_COLOR)
+
+    elif engine.state == "RESULT_VIEW":
+        draw_results(screen, players, engine.final_price, show_result_button, 
+                     GAME_AREA_WIDTH, SCREEN_HEIGHT, FONT, SMALL_FONT, COLORS)
+
+def frame_state():
+    """화면에 영향을 주는 상태 요약 (이전 프레임과 비교해 다시 그릴 영역을 계산)"""
+    mouse_pos = presenter.mouse_pos()
+    current_player = engine.current_player
+    betting_state = None
+    if engine.state == "BETTING":
+        betting_state = (
+            input_price, input_quantity, active_input, current_player.bet_type,
+            buy_button.is_hovered, sell_button.is_hovered, finish_bet_button.is_hovered,
+            buy_button.rect.collidepoint(mouse_pos), sell_button.rect.collidepoint(mouse_pos)
+        )
+    return {
+        'screen': (engine.state, engine.current_turn, current_player.can_bet),
+        'camera': camera.offset,
+        'players': [tuple(camera.apply(player.rect)) for player in players],
+        'message': engine.message,
+        'panel': current_player.info_version,
+        'betting': betting_state,
+        'start_button': start_bet_button.is_hovered,
+        'result_button': show_result_button.is_hovered,
+    }
+
+def mark_changes(previous, current):
+    """이전/현재 상태를 비교해 바뀐 영역을 dirty_tracker에 표시"""
+    if previous is None or previous['screen'] != current['screen']:
+        dirty_tracker.mark_all()
+        return
+
+    # 💡 카메라가 움직이면 게임 영역 전체가 바뀜
+    if previous['camera'] != current['camera']:
+        dirty_tracker.mark(GAME_AREA_RECT)
+
+    for old_rect, new_rect in zip(previous['players'], current['players']):
+        if old_rect != new_rect:
+            dirty_tracker.mark(old_rect, new_rect)
+
+    if previous['message'] != current['message']:
+        # 💡 메시지 박스는 텍스트 영역에서 padding + 테두리만큼 넓게 그려짐
+        dirty_tracker.mark(message_box_rect(previous['message']).inflate(44, 24),
+                           message_box_rect(current['message']).inflate(44, 24))
+
+    if previous['panel'] != current['panel']:
+        dirty_tracker.mark(PANEL_RECT)
+
+    # 💡 베팅/결과 화면은 게임 영역 전체를 덮는 반투명 오버레이 위에 그려짐
+    if previous['betting'] != current['betting'] or previous['result_button'] != current['result_button']:
+        dirty_tracker.mark(GAME_AREA_RECT)
+
+    if previous['start_button'] != current['start_button']:
+        # 💡 hover 시 버튼이 5% 커지므로 여유를 둠
+        dirty_tracker.mark(start_bet_button.rect.inflate(20, 20))
+
 # ============================================
 # 게임 루프
 # ============================================
 running = True
 clock = pygame.time.Clock()
+last_frame_state = None
+last_activity = pygame.time.get_ticks()
+rounds_played = 0
+result_frames = 0
+frame_count = 0
+loop_started = time.perf_counter()
 
 while running:
-    for event in pygame.event.get():
+    # 💡 화면이 한동안 바뀌지 않았으면 이벤트(입력, 대사 준비)가 올 때까지 잠들어 CPU를 쓰지 않음
+    #    (자동 진행 모드는 쉬지 않고 계속 진행)
+    if not AUTOPLAY and pygame.time.get_ticks() - last_activity > ACTIVE_GRACE_MS:
+        first_event = pygame.event.wait(IDLE_WAIT_MS)
+        events = [first_event] if first_event.type != pygame.NOEVENT else []
+        events += pygame.event.get()
+    else:
+        events = pygame.event.get()
+    # 💡 마우스 이벤트 좌표를 가상 해상도 좌표로 통일 (Button.rect, input_boxes와 비교하기 위함)
+    events = [presenter.map_event(event) for event in events]
+
+    # 💡 백그라운드에서 새로 준비된 NPC 대사 반영
+    for npc_id, entry in dialogue_manager.poll():
+        npc_list[npc_id].set_info(entry['dialogue'], entry['info_type'])
+
+    for event in events:
         if event.type == pygame.QUIT:
             running = False
 
-        if game_state == "RESULT_VIEW":
+        # 💡 창이 가려졌다 다시 보이면 전체를 다시 그림
+        if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+            dirty_tracker.mark_all()
+
+        # 자동 진행 모드에서는 키보드/마우스 입력을 게임에 반영하지 않음
+        if AUTOPLAY:
+            continue
+
+        current_player = engine.current_player
+
+        if engine.state == "RESULT_VIEW":
             result = show_result_button.handle_event(event, current_player)
             if result == "SHOW_RESULTS":
                 running = False
             continue
 
-        if game_state == "BETTING":
+        if engine.state == "BETTING":
             
             if event.type == pygame.MOUSEBUTTONDOWN:
                 click_pos = event.pos
 
                 if buy_button.rect.collidepoint(click_pos):
-                    current_player.bet_type = "매수"
+                    engine.set_bet_type("매수")
                 elif sell_button.rect.collidepoint(click_pos):
-                    current_player.bet_type = "매도"
+                    engine.set_bet_type("매도")
                 
                 # 입력 박스 클릭 처리
                 if input_boxes['price_box'] and input_boxes['price_box'].collidepoint(click_pos):
@@ -225,48 +580,8 @@ while running:
             result = finish_bet_button.handle_event(event, current_player) or result
 
             if result == "BETTING_FINISH":
-                try:
-                    price = int(input_price)
-                    quantity = int(input_quantity)
-
-                    if price <= 0 or quantity <= 0:
-                        game_message = "가격과 수량은 0보다 커야 합니다."
-                        continue
-
-                    current_player.bet_price = price
-                    current_player.bet_quantity = quantity
-                    current_player.bet_status = f"{current_player.bet_type} {quantity}개 ({price}원)"
-                    current_player.trade_done = True
-                    trade_finished_count += 1
-
-                    game_message = f"{current_player.name} 님 거래 완료! 다음 상인 대기."
-                    game_state = "MOVING"
-
-                    if trade_finished_count < len(players):
-                        next_turn_found = False
-                        for _ in range(len(players)):
-                            current_turn = (current_turn + 1) % len(players)
-                            current_player = players[current_turn]
-                            if not current_player.trade_done:
-                                next_turn_found = True
-                                break
-
-                        if next_turn_found:
-                            game_message = f"{current_player.name} 님의 턴. 방향키로 이동하세요."
-                            input_price, input_quantity = "0", "0"
-                        else:
-                            # 💡 최종 가격 계산 시 NPC_DIALOGUE_DATA 전달
-                            final_rice_price = calculate_final_price(players, NPC_DIALOGUE_DATA) 
-                            game_state = "RESULT_VIEW"
-                            game_message = "모든 상인의 최종 정산이 완료되었습니다. 결과를 확인하세요!"
-                    else:
-                        # 💡 최종 가격 계산 시 NPC_DIALOGUE_DATA 전달
-                        final_rice_price = calculate_final_price(players, NPC_DIALOGUE_DATA) 
-                        game_state = "RESULT_VIEW"
-                        game_message = "최종 정산이 완료되었습니다. 결과를 확인하세요!"
-
-                except ValueError:
-                    game_message = "유효한 숫자(가격/수량)를 입력하세요."
+                apply_action(("finish_betting", input_price, input_quantity))
+                continue
 
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_TAB: 
@@ -284,15 +599,13 @@ while running:
 
             continue
 
-        elif game_state == "MOVING":
+        elif engine.state == "MOVING":
             if current_player.trade_done:
                 continue
 
             if current_player.can_bet:
                 result = start_bet_button.handle_event(event, current_player)
-                if result == "BETTING_START":
-                    game_state = "BETTING"
-                    game_message = "가격/수량/매수/매도를 결정하세요."
+                if result == "BETTING_START" and apply_action(("start_betting",)):
                     continue
 
             if event.type == pygame.KEYDOWN:
@@ -303,90 +616,65 @@ while running:
                 elif event.key == pygame.K_UP: dy = -STEP_SIZE
                 elif event.key == pygame.K_DOWN: dy = STEP_SIZE
 
-                if dx != 0 or dy != 0:
-                    current_player.move(dx, dy, GAME_AREA_WIDTH, SCREEN_HEIGHT)
-
-                    hit_npcs = pygame.sprite.spritecollide(current_player, npcs, False)
-
-                    new_message = f"{current_player.name} 님의 턴. 방향키로 이동하세요."
-
-                    if hit_npcs and current_player.npcs_met < TARGET_NPCS:
-                        for npc in hit_npcs:
-                            if not npc.met:
-                                # 💡 수집 정보 수정: 텍스트와 info_type을 딕셔너리로 저장
-                                current_player.collected_info.append({
-                                    'dialogue': npc.info,
-                                    'type': npc.info_type 
-                                })
-                                current_player.npcs_met += 1
-                                npc.met = True
-                                new_message = f"NPC와 만남! ({current_player.npcs_met}/{TARGET_NPCS}) 정보 획득!"
-                                if current_player.npcs_met == TARGET_NPCS:
-                                    new_message = "모든 정보를 모았습니다! 장터로 향하세요."
-                                break
-                            else:
-                                new_message = "이미 만난 NPC입니다. 이동을 계속하세요."
-
-                    if current_player.npcs_met >= TARGET_NPCS and pygame.sprite.collide_rect(current_player, market):
-                        current_player.can_bet = True
-                        new_message = f"장터 도착! 마우스로 '거래 시작' 버튼을 누르세요."
-                    elif not current_player.trade_done and new_message == f"{current_player.name} 님의 턴. 방향키로 이동하세요." and current_player.can_bet:
-                        new_message = f"장터 도착! 마우스로 '거래 시작' 버튼을 누르세요."
-
-                    game_message = new_message
-
-    # 화면 그리기 (기존 유지)
-    screen.fill(GRAY)
-    screen.blit(background_image, (0, 0))
-    
-    for npc in npcs:
-        if not npc.met:
-            screen.blit(npc.image, npc.rect)
-
-    screen.blit(market.image, market.rect)
-
-    for player in players:
-        screen.blit(player.image, player.rect)
-
-    draw_info_panel(screen, current_player, GAME_AREA_WIDTH, SCREEN_HEIGHT, 
-                    INFO_PANEL_WIDTH, PADDING, FONT, TINY_FONT, GOLD, DARK_WOOD, WHITE)
-
-    message_surface = FONT.render(game_message, True, GOLD)
-    message_rect = message_surface.get_rect(center=(GAME_AREA_WIDTH // 2, SCREEN_HEIGHT - 40 + FONT.get_height() // 2))
-
-    padding_x = 20
-    padding_y = 10
-    background_rect = pygame.Rect(
-        message_rect.x - padding_x,
-        message_rect.y - padding_y,
-        message_rect.width + 2 * padding_x,
-        message_rect.height + 2 * padding_y
-    )
-    pygame.draw.rect(screen, DARK_WOOD, background_rect, border_radius=5) 
-    pygame.draw.rect(screen, GOLD, background_rect, 3, border_radius=5)
-
-    screen.blit(message_surface, message_rect.topleft)
-    
-    if game_state == "BETTING":
-        buy_button.handle_event(pygame.event.Event(pygame.MOUSEMOTION, pos=pygame.mouse.get_pos()), current_player)
-        sell_button.handle_event(pygame.event.Event(pygame.MOUSEMOTION, pos=pygame.mouse.get_pos()), current_player)
-        
-        input_boxes = draw_betting_ui(screen, current_player, input_price, input_quantity, 
-                                      active_input, buy_button, sell_button, finish_bet_button, 
-                                      GAME_AREA_WIDTH, SCREEN_HEIGHT, FONT, PADDING, COLORS)
-
-    elif game_state == "MOVING" and current_player.can_bet:
-        start_bet_button.rect.x = MARKET_POS[0] + STEP_SIZE - 100
-        start_bet_button.rect.y = MARKET_POS[1] + STEP_SIZE * 2 + 10
-        start_bet_button.draw(screen, FONT, TEXT_COLOR)
-
-    elif game_state == "RESULT_VIEW":
-        draw_results(screen, players, final_rice_price, show_result_button, 
-                     GAME_AREA_WIDTH, SCREEN_HEIGHT, FONT, SMALL_FONT, COLORS)
-
-    scaled_surface = pygame.transform.scale(screen, (ACTUAL_WIDTH, ACTUAL_HEIGHT))
-    display_screen.blit(scaled_surface, (0, 0))
-    pygame.display.flip()
-    clock.tick(60)
+                apply_action(("move", dx, dy))
+
+    # 💡 자동 진행: 현재 상인의 봇이 프레임마다 행동 하나를 진행하고, 결과 화면을 잠시 보여 준 뒤 다음 판
+    if AUTOPLAY and running:
+        if engine.state == "RESULT_VIEW":
+            result_frames += 1
+            if result_frames >= AUTOPLAY_RESULT_FRAMES:
+                rounds_played += 1
+                result_frames = 0
+                if ARGS.rounds and rounds_played >= ARGS.rounds:
+                    running = False
+                else:
+                    start_round()
+                    last_frame_state = None
+        else:
+            action = bot_controllers[engine.current_turn].next_action(engine)
+            if action is None:
+                print("⚠️ 봇이 더 진행할 수 없어 새 판을 시작합니다.")
+                start_round()
+                last_frame_state = None
+            else:
+                apply_action(action)
+
+    # 💡 베팅 화면 버튼 hover 상태 갱신 (그리기 전에 상태만 반영)
+    if engine.state == "BETTING":
+        buy_button.handle_event(pygame.event.Event(pygame.MOUSEMOTION, pos=presenter.mouse_pos()), engine.current_player)
+        sell_button.handle_event(pygame.event.Event(pygame.MOUSEMOTION, pos=presenter.mouse_pos()), engine.current_player)
+
+    # 💡 이전 프레임과 달라진 영역만 다시 그리고 표시
+    current_frame_state = frame_state()
+    mark_changes(last_frame_state, current_frame_state)
+    last_frame_state = current_frame_state
+
+    if dirty_tracker.has_dirty:
+        last_activity = pygame.time.get_ticks()
+        dirty_rects = dirty_tracker.pop()
+        for rect in dirty_rects:
+            screen.set_clip(rect)
+            draw_scene()
+        screen.set_clip(None)
+        presenter.present(screen, dirty_rects)
+    clock.tick(0 if AUTOPLAY else ACTIVE_FPS)
+    frame_count += 1
+
+dialogue_manager.shutdown()
+
+if AUTOPLAY:
+    elapsed = time.perf_counter() - loop_started
+    print(f"🤖 자동 진행 {rounds_played}판, {frame_count:,}프레임, {elapsed:.1f}초 "
+          f"(평균 {frame_count / elapsed:,.0f}fps)")
+
+# 💡 대사 생성 계측 요약 출력 (파일 저장은 종료 시 atexit에서)
+summary = dialogue_metrics.snapshot()
+latency = summary['latency_ms']
+if latency['count']:
+    print(f"📊 대사 요청 {latency['count']}건 | 지연 시간 p50 {latency['p50']:.0f}ms, "
+          f"p95 {latency['p95']:.0f}ms, p99 {latency['p99']:.0f}ms | {summary['counters']}")
+text_stats = text_cache.stats()
+print(f"🔤 텍스트 캐시 적중률 {text_stats['hit_rate']:.1%} "
+      f"(적중 {text_stats['hits']}, 미적중 {text_stats['misses']}, 항목 {text_stats['entries']})")
 
 pygame.quit()
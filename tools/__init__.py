@@ -0,0 +1,2 @@
+# tools/__init__.py
+"""개발용 벤치마크 및 분석 도구"""
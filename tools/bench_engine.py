@@ -0,0 +1,80 @@
+"""
+헤드리스 게임 엔진 처리량 벤치마크.
+
+화면 없이 GameEngine으로 게임 전체(세 상인이 NPC 7명씩 만나고 장터에서 베팅, 정산)를
+반복 진행해 초당 게임 수를 잰다. 기본으로는 미리 기록한 행동 목록을 engine.run()으로 재생해
+엔진 자체만 재고, --bots를 주면 core.bots의 봇 조종기(격자 거리 지도 이동, 무작위 베팅)가 매 행동을 정한다.
+
+사용법: python -m tools.bench_engine [--games 2000] [--seed 0] [--bots]
+"""
+import argparse
+import random
+import time
+
+from config.game_data import NPC_POSITIONS
+from core.dialogue_provider import LocalDialogueProvider
+from core.bots import play_game, RandomStrategy
+from core.engine import create_headless_game
+
+SCRIPT_COUNT = 32  # 미리 기록해 돌아가며 재생할 행동 목록 수
+
+def shuffled_npc_data(base_data, rng):
+    """대사 문장은 그대로 두고 영향(UP/DOWN)만 섞은 NPC 데이터"""
+    influences = [data['info_type'] for data in base_data]
+    rng.shuffle(influences)
+    return [{'dialogue': data['dialogue'], 'info_type': influence}
+            for data, influence in zip(base_data, influences)]
+
+def record_script(npc_data, rng):
+    """봇 게임을 한 판 진행하며 적용한 행동 목록을 기록"""
+    engine = create_headless_game(npc_data, rng=rng)
+    actions = []
+    apply = engine.apply
+
+    def recording_apply(action):
+        actions.append(action)
+        return apply(action)
+
+    engine.apply = recording_apply
+    play_game(engine, [RandomStrategy(rng) for _ in engine.players])
+    assert engine.finished, "게임이 정산까지 진행되지 않았습니다."
+    return actions
+
+def main():
+    parser = argparse.ArgumentParser(description="헤드리스 게임 엔진 처리량 벤치마크")
+    parser.add_argument("--games", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--bots", action="store_true", help="기록한 행동 대신 봇 조종기로 진행 (봇 포함 처리량)")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    provider = LocalDialogueProvider(seed=args.seed)
+    # 💡 대사 문장은 규칙에 영향이 없으므로 한 번만 만들고, 게임마다 영향(UP/DOWN)만 섞음
+    base_data = [provider.generate(pos) for pos in NPC_POSITIONS]
+
+    if not args.bots:
+        # 💡 행동 기록은 측정 밖에서 미리 해 두고, 측정 중에는 엔진만 실행
+        scripts = []
+        for _ in range(SCRIPT_COUNT):
+            npc_data = shuffled_npc_data(base_data, rng)
+            scripts.append((npc_data, record_script(npc_data, rng)))
+
+    total_steps = 0
+    started = time.perf_counter()
+    for game_index in range(args.games):
+        if args.bots:
+            engine = create_headless_game(shuffled_npc_data(base_data, rng), rng=rng)
+            total_steps += play_game(engine, [RandomStrategy(rng) for _ in engine.players])
+        else:
+            npc_data, actions = scripts[game_index % SCRIPT_COUNT]
+            engine = create_headless_game(npc_data, rng=rng).run(actions)
+            total_steps += len(actions)
+        assert engine.finished, "게임이 정산까지 진행되지 않았습니다."
+    elapsed = time.perf_counter() - started
+
+    mode = "봇 조종기" if args.bots else "기록한 행동"
+    print(f"게임 {args.games}판 ({mode}): {elapsed:.2f}초 ({args.games / elapsed:,.0f}판/초, "
+          f"판당 평균 {total_steps / args.games:.0f}행동)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+import 시간 벤치마크 (python -X importtime 기반).
+
+모듈마다 새 프로세스에서 import 해서, 네트워크 모듈(openai, dotenv 등)을 불러오거나
+예산(ms)보다 오래 걸리면 실패(종료 코드 1)한다. 헤드리스 모듈(core.function 등)은
+pygame을 불러와도 실패한다.
+
+기본으로 확인하는 모듈은 가장 무거운 core.npc와 헤드리스 규칙 모듈 core.function이다.
+(core 패키지 자체는 하위 모듈을 처음 접근할 때 불러오므로 거의 아무것도 import 하지 않는다)
+
+사용법: python -m tools.bench_import_time [--module core.npc --module core.function] [--budget-ms 1000]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# import 시점에 불러오면 안 되는 모듈 (대사 생성 시점에 지연 로드되어야 함)
+FORBIDDEN_MODULES = ("openai", "dotenv", "httpx")
+
+# pygame 없이 import 되어야 하는 헤드리스 모듈
+PYGAME_FREE_MODULES = ("core.function", "core.engine", "core.bots", "core.montecarlo")
+DEFAULT_MODULES = ("core.npc", "core.function")
+
+def measure_import(module):
+    """-X importtime 출력을 파싱해 [(모듈명, self_us, cumulative_us)] 반환"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT_DIR, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} 실패:\n{result.stderr}")
+
+    timings = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        timings.append((name.strip(), int(self_us), int(cumulative_us)))
+    return timings
+
+def check_module(module, budget_ms, top):
+    """모듈 하나의 import 시간을 출력하고 통과 여부 반환"""
+    timings = measure_import(module)
+    total_ms = next(cum for name, _, cum in timings if name == module) / 1000
+
+    print(f"import {module}: {total_ms:.1f} ms (예산 {budget_ms:.0f} ms)")
+    for name, self_us, cumulative_us in sorted(timings, key=lambda t: t[2], reverse=True)[:top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+
+    forbidden = FORBIDDEN_MODULES + (("pygame",) if module in PYGAME_FREE_MODULES else ())
+    loaded = sorted({name.split(".")[0] for name, _, _ in timings if name.split(".")[0] in forbidden})
+    passed = True
+    if loaded:
+        print(f"❌ import 시점에 불러오면 안 되는 모듈: {', '.join(loaded)}")
+        passed = False
+    if total_ms > budget_ms:
+        print("❌ import 시간이 예산을 초과했습니다.")
+        passed = False
+    return passed
+
+def main():
+    parser = argparse.ArgumentParser(description="import 시간 벤치마크")
+    parser.add_argument("--module", action="append",
+                        help=f"확인할 모듈 (여러 번 지정 가능, 기본: {', '.join(DEFAULT_MODULES)})")
+    parser.add_argument("--budget-ms", type=float, default=1000.0)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    results = [check_module(module, args.budget_ms, args.top) for module in args.module or DEFAULT_MODULES]
+    if not all(results):
+        sys.exit(1)
+    print("✅ 통과")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+wrap_text 마이크로 벤치마크.
+
+기존 방식(단어마다 누적 문자열 전체를 font.size로 측정)과
+현재 core.function.wrap_text(단어별 1회 측정 + 결과 캐시)를 비교한다.
+
+사용법: python -m tools.bench_wrap_text [--repeat 200] [--width 365]
+"""
+import argparse
+import os
+import time
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+import pygame
+
+from core.function import wrap_text, clear_wrap_text_cache
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FONT_PATH = os.path.join(ROOT_DIR, "assets", "fonts", "SSRockRegular.ttf")
+
+# 정보 패널에 들어가는 NPC 대사와 비슷한 길이/형태의 문장
+SAMPLE_TEXTS = [
+    "고구려 군이 국경에 모였다는 소문이 자자해. 군량미로 쌀을 모조리 거둬 간다더군.",
+    "올해 벼 이삭이 유난히 실하다고 하네요. 비가 알맞게 와서 풍년이 든다고들 수군거려요.",
+    "백제 배가 쌀을 잔뜩 싣고 왔다는 소식이오. 곧 장터에 쌀이 넘쳐날 것이오.",
+    "관아에서 쌀 세금을 올린다고 하던데요? 우물이 말라 가뭄이 길어진다는 얘기도 있어요.",
+    # 💡 띄어쓰기 없는 긴 문장 (기존 방식에서는 패널 밖으로 넘침)
+    "메뚜기떼가논을덮쳐서올해농사는다망했다고마을사람들이모두걱정하고있습니다그러니쌀값이오를수밖에",
+]
+
+def wrap_text_legacy(text, font, max_width):
+    """이전 wrap_text 구현 (비교용)"""
+    words = text.split(' ')
+    wrapped_lines = []
+    current_line = ""
+
+    for word in words:
+        test_line = current_line + " " + word if current_line else word
+        test_width, _ = font.size(test_line)
+
+        if test_width <= max_width:
+            current_line = test_line
+        else:
+            if current_line:
+                wrapped_lines.append(current_line)
+            current_line = word
+
+    if current_line:
+        wrapped_lines.append(current_line)
+
+    return wrapped_lines
+
+def bench(fn, font, width, repeat, before_each=None):
+    """SAMPLE_TEXTS 전체를 repeat번 줄바꿈하는 데 걸린 시간 (초)"""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        if before_each is not None:
+            before_each()
+        for text in SAMPLE_TEXTS:
+            fn(text, font, width)
+    return time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description="wrap_text 마이크로 벤치마크")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--width", type=int, default=365, help="줄 최대 폭 (정보 패널 기준 약 365px)")
+    args = parser.parse_args()
+
+    pygame.font.init()
+    font = pygame.font.Font(FONT_PATH if os.path.exists(FONT_PATH) else None, 20)
+
+    legacy = bench(wrap_text_legacy, font, args.width, args.repeat)
+    cold = bench(wrap_text, font, args.width, args.repeat, before_each=clear_wrap_text_cache)
+    clear_wrap_text_cache()
+    warm = bench(wrap_text, font, args.width, args.repeat)
+
+    calls = args.repeat * len(SAMPLE_TEXTS)
+    print(f"문장 {len(SAMPLE_TEXTS)}개 x {args.repeat}회, 폭 {args.width}px")
+    print(f"  기존 방식          : {legacy / calls * 1e6:8.1f} us/호출")
+    print(f"  새 방식 (캐시 없음): {cold / calls * 1e6:8.1f} us/호출 ({legacy / cold:.1f}배)")
+    print(f"  새 방식 (캐시 적중): {warm / calls * 1e6:8.1f} us/호출 ({legacy / warm:.0f}배)")
+
+    overflow = [line for text in SAMPLE_TEXTS for line in wrap_text_legacy(text, font, args.width)
+                if font.size(line)[0] > args.width]
+    print(f"  기존 방식에서 폭을 넘는 줄: {len(overflow)}개, 새 방식: "
+          f"{sum(1 for text in SAMPLE_TEXTS for line in wrap_text(text, font, args.width) if font.size(line)[0] > args.width)}개")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+최종 가격 분포 분석 (밸런스 조정용).
+
+주어진 베팅과 NPC 정보(상승/하락 NPC 수)로 시장 변동성을 N번 뽑아
+최종 가격 분포와 상인별 기대 손익, 표준편차, 손실 확률을 출력한다. numpy 필요.
+
+사용법:
+  python -m tools.price_distribution --up 9 --down 5 \\
+      --bet 매수:100:5 --bet 매도:95:3 --bet 매수:110:10 [--draws 1000000] [--influence 0.02]
+"""
+import argparse
+import time
+
+from config.game_data import PRICE_NPC_INFLUENCE, PRICE_VOLATILITY_LOW, PRICE_VOLATILITY_HIGH
+from core.engine import PlayerState, DEFAULT_PLAYER_NAMES
+from core.montecarlo import simulate_settlement
+
+def parse_bet(text):
+    """'매수:가격:수량' 형식의 베팅"""
+    try:
+        bet_type, price, quantity = text.split(":")
+        price, quantity = int(price), int(quantity)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'매수:가격:수량' 형식이어야 합니다: {text}")
+    if bet_type not in ("매수", "매도"):
+        raise argparse.ArgumentTypeError(f"베팅 종류는 매수/매도만 가능합니다: {bet_type}")
+    return bet_type, price, quantity
+
+def main():
+    parser = argparse.ArgumentParser(description="최종 가격 몬테카를로 분석")
+    parser.add_argument("--up", type=int, default=0, help="상승(UP) 정보 NPC 수")
+    parser.add_argument("--down", type=int, default=0, help="하락(DOWN) 정보 NPC 수")
+    parser.add_argument("--bet", type=parse_bet, action="append", required=True,
+                        help="상인 베팅 '매수:가격:수량' (상인 수만큼 반복)")
+    parser.add_argument("--draws", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--influence", type=float, default=PRICE_NPC_INFLUENCE, help="NPC 1명당 영향력")
+    parser.add_argument("--volatility-low", type=float, default=PRICE_VOLATILITY_LOW)
+    parser.add_argument("--volatility-high", type=float, default=PRICE_VOLATILITY_HIGH)
+    args = parser.parse_args()
+
+    players = []
+    for i, (bet_type, price, quantity) in enumerate(args.bet):
+        name = DEFAULT_PLAYER_NAMES[i] if i < len(DEFAULT_PLAYER_NAMES) else f"상인 {i + 1}"
+        player = PlayerState(name, (0, 0))
+        player.bet_type, player.bet_price, player.bet_quantity = bet_type, price, quantity
+        players.append(player)
+    npc_data = [{'info_type': 'UP'}] * args.up + [{'info_type': 'DOWN'}] * args.down
+
+    started = time.perf_counter()
+    result = simulate_settlement(players, npc_data, args.draws, seed=args.seed, influence=args.influence,
+                                 volatility_low=args.volatility_low, volatility_high=args.volatility_high)
+    elapsed = time.perf_counter() - started
+
+    summary = result.price_summary()
+    print(f"{result.n_draws:,}회 ({elapsed:.2f}초), 평균 베팅가 {result.avg_price:.1f}, NPC 배율 {result.npc_factor:.3f}")
+    print(f"최종 가격: 평균 {summary['mean']:.1f} (표준편차 {summary['std']:.1f}), "
+          f"범위 {summary['min']}~{summary['max']}, "
+          f"5/50/95% {summary['p5']:.0f}/{summary['p50']:.0f}/{summary['p95']:.0f}")
+    for stats in result.players:
+        print(f"  {stats['name']} {stats['bet_type']} {stats['bet_quantity']}개 ({stats['bet_price']}원): "
+              f"기대 손익 {stats['expected_profit']:+.1f}, 표준편차 {stats['profit_std']:.1f}, "
+              f"손실 확률 {stats['loss_probability']:.1%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+시장 밸런스 파라미터 스윕.
+
+NPC 영향력, 시장 변동성 범위, TARGET_NPCS, 시작 자금의 격자(grid) 각 지점에서
+베팅 전략 봇끼리 seed를 고정한 헤드리스 게임을 여러 판 진행하고,
+전략별 승률과 손익 통계를 CSV에 한 줄씩 기록한다.
+각 지점의 게임은 게임 번호 구간(chunk)으로 나눠 프로세스 풀에서 병렬 실행하고, 부모 프로세스가
+구간별 합계를 지점마다 더하므로 지점이 하나뿐이어도 모든 코어를 쓴다.
+
+- 같은 --seed에서는 격자 지점마다 같은 게임 seed 목록을 쓰므로 (NPC 대사, 변동성 난수 공유)
+  지점 간 차이가 파라미터 차이에서만 나온다.
+- 상인 자리(턴 순서)에 따른 유불리를 없애기 위해 게임마다 전략 배치를 돌린다.
+
+사용법:
+  python -m tools.sweep --influence 0.01,0.02,0.03 --volatility 0.05,0.1,0.2 \\
+      --target-npcs 5,7 --initial-money 1000,2000 --games 500 [--workers 8] [--chunk-size 50] [--output sweep.csv]
+"""
+import argparse
+import csv
+import itertools
+import math
+import os
+import random
+import time
+from multiprocessing import Pool
+
+# 💡 core.market(호가창)이 pygame을 불러오므로 작업 프로세스마다 안내 문구가 찍히지 않게 함
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from config.game_data import NPC_POSITIONS, TARGET_NPCS, PRICE_NPC_INFLUENCE
+from core.bots import play_game, create_strategy, STRATEGIES
+from core.dialogue_provider import LocalDialogueProvider
+from core.engine import create_headless_game
+from core.market import OrderBook
+
+CSV_COLUMNS = [
+    "influence", "volatility", "target_npcs", "initial_money", "strategy",
+    "games", "unfinished", "win_rate", "mean_profit", "std_profit", "loss_rate",
+    "mean_final_money", "mean_return", "mean_final_price"
+]
+
+def parse_list(cast):
+    """'0.01,0.02' 형식의 쉼표 구분 목록"""
+    def parse(text):
+        try:
+            return [cast(value) for value in text.split(",") if value.strip()]
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"쉼표로 구분한 값 목록이어야 합니다: {text}")
+    return parse
+
+def game_rng(seed, game_index):
+    """격자 지점과 관계없이 (seed, 게임 번호)로 정해지는 난수 생성기"""
+    return random.Random(f"{seed}:{game_index}")
+
+def empty_totals(strategy_names):
+    """전략별 누적 합계 (구간 결과를 더할 수 있도록 합과 개수만 보관)"""
+    return {name: {"games": 0, "unfinished": 0, "wins": 0.0, "profit": 0.0, "profit_sq": 0.0,
+                   "losses": 0, "final_money": 0.0, "final_price": 0.0}
+            for name in set(strategy_names)}
+
+def merge_totals(totals, partial):
+    """구간 합계(partial)를 지점 합계(totals)에 더함"""
+    for name, stats in partial.items():
+        for key, value in stats.items():
+            totals[name][key] += value
+
+def run_chunk(task):
+    """격자 지점 하나의 [start, stop) 번 게임을 진행하고 (지점 번호, 전략별 합계) 반환"""
+    point_index, point, strategy_names, start, stop, seed, order_book = task
+    influence, volatility, target_npcs, initial_money = point
+    totals = empty_totals(strategy_names)
+
+    # 💡 게임 seed와 자리 배치는 게임 번호로만 정해지므로 구간을 어떻게 나눠도 결과가 같음
+    for game_index in range(start, stop):
+        rng = game_rng(seed, game_index)
+        provider = LocalDialogueProvider(seed=rng.randrange(2 ** 32))
+        npc_data = [provider.generate(pos) for pos in NPC_POSITIONS]
+
+        # 💡 게임마다 전략 배치를 한 자리씩 돌려 턴 순서의 영향을 상쇄
+        shift = game_index % len(strategy_names)
+        seats = strategy_names[shift:] + strategy_names[:shift]
+
+        engine = create_headless_game(
+            npc_data, player_names=seats, initial_money=initial_money, target_npcs=target_npcs,
+            rng=rng, influence=influence, volatility_low=1 - volatility, volatility_high=1 + volatility,
+            order_book=OrderBook() if order_book else None
+        )
+        play_game(engine, [create_strategy(name, rng) for name in seats])
+
+        if not engine.finished:
+            for name in set(seats):
+                totals[name]["unfinished"] += seats.count(name)
+            continue
+
+        best_money = max(player.money for player in engine.players)
+        winners = [player for player in engine.players if player.money == best_money]
+        for name, player in zip(seats, engine.players):
+            stats = totals[name]
+            stats["games"] += 1
+            if player in winners:
+                stats["wins"] += 1 / len(winners)  # 공동 1등은 승리를 나눔
+            stats["profit"] += player.profit
+            stats["profit_sq"] += player.profit * player.profit
+            stats["losses"] += player.profit < 0
+            stats["final_money"] += player.money
+            stats["final_price"] += engine.final_price
+
+    return point_index, totals
+
+def summarize_point(point, totals):
+    """지점 하나의 전략별 합계를 CSV 행 리스트로"""
+    influence, volatility, target_npcs, initial_money = point
+    rows = []
+    for name in sorted(totals):
+        stats = totals[name]
+        n = stats["games"]
+        mean_profit = stats["profit"] / n if n else 0.0
+        variance = stats["profit_sq"] / n - mean_profit * mean_profit if n else 0.0
+        rows.append({
+            "influence": influence,
+            "volatility": volatility,
+            "target_npcs": target_npcs,
+            "initial_money": initial_money,
+            "strategy": name,
+            "games": n,
+            "unfinished": stats["unfinished"],
+            "win_rate": round(stats["wins"] / n, 4) if n else 0.0,
+            "mean_profit": round(mean_profit, 2),
+            "std_profit": round(math.sqrt(max(variance, 0.0)), 2),
+            "loss_rate": round(stats["losses"] / n, 4) if n else 0.0,
+            "mean_final_money": round(stats["final_money"] / n, 2) if n else 0.0,
+            "mean_return": round(mean_profit / initial_money, 5) if n and initial_money else 0.0,
+            "mean_final_price": round(stats["final_price"] / n, 2) if n else 0.0
+        })
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="시장 밸런스 파라미터 스윕")
+    parser.add_argument("--influence", type=parse_list(float), default=[PRICE_NPC_INFLUENCE],
+                        help="NPC 1명당 영향력 목록 (예: 0.01,0.02,0.03)")
+    parser.add_argument("--volatility", type=parse_list(float), default=[0.1],
+                        help="시장 변동성 범위 목록 (0.1이면 0.9~1.1)")
+    parser.add_argument("--target-npcs", type=parse_list(int), default=[TARGET_NPCS])
+    parser.add_argument("--initial-money", type=parse_list(int), default=[2000])
+    parser.add_argument("--strategies", type=parse_list(str), default=["signal", "contrarian", "random"],
+                        help=f"상인별 베팅 전략 ({', '.join(STRATEGIES)})")
+    parser.add_argument("--games", type=int, default=200, help="격자 지점마다 진행할 게임 수")
+    parser.add_argument("--order-book", action="store_true", help="장터 호가창 모드로 정산 (체결된 수량만 손익 반영)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=0,
+                        help="작업 하나에 넣을 게임 수 (0이면 프로세스마다 작업이 4개쯤 돌아가도록 자동 설정)")
+    parser.add_argument("--output", default="sweep_results.csv")
+    args = parser.parse_args()
+
+    for name in args.strategies:
+        if name not in STRATEGIES:
+            parser.error(f"알 수 없는 베팅 전략: {name}")
+    # 💡 모든 상인이 목표 수만큼 NPC를 만날 수 있어야 게임이 끝남
+    max_target = len(NPC_POSITIONS) // len(args.strategies)
+    if max(args.target_npcs) > max_target:
+        parser.error(f"상인 {len(args.strategies)}명이면 --target-npcs는 {max_target} 이하여야 합니다.")
+
+    if args.games <= 0:
+        parser.error("--games는 1 이상이어야 합니다.")
+
+    grid = list(itertools.product(args.influence, args.volatility, args.target_npcs, args.initial_money))
+    # 💡 지점 수가 코어 수보다 적어도 모든 프로세스가 일하도록 지점마다 게임 번호 구간으로 나눔
+    chunk_size = args.chunk_size
+    if chunk_size <= 0:
+        chunk_size = max(1, math.ceil(len(grid) * args.games / (args.workers * 4)))
+    tasks = [
+        (point_index, point, args.strategies, start, min(start + chunk_size, args.games), args.seed, args.order_book)
+        for point_index, point in enumerate(grid)
+        for start in range(0, args.games, chunk_size)
+    ]
+    print(f"격자 {len(grid)}지점 x {args.games}판 (작업 {len(tasks)}개, 작업당 최대 {chunk_size}판), "
+          f"프로세스 {args.workers}개 -> {args.output}")
+
+    totals = [empty_totals(args.strategies) for _ in grid]
+    remaining = [0] * len(grid)
+    for task in tasks:
+        remaining[task[0]] += 1
+
+    started = time.perf_counter()
+    done = 0
+    with open(args.output, "w", newline="", encoding="utf-8") as f, Pool(args.workers) as pool:
+        writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS)
+        writer.writeheader()
+        for point_index, partial in pool.imap_unordered(run_chunk, tasks):
+            merge_totals(totals[point_index], partial)
+            remaining[point_index] -= 1
+            if remaining[point_index]:
+                continue
+            # 💡 모든 구간이 끝난 지점부터 바로 기록해 긴 스윕 도중에도 결과를 확인할 수 있음
+            influence, volatility, target_npcs, initial_money = point = grid[point_index]
+            writer.writerows(summarize_point(point, totals[point_index]))
+            f.flush()
+            done += 1
+            print(f"  [{done}/{len(grid)}] 영향력 {influence}, 변동성 {volatility}, "
+                  f"목표 NPC {target_npcs}, 시작 자금 {initial_money}")
+
+    elapsed = time.perf_counter() - started
+    total_games = len(grid) * args.games
+    print(f"완료: {total_games:,}판, {elapsed:.1f}초 ({total_games / elapsed:,.0f}판/초)")
+
+if __name__ == "__main__":
+    main()